@@ -0,0 +1,56 @@
+# coding=utf-8
+"""Measures memory, occupied by loaded schedules.
+
+Schedules are loaded from JSON, as they are loaded from a database,
+and memory, allocated for them, is measured with `tracemalloc`
+(Python 3.4+)::
+
+    $ python -m benchmarks.memory [number of schedules]
+"""
+import json
+import sys
+import tracemalloc
+
+from tempo.recurrentevent import RecurrentEvent
+from tempo.recurrenteventset import RecurrentEventSet
+
+from benchmarks.test_recurrenteventset import REALISTIC
+
+
+def measure(function):
+    """Bytes, allocated by 'function' and kept alive by it's result."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = function()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return after - before
+
+
+def main(n):
+    values = [json.dumps(expression) for expression in REALISTIC.values()]
+    atoms = [atom for expression in REALISTIC.values()
+             for atom in RecurrentEventSet.from_json(expression)
+             .to_json()[1:] if isinstance(atom[0], int)]
+
+    size = measure(lambda: [RecurrentEventSet.from_json(values[i % len(values)])
+                            for i in range(n)])
+    print('{} schedules: {} bytes, {:.1f} per schedule'
+          .format(n, size, float(size) / n))
+
+    size = measure(lambda: [RecurrentEvent(*atoms[i % len(atoms)])
+                            for i in range(n)])
+    print('{} atoms: {} bytes, {:.1f} per atom'
+          .format(n, size, float(size) / n))
+
+    size = measure(lambda: [RecurrentEvent.from_json(atoms[i % len(atoms)])
+                            for i in range(n)])
+    print('{} shared atoms: {} bytes, {:.1f} per atom'
+          .format(n, size, float(size) / n))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
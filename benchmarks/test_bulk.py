@@ -0,0 +1,32 @@
+# coding=utf-8
+"""Benchmarks of `tempo.bulk`."""
+import datetime as dt
+
+import pytest
+
+from tempo.bulk import contains_batch
+from tempo.recurrenteventset import RecurrentEventSet
+
+from benchmarks.test_recurrenteventset import REALISTIC
+from benchmarks.utils import NOW
+
+
+# Many schedules, composed of a few distinct atoms.
+SCHEDULES = [RecurrentEventSet.from_json(REALISTIC[name])
+             for name in sorted(REALISTIC)] * 250
+
+
+@pytest.mark.parametrize('width', [1, 10])
+def test_contains_batch(benchmark, width):
+    timestamps = [NOW + dt.timedelta(minutes=97 * n) for n in range(width)]
+
+    benchmark(lambda: contains_batch(SCHEDULES, timestamps))
+
+
+@pytest.mark.parametrize('width', [1, 10])
+def test_contains_loop(benchmark, width):
+    """Baseline for :py:func:`test_contains_batch`."""
+    timestamps = [NOW + dt.timedelta(minutes=97 * n) for n in range(width)]
+
+    benchmark(lambda: [[timestamp in schedule for timestamp in timestamps]
+                       for schedule in SCHEDULES])
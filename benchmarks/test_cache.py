@@ -0,0 +1,21 @@
+# coding=utf-8
+"""Benchmarks of `tempo.cache`."""
+import datetime as dt
+
+import pytest
+
+from tempo.cache import OccurrenceCache
+from tempo.recurrenteventset import RecurrentEventSet
+
+from benchmarks.test_recurrenteventset import REALISTIC
+from benchmarks.utils import NOW
+
+
+@pytest.mark.parametrize('name', sorted(REALISTIC))
+def test_forward_hit(benchmark, name):
+    recurrenteventset = RecurrentEventSet.from_json(REALISTIC[name])
+    cache = OccurrenceCache()
+    cache.forward(recurrenteventset, NOW, 5)
+    start = NOW + dt.timedelta(minutes=1)
+
+    benchmark(lambda: cache.forward(recurrenteventset, start, 3))
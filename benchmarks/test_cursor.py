@@ -0,0 +1,21 @@
+# coding=utf-8
+"""Benchmarks of `tempo.cursor`."""
+import pytest
+
+from tempo.cursor import Cursor
+from tempo.recurrenteventset import RecurrentEventSet
+
+from benchmarks.test_recurrenteventset import REALISTIC
+from benchmarks.utils import NOW
+
+
+@pytest.mark.parametrize('page', [1, 100])
+def test_fetch(benchmark, page):
+    """Cost of a page doesn't depend on it's depth."""
+    recurrenteventset = RecurrentEventSet.from_json(REALISTIC['shop'])
+    cursor = recurrenteventset.cursor(NOW)
+    for _ in range(page - 1):
+        cursor.fetch(20)
+    token = cursor.token
+
+    benchmark(lambda: Cursor.from_token(recurrenteventset, token).fetch(20))
@@ -0,0 +1,39 @@
+# coding=utf-8
+"""Benchmarks of conversion from and to JSON."""
+import json
+
+import pytest
+
+from tempo.recurrenteventset import RecurrentEventSet
+
+from benchmarks.test_recurrenteventset import EXPRESSIONS
+
+
+@pytest.mark.parametrize('name', sorted(EXPRESSIONS))
+def test_from_json(benchmark, name):
+    benchmark(RecurrentEventSet.from_json, EXPRESSIONS[name])
+
+
+@pytest.mark.parametrize('name', sorted(EXPRESSIONS))
+def test_validate_json(benchmark, name):
+    benchmark(RecurrentEventSet.validate_json, EXPRESSIONS[name])
+
+
+@pytest.mark.parametrize('name', sorted(EXPRESSIONS))
+def test_to_json(benchmark, name):
+    recurrenteventset = RecurrentEventSet.from_json(EXPRESSIONS[name])
+
+    benchmark(recurrenteventset.to_json)
+
+
+# A list endpoint: schedules, loaded from JSON strings stored in a database.
+LIST = [RecurrentEventSet.from_json(json.dumps(EXPRESSIONS[name]))
+        for name in sorted(EXPRESSIONS)] * 1250
+
+
+def test_to_json_list(benchmark):
+    benchmark(lambda: [schedule.to_json() for schedule in LIST])
+
+
+def test_cached_json_list(benchmark):
+    benchmark(lambda: [schedule.cached_json() for schedule in LIST])
@@ -0,0 +1,45 @@
+# coding=utf-8
+"""Benchmarks of PostgreSQL binding.
+
+Require a database, configured by the same ``TEMPO_DB_*`` environment
+variables, as tests do.
+"""
+import io
+import json
+
+import pytest
+from six import text_type
+
+from benchmarks.utils import random_schedules
+
+
+# Number of loaded rows.
+ROWS = 1000000
+# Number of distinct schedules among them.
+DISTINCT = 1000
+
+
+@pytest.fixture(scope='module')
+def rows():
+    """Text of COPY of 'ROWS' schedules."""
+    lines = [json.dumps(schedule.to_json()) + '\n'
+             for schedule in random_schedules(DISTINCT)]
+    return text_type().join(lines) * (ROWS // DISTINCT)
+
+
+@pytest.mark.transaction
+@pytest.mark.parametrize('column_type', ['jsonb', 'tempo_recurrenteventset'])
+def test_copy(benchmark, connection, postgresql_tempo, rows, column_type):
+    """COPY of schedules into a column, 'jsonb' is the baseline for
+    the check of 'tempo_recurrenteventset' domain."""
+    # pylint: disable=unused-argument
+    with connection.cursor() as cursor:
+        cursor.execute('CREATE TEMPORARY TABLE schedules (schedule %s)' %
+                       column_type)
+
+    def load():
+        with connection.cursor() as cursor:
+            cursor.execute('TRUNCATE schedules')
+            cursor.copy_from(io.StringIO(rows), 'schedules')
+
+    benchmark.pedantic(load, rounds=3)
@@ -0,0 +1,64 @@
+# coding=utf-8
+"""Benchmarks of RecurrentEvent."""
+from itertools import islice
+import random
+
+import pytest
+
+from tempo.recurrentevent import RecurrentEvent
+from tempo.timeutils import delta, add_delta
+from tempo.unit import BASE
+
+from benchmarks.utils import NOW, SEED
+from tests.utils import CASES
+
+
+def recurrentevent(unit, recurrence):
+    """`RecurrentEvent` covering about a half of it's recurrence
+    or of the whole time, if there is no recurrence."""
+    if recurrence is None:
+        return RecurrentEvent(1000, 2000, unit, None)
+
+    span = int(delta(NOW, add_delta(NOW, 1, recurrence), unit))
+    return RecurrentEvent(BASE[unit] + span // 4,
+                          BASE[unit] + span // 4 * 3 or 1,
+                          unit, recurrence)
+
+
+@pytest.mark.parametrize('unit, recurrence', CASES)
+def test_contains(benchmark, unit, recurrence):
+    rnd = random.Random(SEED)
+    event = recurrentevent(unit, recurrence)
+    datetimes = [add_delta(NOW, rnd.randrange(0, 2000), unit)
+                 for _ in range(100)]
+
+    benchmark(lambda: [datetime in event for datetime in datetimes])
+
+
+@pytest.mark.parametrize('unit, recurrence', CASES)
+def test_forward(benchmark, unit, recurrence):
+    event = recurrentevent(unit, recurrence)
+
+    benchmark(lambda: list(islice(event.forward(NOW), 100)))
+
+
+@pytest.mark.parametrize('unit, recurrence', [
+    (unit, recurrence) for unit, recurrence in CASES
+    if recurrence is not None
+])
+def test_occurrences_page(benchmark, unit, recurrence):
+    """A page of 10 intervals after the first 1000 ones."""
+    event = recurrentevent(unit, recurrence)
+
+    benchmark(lambda: event.occurrences(NOW)[1000:1010])
+
+
+@pytest.mark.parametrize('unit, recurrence', [
+    (unit, recurrence) for unit, recurrence in CASES
+    if recurrence is not None
+])
+def test_forward_page(benchmark, unit, recurrence):
+    """Baseline for :py:func:`test_occurrences_page`."""
+    event = recurrentevent(unit, recurrence)
+
+    benchmark(lambda: list(islice(event.forward(NOW), 1000, 1010)))
@@ -0,0 +1,124 @@
+# coding=utf-8
+"""Benchmarks of RecurrentEventSet."""
+import datetime as dt
+from itertools import islice
+import random
+
+import pytest
+
+from tempo.recurrenteventset import RecurrentEventSet, LimitExceeded
+from tempo.timeutils import add_delta
+from tempo.unit import Unit
+
+from benchmarks.utils import NOW, SEED, random_schedules
+
+
+def nested(depth):
+    """Expression of 'depth' levels of alternating operators."""
+    expression = [0, 30, 'minute', 'hour']
+    for level in range(depth):
+        if level % 2 == 0:
+            expression = ['OR', expression, [level, level + 1, 'hour', 'day']]
+        else:
+            expression = ['AND', expression, [1, 7 - level % 3,
+                                              'day', 'week']]
+    return expression
+
+
+REALISTIC = {
+    'business_hours': ['AND', [1, 6, 'day', 'week'],
+                              [9, 18, 'hour', 'day'],
+                              ['NOT', [13, 14, 'hour', 'day']]],
+    'shop': ['OR',
+             ['AND', [1, 6, 'day', 'week'], [10, 21, 'hour', 'day']],
+             ['AND', [6, 8, 'day', 'week'], [11, 17, 'hour', 'day']]],
+    'holidays': ['AND',
+                 ['AND', [1, 6, 'day', 'week'], [9, 18, 'hour', 'day']],
+                 ['NOT', ['OR'] + [[day, day + 1, 'day', 'year']
+                                   for day in range(1, 365, 17)]]],
+    'movie': ['OR', [11, 14, 'hour', 'day'], [18, 20, 'hour', 'day']],
+}
+
+ADVERSARIAL = {
+    'sparse_and': ['AND', [60, 61, 'day', 'year'], [10, 11, 'hour', 'day']],
+    'leap_day': ['AND', [2, 3, 'month', 'year'], [29, 30, 'day', 'month'],
+                        [10, 11, 'hour', 'day']],
+    'wide_or': ['OR'] + [[minute, minute + 1, 'minute', 'day']
+                         for minute in range(0, 1440, 7)],
+    'deep': nested(12),
+}
+
+EXPRESSIONS = dict(REALISTIC, **ADVERSARIAL)
+
+# An expression, that never produces an interval.
+NEVER = ['AND', [1, 10, 'day', 'month'], [15, 20, 'day', 'month']]
+
+
+@pytest.mark.parametrize('name', sorted(EXPRESSIONS))
+def test_contains(benchmark, name):
+    rnd = random.Random(SEED)
+    recurrenteventset = RecurrentEventSet.from_json(EXPRESSIONS[name])
+    datetimes = [add_delta(NOW, rnd.randrange(-100000, 100000), Unit.MINUTE)
+                 for _ in range(100)]
+
+    benchmark(lambda: [datetime in recurrenteventset
+                       for datetime in datetimes])
+
+
+@pytest.mark.parametrize('name', sorted(EXPRESSIONS))
+def test_forward(benchmark, name):
+    recurrenteventset = RecurrentEventSet.from_json(EXPRESSIONS[name])
+
+    benchmark(lambda: list(islice(recurrenteventset.forward(NOW), 10)))
+
+
+@pytest.mark.parametrize('name', sorted(REALISTIC))
+def test_gaps(benchmark, name):
+    recurrenteventset = RecurrentEventSet.from_json(EXPRESSIONS[name])
+
+    benchmark(lambda: next(recurrenteventset.gaps(NOW)))
+
+
+@pytest.mark.parametrize('name', sorted(REALISTIC))
+@pytest.mark.parametrize('days', [7, 5 * 365])
+def test_duration(benchmark, name, days):
+    recurrenteventset = RecurrentEventSet.from_json(REALISTIC[name])
+    stop = NOW + dt.timedelta(days=days)
+
+    benchmark(recurrenteventset.duration, NOW, stop)
+
+
+@pytest.mark.parametrize('name', sorted(REALISTIC))
+@pytest.mark.parametrize('days', [7, 5 * 365])
+def test_count(benchmark, name, days):
+    recurrenteventset = RecurrentEventSet.from_json(REALISTIC[name])
+    stop = NOW + dt.timedelta(days=days)
+
+    benchmark(recurrenteventset.count, NOW, stop)
+
+
+@pytest.mark.parametrize('name', sorted(EXPRESSIONS))
+def test_between(benchmark, name):
+    recurrenteventset = RecurrentEventSet.from_json(EXPRESSIONS[name])
+    stop = NOW + dt.timedelta(days=7)
+
+    benchmark(lambda: list(recurrenteventset.between(NOW, stop)))
+
+
+def test_forward_never(benchmark):
+    """Cost of a fixed amount of fruitless work."""
+    recurrenteventset = RecurrentEventSet.from_json(NEVER)
+
+    def run():
+        try:
+            next(recurrenteventset.forward(NOW, max_steps=100))
+        except LimitExceeded:
+            pass
+
+    benchmark(run)
+
+
+def test_contains_random(benchmark):
+    schedules = random_schedules(100)
+
+    benchmark(lambda: [NOW in schedule for schedule in schedules])
@@ -0,0 +1,52 @@
+# coding=utf-8
+"""Benchmarks of `tempo.rest_framework`, require Django REST framework
+and configured Django settings."""
+import pytest
+
+serializers = pytest.importorskip('rest_framework.serializers')
+
+# pylint: disable=wrong-import-position
+from tempo.rest_framework.serializers import (RecurrentEventSetField,
+                                              RecurrentEventSetListField)
+
+from benchmarks.test_json import LIST
+
+
+class PlainField(serializers.Field):
+    """The former implementation of :py:class:`RecurrentEventSetField`."""
+    def to_representation(self, obj):
+        return obj.to_json()
+
+
+class Item(object):
+    def __init__(self, schedule):
+        self.schedule = schedule
+
+
+class PlainSerializer(serializers.Serializer):
+    schedule = PlainField()
+
+
+class ItemSerializer(serializers.Serializer):
+    schedule = RecurrentEventSetField()
+
+
+class ListSerializer(serializers.Serializer):
+    schedules = RecurrentEventSetListField()
+
+
+ITEMS = [Item(schedule) for schedule in LIST]
+
+
+@pytest.mark.parametrize('serializer', [PlainSerializer, ItemSerializer])
+def test_list(benchmark, serializer):
+    """10000 objects with a schedule."""
+    benchmark(lambda: serializer(ITEMS, many=True).data)
+
+
+def test_list_field(benchmark):
+    """10000 schedules in a single list field."""
+    obj = Item(None)
+    obj.schedules = LIST
+
+    benchmark(lambda: ListSerializer(obj).data)
@@ -0,0 +1,29 @@
+# coding=utf-8
+"""Benchmarks of `tempo.slots`."""
+import datetime as dt
+from itertools import islice
+
+import pytest
+
+from tempo.recurrenteventset import RecurrentEventSet
+from tempo.slots import find_common
+
+from benchmarks.utils import NOW
+
+
+def resource(n):
+    """Business hours with a break, shifted for each 'n'."""
+    return RecurrentEventSet.from_json(
+        ['OR', [8 + n % 3, 12 + n % 2, 'hour', 'day'],
+               [13 + n % 2, 18 + n % 3, 'hour', 'day']]
+    )
+
+
+@pytest.mark.parametrize('n', [2, 10, 50])
+def test_find_common(benchmark, n):
+    schedules = [resource(index) for index in range(n)]
+
+    benchmark(lambda: list(islice(
+        find_common(schedules, NOW, min_duration=dt.timedelta(minutes=45)),
+        10
+    )))
@@ -0,0 +1,47 @@
+# coding=utf-8
+"""Benchmarks of SparseInterval."""
+import random
+
+import pytest
+
+from tempo.sparseinterval import SparseInterval
+
+from benchmarks.utils import SEED
+
+
+SIZES = [10, 100, 1000]
+
+
+def sparseinterval(rnd, size):
+    """`SparseInterval` of about 'size' random intervals."""
+    points = sorted(rnd.sample(range(size * 100), size * 2))
+    return SparseInterval(*zip(points[::2], points[1::2]))
+
+
+@pytest.fixture(params=SIZES, ids=str)
+def operands(request):
+    rnd = random.Random(SEED)
+    return (sparseinterval(rnd, request.param),
+            sparseinterval(rnd, request.param))
+
+
+def test_construction(benchmark, operands):
+    intervals = operands[0].intervals + operands[1].intervals
+
+    benchmark(SparseInterval, *intervals)
+
+
+@pytest.mark.parametrize('operation', ['union', 'intersection',
+                                       'difference'])
+def test_operation(benchmark, operands, operation):
+    first, second = operands
+
+    benchmark(getattr(first, operation), second)
+
+
+def test_trim(benchmark, operands):
+    first = operands[0]
+    start, stop = first.intervals[0][0], first.intervals[-1][1]
+    quarter = (stop - start) // 4
+
+    benchmark(first.trim, start + quarter, stop - quarter)
@@ -0,0 +1,26 @@
+# coding=utf-8
+"""Benchmarks of functions of `tempo.timeutils`."""
+import pytest
+
+from tempo.timeutils import floor, delta, add_delta
+from tempo.unit import Unit, ORDER
+
+from benchmarks.utils import NOW
+
+
+LATER = add_delta(NOW, 1234567, Unit.MINUTE)
+
+
+@pytest.mark.parametrize('unit', sorted(ORDER, key=ORDER.get))
+def test_floor(benchmark, unit):
+    benchmark(floor, NOW, unit)
+
+
+@pytest.mark.parametrize('unit', sorted(ORDER, key=ORDER.get))
+def test_delta(benchmark, unit):
+    benchmark(delta, NOW, LATER, unit)
+
+
+@pytest.mark.parametrize('unit', sorted(ORDER, key=ORDER.get))
+def test_add_delta(benchmark, unit):
+    benchmark(add_delta, NOW, 7, unit)
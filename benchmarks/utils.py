@@ -0,0 +1,64 @@
+# coding=utf-8
+"""Utilities for benchmarks."""
+import datetime as dt
+import random
+
+from tempo.recurrentevent import RecurrentEvent
+from tempo.recurrenteventset import AND, OR, NOT, RecurrentEventSet
+from tempo.timeutils import delta, add_delta
+from tempo.unit import BASE
+
+from tests.utils import CASES
+
+
+SEED = 20151101
+
+# A point of time, near which schedules are queried.
+NOW = dt.datetime(2015, 11, 1, 13, 45)
+
+# Units of "recurrence" do not depend on a sample for fixed-size units.
+_SAMPLE = dt.datetime(2000, 1, 1)
+
+# Combinations of units, that can take part in random schedules.
+_RECURRENT_CASES = [(unit, recurrence) for unit, recurrence in CASES
+                    if recurrence is not None]
+
+
+def random_recurrentevent(rnd):
+    """Random `RecurrentEvent` instance, generated by 'rnd'
+    (`random.Random` instance)."""
+    unit, recurrence = rnd.choice(_RECURRENT_CASES)
+    lower = BASE[unit]
+    upper = lower + int(delta(_SAMPLE, add_delta(_SAMPLE, 1, recurrence),
+                              unit))
+    start = rnd.randrange(lower, upper)
+    stop = rnd.randrange(start + 1, upper + 1)
+    return RecurrentEvent(start, stop, unit, recurrence)
+
+
+def random_expression(rnd, depth=3, width=3):
+    """Random expression of nested operators with up to 'width' arguments
+    and up to 'depth' levels of nesting."""
+    if depth <= 1:
+        return random_recurrentevent(rnd)
+
+    operator = rnd.choice([AND, OR, OR, NOT])
+    if operator == NOT:
+        return (NOT, random_expression(rnd, depth - 1, width))
+
+    return ((operator,) +
+            tuple(random_expression(rnd, rnd.randint(1, depth - 1), width)
+                  for _ in range(rnd.randint(1, width))))
+
+
+def random_schedules(n, seed=SEED, depth=3, width=3):
+    """List of 'n' random `RecurrentEventSet` instances, the same
+    for the same 'seed'."""
+    rnd = random.Random(seed)
+    result = []
+    for _ in range(n):
+        expression = random_expression(rnd, depth, width)
+        if not isinstance(expression, tuple):
+            expression = (OR, expression)
+        result.append(RecurrentEventSet(expression))
+    return result
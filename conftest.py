@@ -1,6 +1,7 @@
 # coding=utf-8
 import os
 import logging
+import sys
 
 import psycopg2
 from psycopg2.extensions import cursor as psycopg2_cusror
@@ -11,6 +12,10 @@ from tests.utils import create_database, drop_database, create_plpythonu, \
 
 logger = logging.getLogger('tempo.tests')
 
+collect_ignore = []
+if sys.version_info < (3, 6):
+    collect_ignore.append('tests/test_aio.py')
+
 
 class LoggingCursor(psycopg2_cusror):
     """Logs queries and notices."""
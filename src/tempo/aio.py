@@ -0,0 +1,234 @@
+# coding=utf-8
+"""Provides asyncio-friendly API.
+
+Asynchronous iteration requires Python 3.5.2+ with :py:mod:`asyncio`.
+The module is implemented with futures and callbacks instead of
+coroutines, so it can be imported and documented by any supported
+version of Python.
+"""
+
+
+#: Default number of internal steps of evaluation, after which
+#: control is given back to the event loop.
+STEPS = 100
+
+
+def _advance(forward, steps):
+    """Advances 'forward' iterator by 'steps' steps.
+
+    Returns
+    -------
+    tuple
+        List of generated intervals and a flag, indicating whether
+        'forward' is exhausted.
+    """
+    intervals = []
+    taken = 0
+    while taken < steps:
+        try:
+            interval = forward.step()
+        except StopIteration:
+            return intervals, True
+        if interval is None:
+            taken += 1
+        else:
+            intervals.append(interval)
+    return intervals, False
+
+
+def _stop_async_iteration():
+    """An exception, which ends asynchronous iteration."""
+    # pylint: disable=undefined-variable
+    return StopAsyncIteration()  # noqa
+
+
+class AsyncForward(object):
+    """Asynchronous iterator over intervals
+    of :py:meth:`.RecurrentEventSet.forward`, returned
+    by :py:func:`aforward`.
+
+    Iteration, which is finished before the iterator is exhausted,
+    must be ended with :py:meth:`aclose`, so the underlying iterator
+    is closed after a chunk, evaluated in an executor, if any.
+
+    Parameters
+    ----------
+    forward : tempo.recurrenteventset.Forward
+        The iterator to evaluate.
+    steps : int
+        Number of steps of evaluation between switches to the event loop.
+    executor : concurrent.futures.Executor
+        An executor of chunks of 'steps' steps or `None`.
+    """
+    def __init__(self, forward, steps, executor=None):
+        self.forward = forward
+        self.steps = steps
+        self.executor = executor
+        self._intervals = []
+        self._exhausted = False
+        self._closed = False
+        self._pending = None
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        import asyncio
+
+        loop = asyncio.get_event_loop()
+        future = asyncio.Future(loop=loop)
+        if self.executor is None:
+            loop.call_soon(self._step, loop, future)
+        else:
+            self._next(loop, future)
+        return future
+
+    def _finish(self, future, exception=None):
+        """Closes the iterator and ends 'future' with 'exception' or with
+        the end of iteration."""
+        self._close()
+        if not future.done():
+            future.set_exception(exception or _stop_async_iteration())
+
+    def _step(self, loop, future):
+        """Evaluates up to 'steps' steps in the event loop's thread and
+        reschedules itself, until the next interval is generated."""
+        if future.cancelled():
+            return
+        if self._closed:
+            self._finish(future)
+            return
+
+        taken = 0
+        while taken < self.steps:
+            try:
+                interval = self.forward.step()
+            except StopIteration:
+                self._finish(future)
+                return
+            except Exception as exception:  # pylint: disable=broad-except
+                self._finish(future, exception)
+                return
+            if interval is not None:
+                future.set_result(interval)
+                return
+            taken += 1
+        loop.call_soon(self._step, loop, future)
+
+    def _next(self, loop, future):
+        """Resolves 'future' with the next interval, evaluating chunks
+        of 'steps' steps in the executor."""
+        if self._intervals:
+            future.set_result(self._intervals.pop(0))
+            return
+        if self._exhausted or self._closed:
+            self._finish(future)
+            return
+
+        self._pending = loop.run_in_executor(self.executor, _advance,
+                                             self.forward, self.steps)
+
+        def done(pending):
+            """Stores results of a chunk."""
+            self._pending = None
+            if future.cancelled():
+                return
+            try:
+                intervals, self._exhausted = pending.result()
+            except Exception as exception:  # pylint: disable=broad-except
+                self._finish(future, exception)
+                return
+            self._intervals.extend(intervals)
+            self._next(loop, future)
+
+        self._pending.add_done_callback(done)
+
+    def _close(self):
+        """Closes the underlying iterator."""
+        self._closed = True
+        self._intervals = []
+        self.forward.close()
+
+    def aclose(self):
+        """Ends iteration and closes the underlying iterator, after
+        a chunk, which is being evaluated in an executor, is finished.
+
+        Returns
+        -------
+        asyncio.Future
+            Resolved, when the iterator is closed.
+        """
+        import asyncio
+
+        future = asyncio.Future(loop=asyncio.get_event_loop())
+        pending = self._pending
+        self._closed = True
+
+        def close(_=None):
+            """Closes the iterator and resolves the future."""
+            self._close()
+            if not future.done():
+                future.set_result(None)
+
+        if pending is None:
+            close()
+        else:
+            pending.add_done_callback(close)
+        return future
+
+
+def aforward(recurrenteventset, start, trim=True, steps=None,
+             executor=None, max_steps=None, deadline=None):
+    """Asynchronous version of :py:meth:`.RecurrentEventSet.forward`.
+
+    Evaluation of an expression is performed by steps, after each 'steps'
+    steps control is given back to the event loop, so iteration over
+    a schedule, that produces intervals rarely, doesn't block it.
+
+    Parameters
+    ----------
+    recurrenteventset : tempo.recurrenteventset.RecurrentEventSet
+        A schedule to iterate.
+    start : datetime.datetime
+        Inclusive start date.
+    trim : bool
+        The same as for :py:meth:`.RecurrentEventSet.forward`.
+    steps : int, optional
+        Number of steps of evaluation between switches to the event loop,
+        defaults to :py:data:`STEPS`.
+    executor : concurrent.futures.Executor, optional
+        If given, chunks of 'steps' steps are evaluated in the executor,
+        instead of the event loop's thread. Since the state of the
+        iteration is shared between chunks, it must be a thread-based
+        executor.
+    max_steps : int, optional
+        The same as for :py:meth:`.RecurrentEventSet.forward`.
+    deadline : float, optional
+        The same as for :py:meth:`.RecurrentEventSet.forward`.
+
+    Returns
+    -------
+    AsyncForward
+        Asynchronous iterator over inclusive start and non-inclusive
+        dates of intervals.
+
+    Raises
+    ------
+    tempo.recurrenteventset.LimitExceeded
+        If 'max_steps' or 'deadline' is exceeded.
+
+    Examples
+    --------
+    >>> intervals = aforward(recurrenteventset, start)  # doctest: +SKIP
+    >>> try:  # doctest: +SKIP
+    ...     async for interval in intervals:
+    ...         if interval[0] > stop:
+    ...             break
+    ... finally:
+    ...     await intervals.aclose()
+    """
+    if steps is None:
+        steps = STEPS
+    forward = recurrenteventset.forward(start, trim, max_steps=max_steps,
+                                        deadline=deadline)
+    return AsyncForward(forward, steps, executor)
@@ -0,0 +1,244 @@
+# coding=utf-8
+"""Provides bulk evaluation of many schedules against many points
+of time.
+
+Each distinct `RecurrentEvent` is tested for containment of the points
+of time only once, results of atoms are shared between all schedules,
+which contain them, so the cost of evaluation depends on number
+of distinct atoms, rather than on total number of atoms of schedules.
+"""
+import json
+import multiprocessing as mp
+from multiprocessing.sharedctypes import RawArray
+
+from six.moves import range, zip  # pylint: disable=redefined-builtin
+
+from tempo.recurrenteventset import (AND, OR, RecurrentEventSet, Result,
+                                     _walk)
+
+
+# Per-process state of pool workers, populated by `_initialize()`.
+_STATE = {}
+
+
+class ContainsMatrix(object):
+    """Boolean matrix of containment test results.
+
+    Rows correspond to schedules and columns to timestamps, in the order
+    they were passed to :py:func:`contains_matrix`. Results are stored
+    row by row in a flat shared memory buffer of bytes, each byte is
+    either 0 or 1.
+
+    Examples
+    --------
+    Buffer can be wrapped without copying, for example with NumPy::
+
+        >>> numpy.frombuffer(matrix.buffer, dtype=bool).reshape(matrix.shape)
+    """
+    __slots__ = ['buffer', 'shape']
+
+    def __init__(self, buffer, shape):
+        self.buffer = buffer
+        self.shape = shape
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, index):
+        row, column = index
+        return bool(self.buffer[row * self.shape[1] + column])
+
+    def row(self, index):
+        """Results for the schedule with given 'index' as list."""
+        width = self.shape[1]
+        return [bool(v)
+                for v in self.buffer[index * width:(index + 1) * width]]
+
+    def tolist(self):
+        """Results as list of rows."""
+        return [self.row(index) for index in range(self.shape[0])]
+
+    def __repr__(self):
+        return 'ContainsMatrix(shape={})'.format(repr(self.shape))
+
+
+def _contains(schedule, timestamps, atoms):
+    """Tests each of 'timestamps' for containment in 'schedule'.
+
+    Parameters
+    ----------
+    schedule : tempo.recurrenteventset.RecurrentEventSet
+        A schedule.
+    timestamps : list
+        Timestamps to test for containment.
+    atoms : dict
+        Memoized results of `RecurrentEvent` instances for 'timestamps',
+        updated with results of atoms of 'schedule'.
+
+    Returns
+    -------
+    list
+        Results of containment tests.
+    """
+    def callback(operator, *args):
+        """Combines results of arguments of an operator for all
+        timestamps at once."""
+        columns = []
+        for arg in args:
+            if isinstance(arg, Result):
+                columns.append(arg.value)
+                continue
+            try:
+                column = atoms[arg]
+            except KeyError:
+                column = atoms[arg] = [timestamp in arg
+                                       for timestamp in timestamps]
+            columns.append(column)
+
+        if operator == AND:
+            if not columns:
+                return Result([True] * len(timestamps))
+            return Result([all(values) for values in zip(*columns)])
+        elif operator == OR:
+            if not columns:
+                return Result([False] * len(timestamps))
+            return Result([any(values) for values in zip(*columns)])
+        return Result([not value for value in columns[0]])
+
+    return _walk(schedule.expression, callback).value
+
+
+def contains_batch(schedules, timestamps):
+    """Tests each of 'timestamps' for containment in each of 'schedules'
+    in the current process.
+
+    Parameters
+    ----------
+    schedules : iterable
+        `RecurrentEventSet` instances.
+    timestamps : iterable
+        `datetime.datetime` objects.
+
+    Returns
+    -------
+    list
+        A list of results of containment tests per each schedule.
+
+    Examples
+    --------
+    >>> contains_batch(schedules, [datetime.now()])
+    ... [[True], [False], [True]]
+    """
+    timestamps = list(timestamps)
+    atoms = {}
+    return [_contains(schedule, timestamps, atoms) for schedule in schedules]
+
+
+def _fill(schedules, timestamps, buffer, start, stop, atoms=None):
+    """Evaluates rows from 'start' to 'stop' (non-inclusive) and writes
+    results to 'buffer'.
+
+    Parameters
+    ----------
+    schedules : list
+        JSON representations of schedules.
+    timestamps : list
+        Timestamps to test for containment.
+    buffer : multiprocessing.sharedctypes.RawArray
+        Result buffer.
+    start : int
+        Index of the first row.
+    stop : int
+        Non-inclusive index of the last row.
+    atoms : dict, optional
+        Memoized results of atoms, see :py:func:`_contains`.
+    """
+    if atoms is None:
+        atoms = {}
+    width = len(timestamps)
+    for index in range(start, stop):
+        schedule = RecurrentEventSet.from_json(schedules[index])
+        offset = index * width
+        buffer[offset:offset + width] = [
+            int(value) for value in _contains(schedule, timestamps, atoms)
+        ]
+
+
+def _initialize(schedules, timestamps, buffer):
+    """Pool worker initializer, receives the data shared by all tasks
+    once per worker process."""
+    _STATE['schedules'] = json.loads(schedules)
+    _STATE['timestamps'] = timestamps
+    _STATE['buffer'] = buffer
+    _STATE['atoms'] = {}
+
+
+def _evaluate(bounds):
+    """Pool task, evaluates a range of rows."""
+    start, stop = bounds
+    _fill(_STATE['schedules'], _STATE['timestamps'], _STATE['buffer'],
+          start, stop, _STATE['atoms'])
+    return stop - start
+
+
+def contains_matrix(schedules, timestamps, workers=None, chunksize=None):
+    """Tests each of 'timestamps' for containment in each of 'schedules'.
+
+    Work is split by schedules between processes of a pool. Schedules
+    and timestamps are sent to each worker only once - at it's
+    initialization, schedules are sent as a single JSON string. Workers
+    write results directly to a shared memory buffer. Results of atoms
+    are shared between schedules, evaluated by the same worker, see
+    :py:func:`contains_batch`.
+
+    Parameters
+    ----------
+    schedules : iterable
+        `RecurrentEventSet` instances or their JSON representations.
+    timestamps : iterable
+        `datetime.datetime` objects.
+    workers : int, optional
+        Number of worker processes. Defaults to the number of CPUs.
+        With `1` evaluation is performed in the current process.
+    chunksize : int, optional
+        Number of schedules evaluated by a single task. By default work
+        is split into about four tasks per worker.
+
+    Returns
+    -------
+    ContainsMatrix
+        Results of containment tests.
+    """
+    schedules = [schedule.to_json() if hasattr(schedule, 'to_json')
+                 else schedule
+                 for schedule in schedules]
+    timestamps = list(timestamps)
+    height, width = len(schedules), len(timestamps)
+    buffer = RawArray('B', height * width)
+    matrix = ContainsMatrix(buffer, (height, width))
+
+    if workers is None:
+        workers = mp.cpu_count()
+    workers = max(1, min(workers, height))
+
+    if workers == 1 or width == 0:
+        _fill(schedules, timestamps, buffer, 0, height)
+        return matrix
+
+    if chunksize is None:
+        chunksize = -(-height // (workers * 4))
+
+    pool = mp.Pool(workers, initializer=_initialize,
+                   initargs=(json.dumps(schedules), timestamps, buffer))
+    try:
+        for _ in pool.imap_unordered(
+            _evaluate,
+            ((start, min(start + chunksize, height))
+             for start in range(0, height, chunksize))
+        ):
+            pass
+    finally:
+        pool.terminate()
+        pool.join()
+
+    return matrix
@@ -0,0 +1,263 @@
+# coding=utf-8
+"""Provides a cache of intervals of schedules, which can be shared
+between threads.
+
+Results are cached per windows, aligned by a unit of time, so requests
+with close start dates reuse the same entry. Entries are evicted in
+least recently used order, when number of entries or estimated memory,
+occupied by them, exceeds a limit, and expire after a time to live.
+
+Examples
+--------
+>>> cache = OccurrenceCache(maxsize=10000, ttl=300)
+>>> cache.forward(recurrenteventset, datetime.now(), 3)
+>>> cache.stats()
+... CacheStats(hits=0, misses=1, evictions=0, size=1, bytes=...)
+"""
+from collections import OrderedDict
+import datetime as dt
+import sys
+import threading
+import time
+
+from tempo.timeutils import add_delta, floor
+from tempo.unit import Unit
+
+
+_SAMPLE = dt.datetime(2000, 1, 1)
+# Estimated number of bytes, occupied by an entry and by an interval.
+_ENTRY_SIZE = sys.getsizeof([]) + sys.getsizeof(())
+_INTERVAL_SIZE = (sys.getsizeof((_SAMPLE, _SAMPLE)) +
+                  2 * sys.getsizeof(_SAMPLE) + sys.getsizeof(None))
+
+
+class CacheStats(object):
+    """Statistics of :py:class:`OccurrenceCache`.
+
+    Attributes
+    ----------
+    hits : int
+        Number of requests, served from the cache.
+    misses : int
+        Number of requests, which required evaluation.
+    evictions : int
+        Number of entries, removed due to limits or expiration.
+    size : int
+        Current number of entries.
+    bytes : int
+        Estimated memory, occupied by entries.
+    """
+    __slots__ = ['hits', 'misses', 'evictions', 'size', 'bytes']
+
+    def __init__(self, hits=0, misses=0, evictions=0, size=0, bytes=0):
+        # pylint: disable=redefined-builtin
+        self.hits = hits
+        self.misses = misses
+        self.evictions = evictions
+        self.size = size
+        self.bytes = bytes
+
+    def __eq__(self, other):
+        return (isinstance(other, CacheStats) and
+                all(getattr(self, name) == getattr(other, name)
+                    for name in self.__slots__))
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return 'CacheStats({})'.format(', '.join(
+            '{}={}'.format(name, repr(getattr(self, name)))
+            for name in self.__slots__
+        ))
+
+
+def _after(intervals, start, n):
+    """First 'n' of 'intervals', ending later than 'start', trimmed
+    by it."""
+    result = []
+    for a, b in intervals:
+        if b <= start:
+            continue
+        result.append((max(a, start), b))
+        if len(result) >= n:
+            break
+    return result
+
+
+class OccurrenceCache(object):
+    """Cache of results of :py:meth:`.RecurrentEventSet.forward` and
+    :py:meth:`.RecurrentEventSet.between`.
+
+    Entries are keyed by schedules (equal schedules share entries)
+    and by windows, aligned by 'unit'. All methods are safe to call from
+    many threads, evaluation on misses is performed outside of the lock,
+    so misses of different threads don't block each other.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximal number of entries.
+    ttl : float, optional
+        Time to live of entries in seconds.
+    max_bytes : int, optional
+        Maximal estimated memory, occupied by entries.
+    unit : str
+        A unit of time, by which windows are aligned.
+    """
+    def __init__(self, maxsize=1024, ttl=None, max_bytes=None,
+                 unit=Unit.DAY):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.unit = unit
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def _get(self, key):
+        """Returns the value of a live entry or `None`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, size, expires = entry
+            if expires is not None and expires <= time.time():
+                self._remove(key)
+                return None
+            del self._entries[key]
+            self._entries[key] = entry
+            return value
+
+    def _put(self, key, value, count):
+        """Stores 'value' of 'count' intervals and evicts entries, which
+        don't fit into limits."""
+        size = _ENTRY_SIZE + count * _INTERVAL_SIZE
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires = None if self.ttl is None else time.time() + self.ttl
+        with self._lock:
+            if key in self._entries:
+                self._remove(key, evicted=False)
+            self._entries[key] = (value, size, expires)
+            self._stats.bytes += size
+            while (len(self._entries) > self.maxsize or
+                   (self.max_bytes is not None and
+                    self._stats.bytes > self.max_bytes)):
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key, evicted=True):
+        """Removes entry 'key', must be called under the lock."""
+        _, size, _ = self._entries.pop(key)
+        self._stats.bytes -= size
+        if evicted:
+            self._stats.evictions += 1
+
+    def _count(self, hit):
+        """Counts a hit or a miss."""
+        with self._lock:
+            if hit:
+                self._stats.hits += 1
+            else:
+                self._stats.misses += 1
+
+    def forward(self, recurrenteventset, start, n, max_steps=None,
+                deadline=None):
+        """First 'n' intervals of ``recurrenteventset.forward(start)``.
+
+        Parameters
+        ----------
+        recurrenteventset : tempo.recurrenteventset.RecurrentEventSet
+            A schedule.
+        start : datetime.datetime
+            Inclusive start date.
+        n : int
+            Maximal number of intervals.
+        max_steps : int, optional
+            The same as for :py:meth:`.RecurrentEventSet.forward`,
+            applies on misses.
+        deadline : float, optional
+            The same as for :py:meth:`.RecurrentEventSet.forward`,
+            applies on misses.
+
+        Returns
+        -------
+        list
+            Tuples of inclusive start and non-inclusive end dates
+            of intervals.
+        """
+        aligned = floor(start, self.unit)
+        key = ('forward', recurrenteventset, aligned)
+        value = self._get(key)
+        if value is not None:
+            intervals, complete = value
+            result = _after(intervals, start, n)
+            if len(result) >= n or complete:
+                self._count(hit=True)
+                return result
+        self._count(hit=False)
+
+        intervals = []
+        found = 0
+        complete = True
+        for a, b in recurrenteventset.forward(aligned, max_steps=max_steps,
+                                              deadline=deadline):
+            intervals.append((a, b))
+            if b > start:
+                found += 1
+                if found >= n:
+                    complete = False
+                    break
+        self._put(key, (intervals, complete), len(intervals))
+        return _after(intervals, start, n)
+
+    def between(self, recurrenteventset, start, stop):
+        """Intervals of ``recurrenteventset.between(start, stop)``.
+
+        Parameters
+        ----------
+        recurrenteventset : tempo.recurrenteventset.RecurrentEventSet
+            A schedule.
+        start : datetime.datetime
+            Inclusive start of the window.
+        stop : datetime.datetime
+            Non-inclusive end of the window.
+
+        Returns
+        -------
+        list
+            Tuples of inclusive start and non-inclusive end dates
+            of intervals.
+        """
+        if start >= stop:
+            return []
+        lower = floor(start, self.unit)
+        upper = floor(stop, self.unit)
+        if upper < stop:
+            try:
+                upper = add_delta(upper, 1, self.unit)
+            except OverflowError:
+                upper = stop
+
+        key = ('between', recurrenteventset, lower, upper)
+        intervals = self._get(key)
+        self._count(hit=intervals is not None)
+        if intervals is None:
+            intervals = list(recurrenteventset.between(lower, upper))
+            self._put(key, intervals, len(intervals))
+
+        return [(max(a, start), min(b, stop)) for a, b in intervals
+                if b > start and a < stop]
+
+    def stats(self):
+        """Returns a snapshot of :py:class:`CacheStats`."""
+        with self._lock:
+            stats = self._stats
+            return CacheStats(stats.hits, stats.misses, stats.evictions,
+                              len(self._entries), stats.bytes)
+
+    def clear(self):
+        """Removes all entries, statistics are preserved."""
+        with self._lock:
+            self._entries.clear()
+            self._stats.bytes = 0
@@ -0,0 +1,163 @@
+# coding=utf-8
+"""Provides resumable iteration over intervals of schedules.
+
+A cursor remembers the point of time, from which iteration continues,
+so fetching of a next page of intervals costs the same regardless
+of number of pages, fetched before. The state of a cursor can
+be encoded into an opaque URL-safe token and resumed later, possibly
+in another process.
+
+Examples
+--------
+>>> cursor = Cursor(recurrenteventset, datetime.now())
+>>> page = cursor.fetch(10)
+>>> token = cursor.token
+>>> # ... later, in response to a request of the next page:
+>>> page = Cursor.from_token(recurrenteventset, token).fetch(10)
+"""
+import base64
+import datetime as dt
+import hashlib
+import json
+from itertools import islice
+
+from six import text_type
+
+from tempo.unit import MAX
+
+
+_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
+
+def _format(datetime):
+    """Formats 'datetime' according to '_FORMAT', unlike
+    ``strftime()``, years before 1000 are zero-padded."""
+    return '{:04d}-{:02d}-{:02d}T{:02d}:{:02d}:{:02d}.{:06d}'.format(
+        datetime.year, datetime.month, datetime.day, datetime.hour,
+        datetime.minute, datetime.second, datetime.microsecond
+    )
+
+
+def _digest(recurrenteventset):
+    """Short digest of an expression, which binds tokens to it."""
+    value = json.dumps(recurrenteventset.to_json(), separators=(',', ':'))
+    return hashlib.sha1(value.encode('utf-8')).hexdigest()[:8]
+
+
+class Cursor(object):
+    """Position of iteration over intervals of a schedule.
+
+    Parameters
+    ----------
+    recurrenteventset : tempo.recurrenteventset.RecurrentEventSet
+        A schedule to iterate.
+    start : datetime.datetime
+        Inclusive start date.
+    trim : bool
+        The same as for :py:meth:`.RecurrentEventSet.forward`, affects
+        only the first interval.
+
+    Attributes
+    ----------
+    position : datetime.datetime or None
+        A point of time, from which the iteration continues, or `None`,
+        if intervals are exhausted.
+    """
+    __slots__ = ['recurrenteventset', 'position', 'trim']
+
+    def __init__(self, recurrenteventset, start, trim=True):
+        self.recurrenteventset = recurrenteventset
+        self.position = start
+        self.trim = trim
+
+    @property
+    def exhausted(self):
+        """Checks if there are no more intervals."""
+        return self.position is None
+
+    def fetch(self, n, max_steps=None, deadline=None):
+        """Fetches next 'n' intervals and advances the cursor after them.
+
+        Parameters
+        ----------
+        n : int
+            Maximal number of intervals to fetch.
+        max_steps : int, optional
+            The same as for :py:meth:`.RecurrentEventSet.forward`.
+        deadline : float, optional
+            The same as for :py:meth:`.RecurrentEventSet.forward`.
+
+        Returns
+        -------
+        list
+            Tuples of inclusive start and non-inclusive end dates
+            of intervals, less than 'n' only if the intervals are
+            exhausted.
+
+        Raises
+        ------
+        tempo.recurrenteventset.LimitExceeded
+            If 'max_steps' or 'deadline' is exceeded, the cursor is not
+            advanced in this case.
+        """
+        if self.position is None or n <= 0:
+            return []
+
+        intervals = list(islice(
+            self.recurrenteventset.forward(self.position, self.trim,
+                                           max_steps=max_steps,
+                                           deadline=deadline),
+            n
+        ))
+
+        if len(intervals) < n or intervals[-1][1] >= MAX:
+            self.position = None
+        elif len(intervals) > 0:
+            # Intervals are maximal, so the next one starts later than
+            # the end of the last one.
+            self.position = intervals[-1][1]
+            self.trim = True
+        return intervals
+
+    @property
+    def token(self):
+        """Opaque URL-safe token, which encodes state of the cursor."""
+        position = (None if self.position is None
+                    else _format(self.position))
+        value = json.dumps([_digest(self.recurrenteventset), position,
+                            self.trim], separators=(',', ':'))
+        return text_type(base64.urlsafe_b64encode(value.encode('utf-8'))
+                         .decode('ascii').rstrip('='))
+
+    @classmethod
+    def from_token(cls, recurrenteventset, token):
+        """Resumes a cursor from a token, obtained from
+        :py:attr:`token`.
+
+        Parameters
+        ----------
+        recurrenteventset : tempo.recurrenteventset.RecurrentEventSet
+            The same schedule, as of the encoded cursor.
+        token : str
+            The token.
+
+        Raises
+        ------
+        ValueError
+            If the token is malformed or belongs to another schedule.
+        """
+        try:
+            padding = '=' * (-len(token) % 4)
+            value = json.loads(base64.urlsafe_b64decode(
+                (token + padding).encode('ascii')
+            ).decode('utf-8'))
+            digest, position, trim = value
+            if position is not None:
+                position = dt.datetime.strptime(position, _FORMAT)
+        except (TypeError, ValueError, UnicodeError):
+            raise ValueError('Malformed token', token)
+
+        if digest != _digest(recurrenteventset):
+            raise ValueError('Token belongs to another schedule', token)
+
+        return cls(recurrenteventset, position, bool(trim))
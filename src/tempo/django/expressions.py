@@ -0,0 +1,63 @@
+# coding=utf-8
+"""Provides Django query expressions for RecurrentEventSetField.
+Requires Django 1.8+."""
+from django.db import models
+# pylint: disable=no-init,no-member,super-on-old-class
+
+
+class _Cast(models.Func):
+    """Casts an expression to a given SQL type."""
+    template = '%(expressions)s::%(db_type)s'
+
+    def __init__(self, expression, db_type):
+        super(_Cast, self).__init__(expression, db_type=db_type)
+
+
+class _RecurrentEventSetFunc(models.Func):
+    """Base of expressions, which call a function of a recurrenteventset
+    and a ``datetime``."""
+    output_field_class = None
+
+    def __init__(self, recurrenteventset, datetime, **extra):
+        super(_RecurrentEventSetFunc, self).__init__(
+            _Cast(recurrenteventset, 'tempo_recurrenteventset'),
+            _Cast(datetime, 'timestamp'),
+            output_field=self.output_field_class(),
+            **extra
+        )
+
+
+class NextStart(_RecurrentEventSetFunc):
+    """Start of the next interval of a :py:class:`.RecurrentEventSetField`
+    from given ``datetime`` - the ``datetime`` itself, if it's contained
+    in the interval, or ``None``, if there are no more intervals or they
+    are not found in a limited number of steps, e.g. for an empty
+    recurrenteventset, see ``tempo_recurrenteventset_next_start()``.
+
+    Examples
+    --------
+    Stores, ordered by the soonest opening::
+
+        >>> Store.objects.annotate(
+        ...     opens=NextStart(F('schedule'), datetime.now())
+        ... ).order_by('opens')
+    """
+    function = 'tempo_recurrenteventset_next_start'
+    output_field_class = models.DateTimeField
+
+
+class NextStop(_RecurrentEventSetFunc):
+    """End of the interval of a :py:class:`.RecurrentEventSetField`,
+    that contains given ``datetime``, or of the next one, or ``None``,
+    if there are no more intervals or they are not found in a limited
+    number of steps."""
+    function = 'tempo_recurrenteventset_next_stop'
+    output_field_class = models.DateTimeField
+
+
+class IsOpen(_RecurrentEventSetFunc):
+    """Checks a ``datetime`` for containment in
+    a :py:class:`.RecurrentEventSetField`, the same as `contains` lookup,
+    but can be used in annotations and ordering."""
+    function = 'tempo_recurrenteventset_contains'
+    output_field_class = models.BooleanField
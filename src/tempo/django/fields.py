@@ -109,3 +109,83 @@ class OccursWithin(models.Lookup):
                 """ % (rhs, rhs, lhs, rhs), (start, stop, start))
 
 RecurrentEventSetField.register_lookup(OccursWithin)
+
+
+class SharedRecurrentEventSetField(RecurrentEventSetField):
+    """DB representation of recurrenteventset, deduplicated in a shared
+    table. Requires PostgreSQL 9.4+ and Django 1.8+.
+
+    A column stores a digest of the canonical JSON representation
+    of a recurrenteventset, which itself is stored once
+    in ``tempo_schedule`` table. Lookups evaluate each distinct
+    recurrenteventset of the column once and match rows by digests,
+    instead of evaluating recurrenteventset of each row.
+
+    Existing :py:class:`RecurrentEventSetField` columns are converted
+    by :py:class:`tempo.django.operations.ShareRecurrentEventSetField`
+    migration operation.
+
+    Recurrenteventsets are not deleted from the shared table with rows,
+    which stored them, so run ``tempo_vacuum_schedules`` management
+    command periodically, for example, daily, to delete recurrenteventsets,
+    no longer stored by any field. Writes of the fields wait, while
+    it deletes them.
+    """
+
+    def db_type(self, connection):  # pylint: disable=unused-argument
+        return 'char(32)'
+
+    def get_placeholder(self, value, compiler, connection):
+        # pylint: disable=unused-argument
+        return 'tempo_schedule_intern(%s::tempo_recurrenteventset)'
+
+    def select_format(self, compiler, sql, params):
+        # pylint: disable=unused-argument
+        return 'tempo_schedule_get(%s)' % sql, params
+
+
+class _SharedLookup(object):
+    """Evaluates a lookup once per each distinct recurrenteventset
+    of the column."""
+
+    def process_lhs(self, compiler, connection, lhs=None):
+        # pylint: disable=unused-argument
+        return 'tempo_schedule.recurrenteventset', []
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = super(_SharedLookup, self).process_lhs(compiler,
+                                                                 connection)
+        condition, params = super(_SharedLookup, self).as_sql(compiler,
+                                                              connection)
+        target = self.lhs.target
+        # OFFSET 0 keeps the planner from evaluating the condition
+        # before recurrenteventsets of other columns are filtered out.
+        return ('%s IN (SELECT tempo_schedule.digest FROM ('
+                'SELECT digest, recurrenteventset FROM tempo_schedule '
+                'WHERE digest IN (SELECT %s FROM %s) OFFSET 0'
+                ') AS tempo_schedule WHERE %s)' %
+                (lhs, connection.ops.quote_name(target.column),
+                 connection.ops.quote_name(target.model._meta.db_table),
+                 condition),
+                list(lhs_params) + list(params))
+
+
+class SharedContains(_SharedLookup, Contains):
+    """Provides `contains` lookup for
+    :py:class:`.SharedRecurrentEventSetField`."""
+
+SharedRecurrentEventSetField.register_lookup(SharedContains)
+
+
+class SharedIntersects(_SharedLookup, Intersects):
+    """Provides `intersects` lookup for
+    :py:class:`.SharedRecurrentEventSetField`."""
+
+SharedRecurrentEventSetField.register_lookup(SharedIntersects)
+
+
+class SharedOccursWithin(_SharedLookup, OccursWithin):
+    """Provides `occurs_within` lookup for
+    :py:class:`.SharedRecurrentEventSetField`."""
+
+SharedRecurrentEventSetField.register_lookup(SharedOccursWithin)
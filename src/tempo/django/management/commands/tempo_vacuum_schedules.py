@@ -0,0 +1,47 @@
+# coding=utf-8
+"""Provides ``tempo_vacuum_schedules`` management command.
+Requires Django 1.8+."""
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections, router, transaction
+
+from tempo.django.fields import SharedRecurrentEventSetField
+
+
+def _shared_columns(using):
+    """Tables and columns of :py:class:`.SharedRecurrentEventSetField`
+    fields of models of database 'using'."""
+    columns = set()
+    for model in apps.get_models():
+        if (model._meta.proxy or
+                not router.allow_migrate_model(using, model)):
+            continue
+        for field in model._meta.concrete_fields:
+            if isinstance(field, SharedRecurrentEventSetField):
+                columns.add((model._meta.db_table, field.column))
+    return sorted(columns)
+
+
+class Command(BaseCommand):
+    """Deletes recurrenteventsets of ``tempo_schedule`` table, which are
+    no longer stored in any :py:class:`.SharedRecurrentEventSetField`
+    column, see ``tempo_schedule_vacuum()`` SQL function."""
+    help = ('Deletes recurrenteventsets of shared table, which are not '
+            'referenced by SharedRecurrentEventSetField columns.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS,
+                            help='Database to vacuum.')
+
+    def handle(self, *args, **options):
+        using = options['database']
+        columns = _shared_columns(using)
+        with transaction.atomic(using=using):
+            with connections[using].cursor() as cursor:
+                cursor.execute(
+                    'SELECT tempo_schedule_vacuum(%s::regclass[], %s::name[])',
+                    ([table for table, _ in columns],
+                     [column for _, column in columns])
+                )
+                deleted = cursor.fetchone()[0]
+        self.stdout.write('Deleted %d recurrenteventsets.' % deleted)
@@ -0,0 +1,55 @@
+# coding=utf-8
+"""Provides Django migration operations for RecurrentEventSetField.
+Requires Django 1.8+."""
+from django.db.migrations import AlterField
+
+from tempo.django.fields import SharedRecurrentEventSetField
+# pylint: disable=no-init,no-member,super-on-old-class
+
+
+class ShareRecurrentEventSetField(AlterField):
+    """Alters :py:class:`.RecurrentEventSetField` to
+    :py:class:`.SharedRecurrentEventSetField` or back, moving
+    recurrenteventsets of existing rows to the shared table and back.
+
+    Plain ``AlterField`` can't convert values of the column, so replace
+    it with this operation in a migration, generated by
+    ``makemigrations``. Only type of the column is altered.
+
+    Examples
+    --------
+    ::
+
+        operations = [
+            ShareRecurrentEventSetField(
+                model_name='store',
+                name='schedule',
+                field=SharedRecurrentEventSetField('Schedule'),
+            ),
+        ]
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state,
+                          to_state):
+        to_model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allowed_to_migrate(schema_editor.connection.alias,
+                                       to_model):
+            return
+
+        field = to_model._meta.get_field(self.name)
+        column = schema_editor.quote_name(field.column)
+        if isinstance(field, SharedRecurrentEventSetField):
+            using = 'tempo_schedule_intern(%s::tempo_recurrenteventset)'
+        else:
+            using = 'tempo_schedule_get(%s)'
+
+        schema_editor.execute(
+            'ALTER TABLE %s ALTER COLUMN %s TYPE %s USING %s' %
+            (schema_editor.quote_name(to_model._meta.db_table), column,
+             field.db_type(schema_editor.connection), using % column)
+        )
+
+    def describe(self):
+        return 'Share recurrenteventsets of field %s on %s' % (
+            self.name, self.model_name
+        )
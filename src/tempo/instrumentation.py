@@ -0,0 +1,162 @@
+# coding=utf-8
+"""Provides opt-in instrumentation of evaluation of schedules.
+
+Functions and methods of the library report counts at their call sites,
+only while at least one collector or hook is active, so disabled
+instrumentation costs a single check of :py:data:`enabled` per call.
+
+Collected counters:
+
+    * ``walk.visits`` - visits of operator nodes of expressions.
+    * ``recurrentevent.contains`` - containment tests of
+      `RecurrentEvent` instances.
+    * ``recurrentevent.forward.advances`` - advances of
+      `RecurrentEvent.forward()` generators, additionally counted per
+      each `RecurrentEvent` instance by collectors.
+    * ``sparseinterval.<operation>.calls`` and
+      ``sparseinterval.<operation>.size`` - calls of `union`,
+      `intersection`, `difference` and `trim` of `SparseInterval`
+      and total number of intervals in their operands.
+    * ``timeutils.<function>.calls`` - calls of `floor`, `delta`
+      and `add_delta`.
+
+Examples
+--------
+>>> with collect() as counters:
+...     datetime in recurrenteventset
+>>> counters['recurrentevent.contains']
+2
+"""
+from collections import Counter
+from contextlib import contextmanager
+import threading
+
+
+WALK_VISITS = 'walk.visits'
+RECURRENTEVENT_CONTAINS = 'recurrentevent.contains'
+RECURRENTEVENT_ADVANCES = 'recurrentevent.forward.advances'
+
+#: Whether at least one collector or hook is active. Instrumented call
+#: sites check it before reporting counts.
+enabled = False  # pylint: disable=invalid-name
+
+# Active collectors of the current thread.
+_local = threading.local()
+_lock = threading.RLock()
+# Registered hooks and number of active collectors and hooks.
+_state = {'hooks': (), 'users': 0}
+
+
+class Counters(Counter):
+    """Counters, collected by :py:func:`collect`.
+
+    Attributes
+    ----------
+    advances : collections.Counter
+        Advances of `RecurrentEvent.forward()` generators per each
+        `RecurrentEvent` instance.
+    """
+    def __init__(self, *args, **kwargs):
+        super(Counters, self).__init__(*args, **kwargs)
+        self.advances = Counter()
+
+
+def record(name, value=1):
+    """Adds 'value' to counter 'name' of active collectors of the current
+    thread and passes it to hooks.
+
+    Intended to be called by instrumented call sites, when
+    :py:data:`enabled` is set.
+    """
+    for counters in getattr(_local, 'collectors', ()):
+        counters[name] += value
+    for hook in _state['hooks']:
+        hook(name, value)
+
+
+def record_advance(recurrentevent):
+    """Counts an advance of `forward()` generator of 'recurrentevent'."""
+    for counters in getattr(_local, 'collectors', ()):
+        counters.advances[recurrentevent] += 1
+    record(RECURRENTEVENT_ADVANCES)
+
+
+def record_operation(operation, *operands):
+    """Counts a call of 'operation' of `SparseInterval` and intervals
+    of it's `SparseInterval` 'operands'."""
+    record('sparseinterval.{}.calls'.format(operation))
+    record('sparseinterval.{}.size'.format(operation),
+           sum(len(operand.intervals) for operand in operands))
+
+
+def _acquire():
+    """Enables instrumentation for the first user of it."""
+    global enabled  # pylint: disable=global-statement,invalid-name
+    with _lock:
+        _state['users'] += 1
+        enabled = True
+
+
+def _release():
+    """Disables instrumentation after the last user of it."""
+    global enabled  # pylint: disable=global-statement,invalid-name
+    with _lock:
+        _state['users'] -= 1
+        if _state['users'] == 0:
+            enabled = False
+
+
+def is_enabled():
+    """Checks if instrumentation is enabled."""
+    return enabled
+
+
+@contextmanager
+def collect():
+    """Collects counters of evaluation, performed by the current thread
+    within the context.
+
+    Collectors can be nested, each of them receives all counts from
+    it's context.
+
+    Yields
+    ------
+    Counters
+        Counters, updated while the context is active.
+    """
+    counters = Counters()
+    _acquire()
+    collectors = _local.__dict__.setdefault('collectors', [])
+    collectors.append(counters)
+    try:
+        yield counters
+    finally:
+        collectors.remove(counters)
+        _release()
+
+
+def add_hook(hook):
+    """Registers 'hook', which receives counts of evaluation, performed
+    by any thread, until it's removed with :py:func:`remove_hook`.
+
+    Intended to feed metrics exporters.
+
+    Parameters
+    ----------
+    hook : callable
+        Is called as ``hook(name, value)`` on each count, where `name`
+        is the name of a counter and `value` is an integer to add
+        to it.
+    """
+    with _lock:
+        _state['hooks'] += (hook,)
+        _acquire()
+
+
+def remove_hook(hook):
+    """Unregisters 'hook', registered with :py:func:`add_hook`."""
+    with _lock:
+        hooks = list(_state['hooks'])
+        hooks.remove(hook)
+        _state['hooks'] = tuple(hooks)
+        _release()
@@ -0,0 +1,561 @@
+# coding=utf-8
+"""Analysis of recurrent event expressions over periods of their
+recurrence.
+
+Truth value of an expression changes only at boundaries of it's
+`RecurrentEvent` atoms, so the time covered by an expression within
+some window can be computed by splitting the window at these
+boundaries and evaluating the expression once per each part.
+
+To avoid enumerating every boundary within large windows, atoms are
+divided into three groups:
+
+    * "absolute" - without recurrence. They split time into a few
+      segments, within each of them these atoms are constant.
+    * "fine" - recurring daily, hourly or every minute. Their truth
+      value depends only on the time of a day, so they are evaluated
+      once over a single day.
+    * "coarse" - recurring weekly, monthly or yearly. Their truth value
+      depends only on position within a week or a year and on the
+      type of the year - whether it is leap and from which day of the
+      week it starts. So they are evaluated once per each of 14
+      types of years or once for a week.
+
+Results for whole periods are memoized, so only partial periods at the
+edges of a window are evaluated explicitly.
+"""
+from calendar import isleap
+from collections import OrderedDict
+import datetime as dt
+import heapq
+from itertools import groupby
+from operator import itemgetter
+
+from tempo.recurrentevent import RecurrentEvent
+from tempo.recurrenteventset import AND, OR, NOT, Result, _walk
+from tempo.timeutils import add_delta, floor
+from tempo.unit import Unit, BASE, MIN
+
+
+_FINE = {Unit.MINUTE, Unit.HOUR, Unit.DAY}
+_COARSE = {Unit.WEEK, Unit.MONTH, Unit.YEAR}
+_DAY = dt.timedelta(days=1)
+_WEEK = dt.timedelta(days=7)
+_ZERO = dt.timedelta(0)
+
+# An arbitrary day, over which patterns of "fine" atoms are evaluated.
+_REFERENCE = dt.datetime(2000, 1, 3)
+
+# Memoized results for sub-expressions in least recently used order.
+_CACHE = OrderedDict()
+_CACHE_SIZE = 4096
+_MISSING = object()
+
+
+class Measure(object):
+    """Summary of time, covered by an expression within a window.
+
+    Measures of adjacent windows are combined with ``+``,
+    a measure of a window can be repeated with ``*``. Intervals, touching
+    the common edge of adjacent windows, are merged.
+
+    Attributes
+    ----------
+    duration : datetime.timedelta
+        Total covered time.
+    count : int
+        Number of maximal intervals within the window.
+    head : bool
+        Whether the start of the window is covered, `None` for an empty
+        window.
+    tail : bool
+        Whether time just before the end of the window is covered, `None`
+        for an empty window.
+    """
+    __slots__ = ['duration', 'count', 'head', 'tail']
+
+    def __init__(self, duration=_ZERO, count=0, head=None, tail=None):
+        self.duration = duration
+        self.count = count
+        self.head = head
+        self.tail = tail
+
+    @classmethod
+    def of(cls, intervals, start, stop):
+        """Measure of sorted non-overlapping 'intervals' within
+        window from 'start' to 'stop'."""
+        if start >= stop:
+            return cls()
+        duration = _ZERO
+        count = 0
+        previous = None
+        for a, b in intervals:
+            duration += b - a
+            if a != previous:
+                count += 1
+            previous = b
+        return cls(duration, count,
+                   len(intervals) > 0 and intervals[0][0] == start,
+                   len(intervals) > 0 and intervals[-1][1] == stop)
+
+    def __add__(self, other):
+        if self.head is None:
+            return other
+        elif other.head is None:
+            return self
+        return self.__class__(self.duration + other.duration,
+                              self.count + other.count -
+                              int(self.tail and other.head),
+                              self.head, other.tail)
+
+    def __mul__(self, n):
+        if n <= 0 or self.head is None:
+            return self.__class__()
+        return self.__class__(self.duration * n,
+                              self.count * n -
+                              int(self.tail and self.head) * (n - 1),
+                              self.head, self.tail)
+
+    def __repr__(self):
+        return 'Measure({}, {}, {}, {})'.format(
+            repr(self.duration), repr(self.count), repr(self.head),
+            repr(self.tail)
+        )
+
+
+def _cached(key, function, *args):
+    """Returns memoized result of 'function' for 'key', evicts the least
+    recently used result, when the cache is full."""
+    result = _CACHE.pop(key, _MISSING)
+    if result is _MISSING:
+        result = function(*args)
+        if len(_CACHE) >= _CACHE_SIZE:
+            _CACHE.popitem(last=False)
+    _CACHE[key] = result
+    return result
+
+
+def _compile_callback(operator, *args):
+    """Converts an expression to nested tuples."""
+    return Result((operator,) + tuple(arg.value if isinstance(arg, Result)
+                                      else arg
+                                      for arg in args))
+
+
+def compile_expression(expression):
+    """Converts an expression of `RecurrentEventSet` to nested tuples,
+    that are hashable and can be used with other functions
+    of this module."""
+    if isinstance(expression, RecurrentEvent):
+        return expression
+    return _walk(expression, _compile_callback).value
+
+
+def atoms(node):
+    """Set of `RecurrentEvent` instances in compiled expression."""
+    if isinstance(node, RecurrentEvent):
+        return {node}
+    elif isinstance(node, tuple):
+        return set().union(*(atoms(child) for child in node[1:]))
+    return set()
+
+
+def evaluate(node, datetime):
+    """Tests 'datetime' for containment in compiled expression."""
+    if isinstance(node, bool):
+        return node
+    elif isinstance(node, RecurrentEvent):
+        return datetime in node
+
+    operator = node[0]
+    if operator == AND:
+        return all(evaluate(child, datetime) for child in node[1:])
+    elif operator == OR:
+        return any(evaluate(child, datetime) for child in node[1:])
+    elif operator == NOT:
+        return not evaluate(node[1], datetime)
+    raise AssertionError(operator)
+
+
+def substitute(node, values):
+    """Replaces atoms in compiled expression by boolean 'values',
+    given as mapping, and simplifies the result.
+
+    Returns
+    -------
+    object
+        Simplified expression or a boolean, if the expression has
+        constant value.
+    """
+    if isinstance(node, bool):
+        return node
+    elif isinstance(node, RecurrentEvent):
+        return values.get(node, node)
+
+    operator = node[0]
+    children = [substitute(child, values) for child in node[1:]]
+
+    if operator == NOT:
+        child = children[0]
+        if isinstance(child, bool):
+            return not child
+        return (NOT, child)
+
+    absorbing = operator == OR
+    reduced = []
+    for child in children:
+        if child is absorbing:
+            return absorbing
+        elif child is not (not absorbing):
+            reduced.append(child)
+    if len(reduced) == 0:
+        return not absorbing
+    elif len(reduced) == 1:
+        return reduced[0]
+    return (operator,) + tuple(reduced)
+
+
+def _offset(n, unit):
+    """"The beginning of time" plus 'n' units, clamped by the bounds of
+    time."""
+    if n <= 0:
+        return MIN
+    try:
+        return add_delta(MIN, n, unit)
+    except OverflowError:
+        return dt.datetime.max
+
+
+def _boundaries(atom, start, stop):
+    """Points between 'start' and 'stop', where truth value of 'atom'
+    may change."""
+    if atom.recurrence is None:
+        points = (_offset(atom.start - BASE[atom.unit], atom.unit),
+                  _offset(atom.stop - BASE[atom.unit], atom.unit))
+    else:
+        points = []
+        for a, b in atom.forward(start):
+            if a >= stop:
+                break
+            points.extend((a, b))
+
+    return [point for point in points if start < point < stop]
+
+
+def _segments(atoms_, start, stop):
+    """Splits window from 'start' to 'stop' by boundaries of 'atoms_'."""
+    points = {start}
+    for atom in atoms_:
+        points.update(_boundaries(atom, start, stop))
+    points = sorted(points)
+    return list(zip(points, points[1:] + [stop]))
+
+
+def _pattern(node):
+    """Intervals of a day, covered by an expression of "fine" atoms,
+    as offsets from the start of the day."""
+    intervals = []
+    for a, b in _segments(atoms(node), _REFERENCE, _REFERENCE + _DAY):
+        if not evaluate(node, a):
+            continue
+        a, b = a - _REFERENCE, b - _REFERENCE
+        if len(intervals) > 0 and intervals[-1][1] == a:
+            a = intervals.pop()[0]
+        intervals.append((a, b))
+    return intervals
+
+
+def _day(pattern, day, start, stop):
+    """Measure of 'pattern' at 'day' within window from 'start'
+    to 'stop'."""
+    intervals = []
+    lower, upper = start - day, stop - day
+    for a, b in pattern:
+        a, b = max(a, lower), min(b, upper)
+        if a < b:
+            intervals.append((day + a, day + b))
+    return Measure.of(intervals, start, stop)
+
+
+def _daily(node, start, stop):
+    """Measure of an expression of "fine" atoms within window from
+    'start' to 'stop'."""
+    if isinstance(node, bool):
+        return Measure.of([(start, stop)] if node else [], start, stop)
+
+    pattern = _cached(('pattern', node), _pattern, node)
+    first = floor(start, Unit.DAY)
+    last = floor(stop, Unit.DAY)
+    if first == last:
+        return _day(pattern, first, start, stop)
+
+    if first < start:
+        first += _DAY
+        result = _day(pattern, first - _DAY, start, first)
+    else:
+        result = None
+
+    days = (last - first).days
+    if days > 0:
+        whole = _cached(('day', node),
+                        _day, pattern, _REFERENCE, _REFERENCE,
+                        _REFERENCE + _DAY) * days
+        result = whole if result is None else result + whole
+
+    if last < stop:
+        tail = _day(pattern, last, last, stop)
+        result = tail if result is None else result + tail
+
+    return result
+
+
+def _window(node, start, stop):
+    """Measure of an expression without "absolute" atoms within a window
+    from 'start' to 'stop', which is not longer than a period of the
+    expression."""
+    coarse = [atom for atom in atoms(node)
+              if atom.recurrence in _COARSE]
+    if len(coarse) == 0:
+        return _daily(node, start, stop)
+
+    # Atoms are tested for containment only at their own boundaries.
+    changes = {}
+    for atom in coarse:
+        for point in _boundaries(atom, start, stop):
+            changes.setdefault(point, set()).add(atom)
+    values = {atom: start in atom for atom in coarse}
+    points = sorted(changes)
+
+    substituted = {}
+    result = None
+    for a, b in zip([start] + points, points + [stop]):
+        for atom in changes.get(a, ()):
+            values[atom] = a in atom
+        key = tuple(values[atom] for atom in coarse)
+        try:
+            simplified = substituted[key]
+        except KeyError:
+            simplified = substituted[key] = substitute(node, values)
+        measure = _daily(simplified, a, b)
+        result = measure if result is None else result + measure
+    return result
+
+
+def _ceil(datetime, unit):
+    """The nearest start of 'unit' equal to or later than 'datetime'."""
+    floored = floor(datetime, unit)
+    if floored == datetime:
+        return datetime
+    try:
+        return add_delta(floored, 1, unit)
+    except OverflowError:
+        return dt.datetime.max
+
+
+def _periodic(node, start, stop):
+    """Measure of an expression without "absolute" atoms within window
+    from 'start' to 'stop'."""
+    if isinstance(node, bool):
+        return Measure.of([(start, stop)] if node else [], start, stop)
+
+    recurrences = {atom.recurrence for atom in atoms(node)}
+    if recurrences <= _FINE:
+        return _daily(node, start, stop)
+    elif Unit.MONTH in recurrences or Unit.YEAR in recurrences:
+        unit = Unit.YEAR
+    else:
+        unit = Unit.WEEK
+
+    first = _ceil(start, unit)
+    last = floor(stop, unit)
+    if first >= last:
+        return _window(node, start, stop)
+
+    result = _window(node, start, first) if start < first else None
+
+    if unit == Unit.WEEK:
+        whole = _cached(('week', node), _window, node, first,
+                        first + _WEEK) * ((last - first).days // 7)
+        result = whole if result is None else result + whole
+    else:
+        for year in range(first.year, last.year):
+            beginning = dt.datetime(year, 1, 1)
+            whole = _cached(('year', node, isleap(year),
+                             beginning.weekday()),
+                            _window, node, beginning,
+                            dt.datetime(year + 1, 1, 1))
+            result = whole if result is None else result + whole
+
+    if last < stop:
+        tail = _window(node, last, stop)
+        result = tail if result is None else result + tail
+
+    return result
+
+
+def measure(node, start, stop):
+    """Measure of time, covered by compiled expression within window
+    from 'start' to 'stop'.
+
+    Parameters
+    ----------
+    node : object
+        Compiled expression, see :py:func:`compile_expression`.
+    start : datetime.datetime
+        Inclusive start of the window.
+    stop : datetime.datetime
+        Non-inclusive end of the window.
+
+    Returns
+    -------
+    Measure
+        Summary of covered time.
+    """
+    if start >= stop:
+        return Measure.of([], start, stop)
+
+    absolute = [atom for atom in atoms(node) if atom.recurrence is None]
+    result = None
+    for a, b in _segments(absolute, start, stop):
+        measure_ = _periodic(substitute(node, {atom: a in atom
+                                               for atom in absolute}),
+                             a, b)
+        result = measure_ if result is None else result + measure_
+    return result
+
+
+class _Circuit(object):
+    """Compiled expression with values of atoms, which is reevaluated
+    incrementally, when values of atoms change.
+
+    Each operator keeps number of it's true arguments, so a change of an
+    atom is propagated only along the path to the root and only while
+    values of operators change.
+    """
+    def __init__(self, node, values):
+        self.operators = []
+        self.parents = []
+        self.sizes = []
+        self.trues = []
+        self.values = []
+        self.leaves = {}
+        self._build(node, None, values)
+        for index in reversed(range(len(self.operators))):
+            if self.operators[index] is not None:
+                self.values[index] = self._value(index)
+            parent = self.parents[index]
+            if parent is not None and self.values[index]:
+                self.trues[parent] += 1
+
+    def _build(self, node, parent, values):
+        index = len(self.operators)
+        self.parents.append(parent)
+        self.trues.append(0)
+        if isinstance(node, tuple):
+            self.operators.append(node[0])
+            self.sizes.append(len(node) - 1)
+            self.values.append(False)
+            for child in node[1:]:
+                self._build(child, index, values)
+        else:
+            self.operators.append(None)
+            self.sizes.append(0)
+            if isinstance(node, bool):
+                self.values.append(node)
+            else:
+                self.values.append(values[node])
+                self.leaves.setdefault(node, []).append(index)
+
+    def _value(self, index):
+        operator = self.operators[index]
+        if operator == AND:
+            return self.trues[index] == self.sizes[index]
+        elif operator == OR:
+            return self.trues[index] > 0
+        elif operator == NOT:
+            return self.trues[index] == 0
+        raise AssertionError(operator)
+
+    @property
+    def value(self):
+        """Value of the whole expression."""
+        return self.values[0]
+
+    def set(self, atom, value):
+        """Changes value of 'atom'."""
+        for index in self.leaves[atom]:
+            new = value
+            while self.values[index] != new:
+                self.values[index] = new
+                parent = self.parents[index]
+                if parent is None:
+                    break
+                self.trues[parent] += 1 if new else -1
+                index, new = parent, self._value(parent)
+
+
+def _points(atom, start, stop):
+    """Lazily generates points between 'start' and 'stop', where truth
+    value of 'atom' may change, in ascending order."""
+    if atom.recurrence is None:
+        for point in sorted(_boundaries(atom, start, stop)):
+            yield point
+        return
+
+    for a, b in atom.forward(start):
+        if a >= stop:
+            return
+        for point in (a, b):
+            if start < point < stop:
+                yield point
+
+
+def _tagged(points, tag):
+    """Pairs each of 'points' with 'tag'."""
+    for point in points:
+        yield point, tag
+
+
+def intervals(node, start, stop):
+    """Lazily generates maximal intervals of time, covered by compiled
+    expression within window from 'start' to 'stop', clipped by the window.
+
+    Boundaries of atoms are merged lazily, at each boundary only atoms,
+    which have it, are tested for containment and the expression is
+    reevaluated incrementally.
+
+    Parameters
+    ----------
+    node : object
+        Compiled expression, see :py:func:`compile_expression`.
+    start : datetime.datetime
+        Inclusive start of the window.
+    stop : datetime.datetime
+        Non-inclusive end of the window.
+
+    Yields
+    ------
+    tuple
+        Inclusive start and non-inclusive end of an interval.
+    """
+    if start >= stop:
+        return
+
+    atoms_ = list(atoms(node))
+    circuit = _Circuit(node, {atom: start in atom for atom in atoms_})
+    opened = start if circuit.value else None
+
+    merged = heapq.merge(*[_tagged(_points(atom, start, stop), index)
+                           for index, atom in enumerate(atoms_)])
+    for point, group in groupby(merged, key=itemgetter(0)):
+        for _, index in group:
+            circuit.set(atoms_[index], point in atoms_[index])
+        covered = circuit.value
+        if covered and opened is None:
+            opened = point
+        elif not covered and opened is not None:
+            yield opened, point
+            opened = None
+
+    if opened is not None:
+        yield opened, stop
@@ -45,9 +45,8 @@ BEGIN
     END IF;
     recurrence := item -> 3;
     RETURN (
-      (WITH interval(value) AS (VALUES (item -> 0), (item -> 1))
-       SELECT bool_and(value::text ~ '^\d+$')
-       FROM interval) AND
+      (item -> 0)::text ~ '^\d+$' AND
+      (item -> 1)::text ~ '^\d+$' AND
       tempo_is_unit(item -> 2) AND
       (tempo_is_unit(recurrence) OR (recurrence = 'null'::jsonb))
     );
@@ -60,8 +59,10 @@ CREATE DOMAIN tempo_recurrentevent AS jsonb
 CONSTRAINT is_recurrentevent_check CHECK (tempo_is_recurrentevent(VALUE));
 
 
-  -- Checks if given jsonb is a valid recurrenteventset.
+-- Checks if given jsonb is a valid recurrenteventset.
 -- The format is ["AND", [[1, 15], "month", "year"]].
+-- Nested operators are visited in a single pass with a stack, elements
+-- are accessed by indexes, so the cost is linear in size of item.
 CREATE OR REPLACE FUNCTION tempo_is_recurrenteventset(item jsonb)
 RETURNS boolean
 IMMUTABLE
@@ -70,23 +71,24 @@ AS $$
 DECLARE
   e               jsonb;
   cur             jsonb;
-  queued          jsonb[] := ARRAY[]::jsonb[];
+  stack           jsonb[] := ARRAY[item];
+  top             integer := 1;
   OPS    CONSTANT jsonb[] := ARRAY['"AND"', '"OR"', '"NOT"']::jsonb[];
 BEGIN
-  queued := array_append(queued, item);
-  WHILE array_length(queued, 1) > 0 LOOP
-    cur := queued [1];
-    queued := queued [2:array_length(queued, 1)];
-    IF (cur -> 0) = ANY (OPS) THEN
-      cur := to_json((SELECT array_agg(elem) FROM
-                        (SELECT jsonb_array_elements(cur) AS elem
-                         OFFSET 1) AS _))::jsonb;
-    ELSE
+  IF item ISNULL OR jsonb_typeof(item) != 'array' THEN
+    RETURN false;
+  END IF;
+  WHILE top > 0 LOOP
+    cur := stack[top];
+    top := top - 1;
+    IF NOT coalesce((cur -> 0) = ANY (OPS), false) THEN
       RETURN false;
     END IF;
-    FOR e IN SELECT jsonb_array_elements(cur) LOOP
+    FOR i IN 1 .. jsonb_array_length(cur) - 1 LOOP
+      e := cur -> i;
       IF jsonb_typeof(e) = 'array' AND (e -> 0) = ANY (OPS) THEN
-        queued := array_append(queued, e);
+        top := top + 1;
+        stack[top] := e;
       ELSIF NOT (tempo_is_recurrentevent(e)) THEN
         RETURN false;
       END IF;
@@ -106,35 +108,402 @@ CREATE OR REPLACE FUNCTION
   tempo_recurrenteventset_contains(recurrenteventset tempo_recurrenteventset,
                                    datetime timestamp)
 RETURNS boolean
-IMMUTABLE
+STABLE
 LANGUAGE plpythonu
 AS $$
     from ciso8601 import parse_datetime
-    from tempo.recurrenteventset import RecurrentEventSet
+    from tempo.postgresql import stats
 
-    return (parse_datetime(datetime) in
-            RecurrentEventSet.from_json(recurrenteventset))
+    with stats.measure('tempo_recurrenteventset_contains',
+                       recurrenteventset) as call:
+        return parse_datetime(datetime) in call.parse()
 $$;
 
 
 -- recurrenteventset forward intervals as set of rows.
+-- Signature without max_steps of previous versions.
+DROP FUNCTION IF EXISTS tempo_recurrenteventset_forward(
+  tempo_recurrenteventset, timestamp, integer, bool
+);
+
 CREATE OR REPLACE FUNCTION
   tempo_recurrenteventset_forward(recurrenteventset tempo_recurrenteventset,
                                   start timestamp,
                                   n integer,
-                                  clamp bool DEFAULT true)
+                                  clamp bool DEFAULT true,
+                                  max_steps integer DEFAULT NULL)
 RETURNS TABLE(start timestamp, stop timestamp)
-IMMUTABLE
+STABLE
 LANGUAGE plpythonu
 AS $$
     import itertools as it
     from ciso8601 import parse_datetime
-    from tempo.recurrenteventset import RecurrentEventSet
+    from tempo.postgresql import stats
+
+    with stats.measure('tempo_recurrenteventset_forward',
+                       recurrenteventset) as call:
+        forward = call.parse().forward(start=parse_datetime(start),
+                                       trim=clamp,
+                                       max_steps=max_steps)
+        try:
+            for interval in call.iterate(it.islice(forward, n)):
+                yield interval
+        finally:
+            call.steps += forward.steps
+$$;
+
+
+-- Start of the next interval of recurrenteventset, `datetime` itself,
+-- if it is contained in recurrenteventset. NULL, if there are no more
+-- intervals or they are not found in `max_steps` steps, e.g. for empty
+-- recurrenteventsets.
+-- Signature without max_steps of previous versions.
+DROP FUNCTION IF EXISTS tempo_recurrenteventset_next_start(
+  tempo_recurrenteventset, timestamp
+);
+
+CREATE OR REPLACE FUNCTION
+  tempo_recurrenteventset_next_start(recurrenteventset tempo_recurrenteventset,
+                                     datetime timestamp,
+                                     max_steps integer DEFAULT 1000)
+RETURNS timestamp
+STABLE
+LANGUAGE plpythonu
+AS $$
+    from ciso8601 import parse_datetime
+    from tempo.postgresql import stats
+    from tempo.recurrenteventset import LimitExceeded
+
+    with stats.measure('tempo_recurrenteventset_next_start',
+                       recurrenteventset) as call:
+        forward = call.parse().forward(start=parse_datetime(datetime),
+                                       max_steps=max_steps)
+        try:
+            interval = next(forward, None)
+        except LimitExceeded:
+            interval = None
+        finally:
+            call.steps += forward.steps
+    return None if interval is None else interval[0]
+$$;
+
+
+-- End of the interval of recurrenteventset, that contains `datetime`,
+-- or of the next one. NULL, if there are no more intervals or they are
+-- not found in `max_steps` steps.
+-- Signature without max_steps of previous versions.
+DROP FUNCTION IF EXISTS tempo_recurrenteventset_next_stop(
+  tempo_recurrenteventset, timestamp
+);
+
+CREATE OR REPLACE FUNCTION
+  tempo_recurrenteventset_next_stop(recurrenteventset tempo_recurrenteventset,
+                                    datetime timestamp,
+                                    max_steps integer DEFAULT 1000)
+RETURNS timestamp
+STABLE
+LANGUAGE plpythonu
+AS $$
+    from ciso8601 import parse_datetime
+    from tempo.postgresql import stats
+    from tempo.recurrenteventset import LimitExceeded
+
+    with stats.measure('tempo_recurrenteventset_next_stop',
+                       recurrenteventset) as call:
+        forward = call.parse().forward(start=parse_datetime(datetime),
+                                       max_steps=max_steps)
+        try:
+            interval = next(forward, None)
+        except LimitExceeded:
+            interval = None
+        finally:
+            call.steps += forward.steps
+    return None if interval is None else interval[1]
+$$;
+
+
+-- recurrenteventset intervals within a window as set of ranges.
+-- Unlike other functions, that collect statistics, it's IMMUTABLE,
+-- so tempo_recurrenteventset_window() can be materialized into generated
+-- columns, statistics miss calls, folded into constants by the planner.
+CREATE OR REPLACE FUNCTION
+  tempo_recurrenteventset_ranges(recurrenteventset tempo_recurrenteventset,
+                                 start timestamp,
+                                 stop timestamp)
+RETURNS SETOF tsrange
+IMMUTABLE
+LANGUAGE plpythonu
+AS $$
+    from ciso8601 import parse_datetime
+    from tempo.postgresql import stats
 
-    for interval in it.islice(RecurrentEventSet
-                                  .from_json(recurrenteventset)
-                                  .forward(start=parse_datetime(start),
-                                           trim=clamp),
-                              n):
-        yield interval
+    with stats.measure('tempo_recurrenteventset_ranges',
+                       recurrenteventset) as call:
+        intervals = call.parse().between(parse_datetime(start),
+                                         parse_datetime(stop))
+        for value in call.iterate('[%s,%s)' % (a.isoformat(), b.isoformat())
+                                  for a, b in intervals):
+            yield value
 $$;
+
+
+-- recurrenteventset intervals within a window as a multirange,
+-- multiranges are available since PostgreSQL 14.
+DO $do$
+BEGIN
+  IF current_setting('server_version_num')::integer >= 140000 THEN
+    EXECUTE $sql$
+      CREATE OR REPLACE FUNCTION
+        tempo_recurrenteventset_window(
+          recurrenteventset tempo_recurrenteventset,
+          start timestamp,
+          stop timestamp
+        )
+      RETURNS tsmultirange
+      IMMUTABLE
+      LANGUAGE sql
+      AS $$
+          SELECT coalesce(range_agg(r), '{}'::tsmultirange)
+          FROM tempo_recurrenteventset_ranges($1, $2, $3) AS r;
+      $$;
+    $sql$;
+  END IF;
+END
+$do$;
+
+-- Time, covered by recurrenteventset within a window.
+CREATE OR REPLACE FUNCTION
+  tempo_recurrenteventset_duration(recurrenteventset tempo_recurrenteventset,
+                                   start timestamp,
+                                   stop timestamp)
+RETURNS interval
+STABLE
+LANGUAGE plpythonu
+AS $$
+    from ciso8601 import parse_datetime
+    from tempo.postgresql import stats
+
+    with stats.measure('tempo_recurrenteventset_duration',
+                       recurrenteventset) as call:
+        duration = call.parse().duration(parse_datetime(start),
+                                         parse_datetime(stop))
+    return '%r seconds' % duration.total_seconds()
+$$;
+
+
+-- Time, covered by recurrenteventset within each bucket of a window.
+CREATE OR REPLACE FUNCTION
+  tempo_coverage_histogram(recurrenteventset tempo_recurrenteventset,
+                           start timestamp,
+                           stop timestamp,
+                           bucket interval)
+RETURNS TABLE(start timestamp, stop timestamp, covered interval)
+STABLE
+LANGUAGE sql
+AS $$
+    SELECT b, least(b + $4, $3),
+           tempo_recurrenteventset_duration($1, b, least(b + $4, $3))
+    FROM generate_series($2, $3, $4) AS b
+    WHERE b < $3;
+$$;
+
+
+-- Appends recurrenteventset to a state of aggregates.
+CREATE OR REPLACE FUNCTION
+  tempo_agg_append(state jsonb[], recurrenteventset tempo_recurrenteventset)
+RETURNS jsonb[]
+IMMUTABLE
+STRICT
+LANGUAGE sql
+AS $$
+    SELECT array_append($1, $2::jsonb);
+$$;
+
+
+-- Union of aggregated recurrenteventsets.
+CREATE OR REPLACE FUNCTION tempo_union_final(state jsonb[])
+RETURNS tempo_recurrenteventset
+IMMUTABLE
+LANGUAGE sql
+AS $$
+    SELECT CASE WHEN cardinality($1) > 0 THEN
+      array_to_json(array_prepend('"OR"'::jsonb, $1))::jsonb
+    END;
+$$;
+
+
+-- Intersection of aggregated recurrenteventsets.
+CREATE OR REPLACE FUNCTION tempo_intersection_final(state jsonb[])
+RETURNS tempo_recurrenteventset
+IMMUTABLE
+LANGUAGE sql
+AS $$
+    SELECT CASE WHEN cardinality($1) > 0 THEN
+      array_to_json(array_prepend('"AND"'::jsonb, $1))::jsonb
+    END;
+$$;
+
+
+DROP AGGREGATE IF EXISTS tempo_union_agg(tempo_recurrenteventset);
+CREATE AGGREGATE tempo_union_agg(tempo_recurrenteventset) (
+  SFUNC = tempo_agg_append,
+  STYPE = jsonb[],
+  FINALFUNC = tempo_union_final,
+  INITCOND = '{}'
+);
+
+
+DROP AGGREGATE IF EXISTS tempo_intersection_agg(tempo_recurrenteventset);
+CREATE AGGREGATE tempo_intersection_agg(tempo_recurrenteventset) (
+  SFUNC = tempo_agg_append,
+  STYPE = jsonb[],
+  FINALFUNC = tempo_intersection_final,
+  INITCOND = '{}'
+);
+
+-- Shared table of distinct recurrenteventsets, keyed by digests of their
+-- canonical JSON representation. Contains user data, so it's kept
+-- by uninstall.sql, recurrenteventsets are validated by
+-- tempo_schedule_intern(), so it doesn't depend on the domain.
+CREATE TABLE IF NOT EXISTS tempo_schedule (
+  digest char(32) PRIMARY KEY,
+  recurrenteventset jsonb NOT NULL
+);
+
+
+-- Stores recurrenteventset in the shared table, if it's not stored yet,
+-- and returns it's digest.
+CREATE OR REPLACE FUNCTION
+  tempo_schedule_intern(recurrenteventset tempo_recurrenteventset)
+RETURNS char(32)
+VOLATILE
+STRICT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  result char(32) := md5($1::text);
+BEGIN
+  -- Blocks tempo_schedule_vacuum() till the end of the transaction,
+  -- which stores the digest.
+  LOCK TABLE tempo_schedule IN ROW EXCLUSIVE MODE;
+  IF NOT EXISTS (SELECT 1 FROM tempo_schedule WHERE digest = result) THEN
+    BEGIN
+      INSERT INTO tempo_schedule VALUES (result, $1);
+    EXCEPTION WHEN unique_violation THEN
+      -- Stored concurrently.
+    END;
+  END IF;
+  RETURN result;
+END
+$$;
+
+
+-- recurrenteventset of the shared table by it's digest.
+CREATE OR REPLACE FUNCTION
+  tempo_schedule_get(digest char(32))
+RETURNS jsonb
+STABLE
+STRICT
+LANGUAGE sql
+AS $$
+    SELECT recurrenteventset FROM tempo_schedule WHERE digest = $1;
+$$;
+
+
+-- Deletes recurrenteventsets of the shared table, whose digests aren't
+-- stored in any of given columns, and returns their number.
+-- `tables` and `columns` are parallel arrays of referencing columns.
+CREATE OR REPLACE FUNCTION
+  tempo_schedule_vacuum(tables regclass[], columns name[])
+RETURNS bigint
+VOLATILE
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  condition text := 'true';
+  deleted bigint;
+BEGIN
+  IF array_length(tables, 1) IS DISTINCT FROM array_length(columns, 1) THEN
+    RAISE EXCEPTION 'Lengths of tables and columns differ';
+  END IF;
+  FOR i IN 1 .. coalesce(array_length(tables, 1), 0) LOOP
+    condition := condition || format(
+      ' AND NOT EXISTS (SELECT 1 FROM %s WHERE %I = tempo_schedule.digest)',
+      tables[i], columns[i]
+    );
+  END LOOP;
+  -- Waits for transactions, which have stored digests, but may not have
+  -- stored referencing rows yet. Till the end of the transaction
+  -- tempo_schedule_intern() waits in turn, so writes of digests are
+  -- blocked, while the deletion lasts.
+  LOCK TABLE tempo_schedule IN SHARE ROW EXCLUSIVE MODE;
+  EXECUTE 'DELETE FROM tempo_schedule WHERE ' || condition;
+  GET DIAGNOSTICS deleted = ROW_COUNT;
+  RETURN deleted;
+END
+$$;
+
+
+-- Enables or disables usage statistics of functions in the current
+-- session.
+CREATE OR REPLACE FUNCTION tempo_stats_enable(enabled boolean DEFAULT true)
+RETURNS void
+VOLATILE
+LANGUAGE plpythonu
+AS $$
+    from tempo.postgresql import stats
+
+    stats.enable(enabled)
+$$;
+
+
+-- Resets usage statistics of the current session.
+CREATE OR REPLACE FUNCTION tempo_stats_reset()
+RETURNS void
+VOLATILE
+LANGUAGE plpythonu
+AS $$
+    from tempo.postgresql import stats
+
+    stats.reset()
+$$;
+
+
+-- Usage statistics of functions in the current session.
+CREATE OR REPLACE FUNCTION tempo_stats_functions()
+RETURNS TABLE(function text, calls bigint, total_time double precision,
+              steps bigint, parse_hits bigint, parse_misses bigint)
+VOLATILE
+LANGUAGE plpythonu
+AS $$
+    from tempo.postgresql import stats
+
+    for name, usage in stats.functions():
+        yield (name, usage.calls, usage.total_time, usage.steps,
+               usage.hits, usage.misses)
+$$;
+
+
+-- Usage statistics of the slowest schedules in the current session.
+CREATE OR REPLACE FUNCTION tempo_stats_schedules()
+RETURNS TABLE(recurrenteventset jsonb, calls bigint,
+              total_time double precision, steps bigint)
+VOLATILE
+LANGUAGE plpythonu
+AS $$
+    from tempo.postgresql import stats
+
+    for schedule, usage in stats.schedules():
+        yield schedule, usage.calls, usage.total_time, usage.steps
+$$;
+
+
+CREATE OR REPLACE VIEW tempo_stat_functions AS
+  SELECT *,
+         parse_hits::double precision /
+           nullif(parse_hits + parse_misses, 0) AS parse_hit_rate
+  FROM tempo_stats_functions();
+
+
+CREATE OR REPLACE VIEW tempo_stat_schedules AS
+  SELECT * FROM tempo_stats_schedules();
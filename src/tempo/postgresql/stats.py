@@ -0,0 +1,221 @@
+# coding=utf-8
+"""Provides parsing of schedules and optional usage statistics
+for PL/Python functions of PostgreSQL binding.
+
+Each database session has it's own interpreter, so parsed schedules
+and statistics are kept per session. Statistics are collected only
+after :py:func:`enable` - see ``tempo_stats_enable()`` SQL function.
+
+Examples
+--------
+Body of a PL/Python function::
+
+    from tempo.postgresql import stats
+
+    with stats.measure('tempo_recurrenteventset_contains',
+                       recurrenteventset) as call:
+        return parse_datetime(datetime) in call.parse()
+"""
+from collections import OrderedDict
+import heapq
+import time
+
+from tempo.recurrenteventset import RecurrentEventSet
+
+
+#: Maximal number of cached parsed schedules.
+CACHE_SIZE = 1024
+#: Maximal number of schedules, for which statistics are kept.
+SCHEDULES_SIZE = 1000
+
+_state = {'enabled': False}
+# Parsed schedules by their JSON text.
+_cache = OrderedDict()
+# Statistics by names of functions and by JSON texts of schedules.
+_functions = {}
+_schedules = {}
+# Min-heap of ``(total_time, schedule)`` pairs of tracked schedules,
+# total times of its items may be outdated, since they only grow.
+_fastest = []
+
+
+class Usage(object):
+    """Statistics of calls of a function or of calls with a schedule.
+
+    Attributes
+    ----------
+    calls : int
+        Number of calls.
+    total_time : float
+        Total time of calls in milliseconds.
+    steps : int
+        Total number of steps of evaluation of
+        :py:meth:`.RecurrentEventSet.forward`.
+    hits : int
+        Number of parses, served from the cache.
+    misses : int
+        Number of parses, which required parsing of JSON.
+    """
+    __slots__ = ['calls', 'total_time', 'steps', 'hits', 'misses']
+
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0
+        self.steps = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return 'Usage({})'.format(', '.join(
+            '{}={}'.format(name, repr(getattr(self, name)))
+            for name in self.__slots__
+        ))
+
+
+class _Call(object):
+    """A call of a function, see :py:func:`measure`."""
+    __slots__ = ['function', 'schedule', 'enabled', 'steps', 'hits',
+                 'misses', '_started', '_elapsed']
+
+    def __init__(self, function, schedule, enabled):
+        self.function = function
+        self.schedule = schedule
+        self.enabled = enabled
+        self.steps = 0
+        self.hits = 0
+        self.misses = 0
+        self._started = None
+        self._elapsed = 0.0
+
+    def parse(self):
+        """`RecurrentEventSet` of the schedule, parsed schedules are
+        cached in least recently used order."""
+        recurrenteventset = _cache.pop(self.schedule, None)
+        if recurrenteventset is None:
+            recurrenteventset = RecurrentEventSet.from_json(self.schedule)
+            if len(_cache) >= CACHE_SIZE:
+                _cache.popitem(last=False)
+            self.misses += 1
+        else:
+            self.hits += 1
+        _cache[self.schedule] = recurrenteventset
+        return recurrenteventset
+
+    def __enter__(self):
+        if self.enabled:
+            self._started = time.time()
+        return self
+
+    def iterate(self, iterable):
+        """Iterates 'iterable', measuring time of taking of its items,
+        but not time between them, which is spent by the caller."""
+        if not self.enabled:
+            return iterable
+        return self._iterate(iterable)
+
+    def _iterate(self, iterable):
+        for item in iterable:
+            self._elapsed += time.time() - self._started
+            self._started = None
+            yield item
+            self._started = time.time()
+
+    def __exit__(self, *exc_info):
+        if not self.enabled:
+            return
+        elapsed = self._elapsed
+        if self._started is not None:
+            elapsed += time.time() - self._started
+        elapsed *= 1000.0
+        function = _functions.get(self.function)
+        if function is None:
+            function = _functions[self.function] = Usage()
+        self._add(function, elapsed)
+        self._add(_schedule_usage(self.schedule, elapsed), elapsed)
+
+    def _add(self, usage, elapsed):
+        if usage is None:
+            return
+        usage.calls += 1
+        usage.total_time += elapsed
+        usage.steps += self.steps
+        usage.hits += self.hits
+        usage.misses += self.misses
+
+
+def _schedule_usage(schedule, elapsed):
+    """Statistics of 'schedule' or `None`, if it's not tracked.
+
+    If the limit of tracked schedules is reached, the schedule with the
+    least total time is replaced, when 'elapsed' exceeds it."""
+    usage = _schedules.get(schedule)
+    if usage is not None:
+        return usage
+    if len(_schedules) >= SCHEDULES_SIZE:
+        # Outdated items are pushed back with actual total times, until
+        # the least one is actual.
+        while _fastest[0][0] != _schedules[_fastest[0][1]].total_time:
+            fastest = _fastest[0][1]
+            heapq.heapreplace(_fastest,
+                              (_schedules[fastest].total_time, fastest))
+        total_time, fastest = _fastest[0]
+        if total_time >= elapsed:
+            return None
+        heapq.heappop(_fastest)
+        del _schedules[fastest]
+    usage = _schedules[schedule] = Usage()
+    heapq.heappush(_fastest, (usage.total_time, schedule))
+    return usage
+
+
+def enable(enabled=True):
+    """Enables or disables collection of statistics."""
+    _state['enabled'] = enabled
+
+
+def is_enabled():
+    """Checks if statistics are collected."""
+    return _state['enabled']
+
+
+def reset():
+    """Resets collected statistics."""
+    _functions.clear()
+    _schedules.clear()
+    del _fastest[:]
+
+
+def measure(function, schedule):
+    """Context manager, which measures a call of 'function' with
+    'schedule', if statistics are enabled.
+
+    Parameters
+    ----------
+    function : str
+        Name of a function.
+    schedule : str
+        JSON text of a schedule.
+
+    Returns
+    -------
+    object
+        A context manager, whose ``parse()`` method returns
+        `RecurrentEventSet` of 'schedule' and whose ``steps`` attribute
+        should be increased by steps of evaluation of
+        :py:meth:`.RecurrentEventSet.forward`. Set-returning functions
+        should yield rows through its ``iterate()`` method, so time,
+        spent by PostgreSQL between rows, is not measured.
+    """
+    return _Call(function, schedule, _state['enabled'])
+
+
+def functions():
+    """Statistics of functions as ``(name, usage)`` pairs."""
+    return sorted(_functions.items())
+
+
+def schedules():
+    """Statistics of tracked schedules as ``(schedule, usage)`` pairs,
+    slowest first."""
+    return sorted(_schedules.items(),
+                  key=lambda item: item[1].total_time, reverse=True)
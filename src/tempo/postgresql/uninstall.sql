@@ -1,3 +1,79 @@
+DROP VIEW IF EXISTS tempo_stat_schedules;
+DROP VIEW IF EXISTS tempo_stat_functions;
+DROP FUNCTION IF EXISTS tempo_stats_schedules();
+DROP FUNCTION IF EXISTS tempo_stats_functions();
+DROP FUNCTION IF EXISTS tempo_stats_reset();
+DROP FUNCTION IF EXISTS tempo_stats_enable(enabled boolean);
+
+DROP FUNCTION IF EXISTS tempo_schedule_vacuum(tables regclass[],
+                                              columns name[]);
+
+DROP FUNCTION IF EXISTS tempo_schedule_get(digest char(32));
+
+DROP FUNCTION IF EXISTS tempo_schedule_intern(
+  recurrenteventset tempo_recurrenteventset
+);
+
+-- tempo_schedule table is kept, since it's rows are referenced
+-- by digests in columns of users, drop it explicitly, if it's no longer
+-- needed.
+
+DROP AGGREGATE IF EXISTS tempo_intersection_agg(tempo_recurrenteventset);
+DROP AGGREGATE IF EXISTS tempo_union_agg(tempo_recurrenteventset);
+DROP FUNCTION IF EXISTS tempo_intersection_final(state jsonb[]);
+DROP FUNCTION IF EXISTS tempo_union_final(state jsonb[]);
+DROP FUNCTION IF EXISTS tempo_agg_append(
+  state jsonb[],
+  recurrenteventset tempo_recurrenteventset
+);
+
+DROP FUNCTION IF EXISTS tempo_coverage_histogram(
+  recurrenteventset tempo_recurrenteventset,
+  start timestamp,
+  stop timestamp,
+  bucket interval
+);
+
+DROP FUNCTION IF EXISTS tempo_recurrenteventset_duration(
+  recurrenteventset tempo_recurrenteventset,
+  start timestamp,
+  stop timestamp
+);
+
+DROP FUNCTION IF EXISTS tempo_recurrenteventset_window(
+  recurrenteventset tempo_recurrenteventset,
+  start timestamp,
+  stop timestamp
+);
+
+DROP FUNCTION IF EXISTS tempo_recurrenteventset_ranges(
+  recurrenteventset tempo_recurrenteventset,
+  start timestamp,
+  stop timestamp
+);
+
+DROP FUNCTION IF EXISTS tempo_recurrenteventset_next_start(
+  recurrenteventset tempo_recurrenteventset,
+  datetime timestamp,
+  max_steps integer
+);
+
+DROP FUNCTION IF EXISTS tempo_recurrenteventset_next_start(
+  recurrenteventset tempo_recurrenteventset,
+  datetime timestamp
+);
+
+DROP FUNCTION IF EXISTS tempo_recurrenteventset_next_stop(
+  recurrenteventset tempo_recurrenteventset,
+  datetime timestamp,
+  max_steps integer
+);
+
+DROP FUNCTION IF EXISTS tempo_recurrenteventset_next_stop(
+  recurrenteventset tempo_recurrenteventset,
+  datetime timestamp
+);
+
 DROP FUNCTION IF EXISTS tempo_recurrenteventset_contains(
   recurrenteventset tempo_recurrenteventset,
   datetimes timestamp
@@ -5,7 +81,11 @@ DROP FUNCTION IF EXISTS tempo_recurrenteventset_contains(
 
 DROP FUNCTION IF EXISTS tempo_recurrenteventset_forward(
     recurrenteventset tempo_recurrenteventset, start timestamp, n integer,
-    clamp bool DEFAULT true
+    clamp bool DEFAULT true, max_steps integer DEFAULT NULL
+);
+
+DROP FUNCTION IF EXISTS tempo_recurrenteventset_forward(
+    tempo_recurrenteventset, timestamp, integer, bool
 );
 
 DROP DOMAIN IF EXISTS tempo_recurrenteventset;
@@ -1,7 +1,13 @@
 # coding=utf-8
 """Provides RecurrentEvent class."""
+import itertools
 import json
+import threading
+import weakref
 
+from six.moves import range  # pylint: disable=redefined-builtin
+
+from tempo import instrumentation
 from tempo.timeutils import delta, floor, add_delta
 # pylint: disable=unused-import
 from tempo.unit import Unit, ORDER, MIN, MAX, BASE, UNITS_MAX
@@ -39,7 +45,18 @@ class RecurrentEvent(object):
     ... True
     >>> datetime(2000, 1, 1, 5, 3, 16) in recurrentevent
     ... False
+
+    Notes
+    -----
+    Instances are immutable. Instances, constructed with
+    :py:meth:`shared` and :py:meth:`from_json`, are shared between all
+    equal recurrent events, which are alive at the same time.
     """
+    __slots__ = ['start', 'stop', 'unit', 'recurrence', '__weakref__']
+
+    # Shared instances by their attributes.
+    _shared = weakref.WeakValueDictionary()
+    _shared_lock = threading.Lock()
 
     def __init__(self, start, stop, unit, recurrence=None):
         if recurrence is not None:
@@ -48,10 +65,39 @@ class RecurrentEvent(object):
                 .format(unit=unit, recurrence=recurrence)
             )
 
-        self.unit = unit
-        self.recurrence = recurrence
-        self.start = start
-        self.stop = stop
+        object.__setattr__(self, 'unit', unit)
+        object.__setattr__(self, 'recurrence', recurrence)
+        object.__setattr__(self, 'start', start)
+        object.__setattr__(self, 'stop', stop)
+
+    @classmethod
+    def shared(cls, start, stop, unit, recurrence=None):
+        """Returns an instance, shared between all equal recurrent events.
+
+        Parameters are the same as for the constructor.
+        """
+        key = (cls, start, stop, unit, recurrence)
+        try:
+            instance = cls._shared.get(key)
+        except TypeError:  # unhashable attributes can't be shared
+            return cls(start, stop, unit, recurrence)
+        if instance is None:
+            with cls._shared_lock:
+                instance = cls._shared.get(key)
+                if instance is None:
+                    instance = cls(start, stop, unit, recurrence)
+                    cls._shared[key] = instance
+        return instance
+
+    def __setattr__(self, name, value):
+        raise AttributeError('RecurrentEvent is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('RecurrentEvent is immutable')
+
+    def __reduce__(self):
+        return self.__class__, (self.start, self.stop, self.unit,
+                                self.recurrence)
 
     def __contains__(self, item):
         """Test given datetime 'item' for containment in the recurrent event.
@@ -85,6 +131,8 @@ class RecurrentEvent(object):
 
             4. Resulting delta tested for containment in the interval.
         """
+        if instrumentation.enabled:
+            instrumentation.record(instrumentation.RECURRENTEVENT_CONTAINS)
         correction = BASE[self.unit]
 
         if self.recurrence is None:
@@ -136,6 +184,26 @@ class RecurrentEvent(object):
             (self.stop - correction) == UNITS_MAX[self.unit][self.recurrence]
         )
 
+    def duration(self, start, stop):
+        """Total time covered by the recurrent event between 'start' and
+        'stop', see :py:meth:`.RecurrentEventSet.duration`.
+
+        Parameters
+        ----------
+        start : datetime.datetime
+            Inclusive start of the window.
+        stop : datetime.datetime
+            Non-inclusive end of the window.
+
+        Returns
+        -------
+        datetime.timedelta
+            Covered time.
+        """
+        from tempo.period import measure
+
+        return measure(self, start, stop).duration
+
     def forward(self, start, trim=True):
         """Iterate time intervals starting from 'start'.
         Intervals returned in form of `(start, end)` pair,
@@ -187,6 +255,8 @@ class RecurrentEvent(object):
                         first = recurrence_start
 
             if self.isgapless():
+                if instrumentation.enabled:
+                    instrumentation.record_advance(self)
                 yield first, MAX
                 return
 
@@ -195,6 +265,8 @@ class RecurrentEvent(object):
             if self.recurrence is not None:
                 first, second = self._clamp_by_recurrence(base, first, second)
 
+            if instrumentation.enabled:
+                instrumentation.record_advance(self)
             yield first, second
         except OverflowError:
             return
@@ -202,17 +274,87 @@ class RecurrentEvent(object):
         if self.recurrence is None:
             return
         while True:  # Handle recurring intervals
-            base = add_delta(base, 1, self.recurrence)
             try:
-                first = addfloor(base, self.start + correction)
-                second = addfloor(base, self.stop + correction)
-                if base > first:  # In case if flooring by week resulted
-                    first = base  # as a time earlier than 'base'
-
-                first, second = self._clamp_by_recurrence(base, first, second)
-                yield first, second
+                base = add_delta(base, 1, self.recurrence)
+                interval = self._recurring(base)
             except OverflowError:
                 return
+            if instrumentation.enabled:
+                instrumentation.record_advance(self)
+            yield interval
+
+    def _recurring(self, base):
+        """Interval of the period of recurrence, that starts at 'base'."""
+        correction = -1 * BASE[self.unit]
+        first = floor(add_delta(base, self.start + correction, self.unit),
+                      self.unit)
+        second = floor(add_delta(base, self.stop + correction, self.unit),
+                       self.unit)
+        if base > first:  # In case if flooring by week resulted
+            first = base  # as a time earlier than 'base'
+
+        first, second = self._clamp_by_recurrence(base, first, second)
+        return first, second
+
+    def occurrence(self, start, k, trim=True):
+        """The 'k'-th interval of ``forward(start, trim)``, counting
+        from zero, computed directly from the period of recurrence, so
+        the cost doesn't depend on 'k'.
+
+        Parameters
+        ----------
+        start : datetime.datetime
+            The same as for :py:meth:`forward`.
+        k : int
+            Index of the interval.
+        trim : bool
+            The same as for :py:meth:`forward`.
+
+        Returns
+        -------
+        tuple
+            Inclusive start and non-inclusive end of the interval.
+
+        Raises
+        ------
+        IndexError
+            If there is no such interval.
+        """
+        if k < 0:
+            raise IndexError('Negative index of an occurrence', k)
+        elif k == 0:
+            for interval in self.forward(start, trim):
+                return interval
+        elif self.recurrence is not None and not self.isgapless():
+            try:
+                return self._recurring(
+                    add_delta(floor(start, self.recurrence), k,
+                              self.recurrence)
+                )
+            except OverflowError:
+                pass
+        raise IndexError('No such occurrence', k)
+
+    def occurrences(self, start, trim=True):
+        """Random-access view of intervals of ``forward(start, trim)``.
+
+        Parameters
+        ----------
+        start : datetime.datetime
+            The same as for :py:meth:`forward`.
+        trim : bool
+            The same as for :py:meth:`forward`.
+
+        Returns
+        -------
+        Occurrences
+            The view.
+
+        Examples
+        --------
+        >>> page = recurrentevent.occurrences(datetime.now())[1000:1010]
+        """
+        return Occurrences(self, start, trim)
 
     def to_json(self):
         """Exports `RecurrentEvent` instance to JSON serializable
@@ -226,4 +368,57 @@ class RecurrentEvent(object):
         if not isinstance(value, (list, tuple)):
             value = json.loads(value)
 
-        return cls(value[0], value[1], value[2], value[3])
+        return cls.shared(value[0], value[1], value[2], value[3])
+
+
+class Occurrences(object):
+    """Intervals of :py:meth:`RecurrentEvent.forward`, which can be
+    indexed and sliced, each interval is computed with
+    :py:meth:`RecurrentEvent.occurrence`.
+
+    Negative indexes are not supported, slices without an end are
+    iterators.
+
+    Parameters
+    ----------
+    recurrentevent : RecurrentEvent
+        The recurrent event.
+    start : datetime.datetime
+        The same as for :py:meth:`RecurrentEvent.forward`.
+    trim : bool
+        The same as for :py:meth:`RecurrentEvent.forward`.
+    """
+    __slots__ = ['recurrentevent', 'start', 'trim']
+
+    def __init__(self, recurrentevent, start, trim=True):
+        self.recurrentevent = recurrentevent
+        self.start = start
+        self.trim = trim
+
+    def __iter__(self):
+        return self.recurrentevent.forward(self.start, self.trim)
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self.recurrentevent.occurrence(self.start, index,
+                                                  self.trim)
+
+        start = 0 if index.start is None else index.start
+        step = 1 if index.step is None else index.step
+        if start < 0 or step <= 0 or (index.stop is not None and
+                                      index.stop < 0):
+            raise ValueError('Negative indexes and steps are not supported',
+                             index)
+        if index.stop is None:
+            return self._iterate(itertools.count(start, step))
+        return list(self._iterate(range(start, index.stop, step)))
+
+    def _iterate(self, indexes):
+        """Intervals by 'indexes', until the first missing one."""
+        for k in indexes:
+            try:
+                interval = self.recurrentevent.occurrence(self.start, k,
+                                                          self.trim)
+            except IndexError:
+                return
+            yield interval
@@ -1,14 +1,16 @@
 # coding=utf-8
 """Provides RecurrentEventSet class."""
-import itertools as it
 from collections import deque
+from datetime import timedelta
 import json
+import time
 
 from six import string_types, integer_types
-from six.moves import reduce  # pylint: disable=redefined-builtin
 
+from tempo import instrumentation
 from tempo.recurrentevent import RecurrentEvent
-from tempo.sparseinterval import SparseInterval
+from tempo.streams import (AtomStream, OrStream, AndStream, NotStream,
+                           EXHAUSTED)
 from tempo.unit import MIN, MAX, Unit
 
 
@@ -18,13 +20,35 @@ OR  = 'OR'
 
 
 _OPS = {NOT, AND, OR}
+_STREAMS = {AND: AndStream, OR: OrStream, NOT: NotStream}
 _UNITS = set(Unit.values())
 
+#: Default limit of steps of evaluation for
+#: :py:meth:`RecurrentEventSet.forward`, `None` means no limit.
+FORWARD_MAX_STEPS = None
+
+#: Default time limit in seconds for :py:meth:`RecurrentEventSet.forward`,
+#: counted from the call, `None` means no limit.
+FORWARD_TIMEOUT = None
+
 
 class Void(Exception):
     pass
 
 
+class LimitExceeded(Exception):
+    """Iteration exceeded it's limit of steps or it's deadline.
+
+    Attributes
+    ----------
+    steps : int
+        Number of steps consumed before the iteration was interrupted.
+    """
+    def __init__(self, message, steps):
+        super(LimitExceeded, self).__init__(message)
+        self.steps = steps
+
+
 class Result(object):
     """Callback result wrapper.
 
@@ -57,6 +81,8 @@ def _evaluate(result_stack, callback):
             if item == NOT:
                 assert len(frame) == 2
             break
+    if instrumentation.enabled:
+        instrumentation.record(instrumentation.WALK_VISITS)
     try:
         result_stack.append(callback(*frame))
     except Void:
@@ -71,6 +97,32 @@ def _isexpression(value):
             value[0] in _OPS)
 
 
+class _FrozenList(list):
+    """A list, which can't be modified."""
+    # pylint: disable=unused-argument
+    def _frozen(self, *args, **kwargs):
+        """Prevents modification."""
+        raise TypeError("'{}' object can't be modified"
+                        .format(self.__class__.__name__))
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _frozen
+    append = extend = insert = pop = remove = reverse = sort = _frozen
+    __setslice__ = __delslice__ = clear = _frozen
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def _freeze_json(value):
+    """Converts nested lists of a JSON representation to lists, which
+    can't be modified."""
+    return _FrozenList(_freeze_json(item) if isinstance(item, list) else item
+                       for item in value)
+
+
 def _walk(expression, callback):
     """Walks the 'expression' and applies 'callback' to operators and
     their arguments.
@@ -140,6 +192,80 @@ def _walk(expression, callback):
         raise Void
 
 
+class Forward(object):
+    """Iterator over intervals of :py:meth:`RecurrentEventSet.forward`.
+
+    Parameters
+    ----------
+    iterator : iterator
+        Intervals, interleaved with `None` after each step of evaluation.
+    max_steps : int
+        Maximum number of steps or `None`. The step, which reaches it
+        without generating an interval, raises `LimitExceeded`, so no
+        more than 'max_steps' steps are performed.
+    deadline : float
+        Deadline in terms of `time.time()` or `None`.
+
+    Attributes
+    ----------
+    steps : int
+        Number of steps of evaluation consumed so far.
+    """
+    def __init__(self, iterator, max_steps=None, deadline=None):
+        self._iterator = iterator
+        self.max_steps = max_steps
+        self.deadline = deadline
+        self.steps = 0
+
+    def __iter__(self):
+        return self
+
+    def step(self):
+        """Performs evaluation until the end of a next step or until the
+        next interval is generated.
+
+        Returns
+        -------
+        tuple
+            An interval or `None` if the step ended without generating
+            an interval.
+
+        Raises
+        ------
+        StopIteration
+            If iteration is finished.
+        LimitExceeded
+            If 'max_steps' or 'deadline' is exceeded.
+        """
+        interval = next(self._iterator)
+        if interval is not None:
+            return interval
+
+        self.steps += 1
+        if self.max_steps is not None and self.steps >= self.max_steps:
+            raise LimitExceeded('Limit of {} steps is exceeded.'
+                                .format(self.max_steps), self.steps)
+        if self.deadline is not None and time.time() > self.deadline:
+            raise LimitExceeded('Deadline is exceeded.', self.steps)
+
+        return None
+
+    def __next__(self):
+        while True:
+            interval = self.step()
+            if interval is not None:
+                return interval
+
+    next = __next__
+
+    def close(self):
+        """Closes the underlying iterator, further steps raise
+        `StopIteration`."""
+        close = getattr(self._iterator, 'close', None)
+        if close is not None:
+            close()
+
+
 class RecurrentEventSet(object):
     """A set of time intervals, combined with a set logic operators:
     AND, OR and NOT.
@@ -161,8 +287,21 @@ class RecurrentEventSet(object):
         14:00 to 15:00, and weekends'.
     """
     def __init__(self, expression):
+        self._expression = None
+        self._json = None
         self.expression = expression
 
+    @property
+    def expression(self):
+        """The expression of the set. Assigning to it resets the cached
+        JSON representation."""
+        return self._expression
+
+    @expression.setter
+    def expression(self, value):
+        self._expression = value
+        self._json = None
+
     def __str__(self):
         return 'RecurrentEventSet({})'.format(repr(self.expression))
 
@@ -170,44 +309,29 @@ class RecurrentEventSet(object):
         return self.__str__()
 
     @staticmethod
-    def _unnest(sample, operator, *args):
-        """Collects operators and arguments to a flat
-        'sample' collection."""
-        sample.append(operator)
-        sample.extend(args)
-        raise Void
+    def _key_callback(operator, *args):
+        """Converts an operator and it's arguments to a nested tuple."""
+        return Result((operator,) + tuple(
+            arg.value if isinstance(arg, Result) else arg for arg in args
+        ))
+
+    def _key(self):
+        """The expression as nested tuples, which can be compared and
+        hashed."""
+        return _walk(self.expression, self._key_callback).value
 
     def __eq__(self, other):
         if not hasattr(other, 'expression'):
             return False
 
-        sample_self = []
-        sample_other = []
+        return self._key() == _walk(other.expression,
+                                    self._key_callback).value
 
-        try:
-            _walk(self.expression,
-                  lambda op, *args: self._unnest(sample_self, op, *args))
-        except Void:
-            pass
-
-        try:
-            _walk(other.expression,
-                  lambda op, *args: self._unnest(sample_other, op, *args))
-        except Void:
-            pass
-
-        return tuple(sample_self) == tuple(sample_other)
+    def __ne__(self, other):
+        return not self == other
 
     def __hash__(self):
-        sample = []
-
-        try:
-            _walk(self.expression,
-                  lambda op, *args: self._unnest(sample, op, *args))
-        except Void:
-            pass
-
-        return hash(tuple(sample))
+        return hash(self._key())
 
     def __contains__(self, item):
         """Containment test. Accepts whatever RecurrentEvent can
@@ -234,7 +358,7 @@ class RecurrentEventSet(object):
 
         return _walk(self.expression, callback)
 
-    def forward(self, start, trim=True):
+    def forward(self, start, trim=True, max_steps=None, deadline=None):
         """Generates intervals according to the expression.
 
         Intervals never overlap.
@@ -250,106 +374,268 @@ class RecurrentEventSet(object):
             Otherwise it will be equal to the point, where the interval
             actually starts, which may be placed earlier in time, that
             'start'.
+        max_steps : int, optional
+            Maximum number of steps of evaluation, see
+            :py:class:`Forward`. Defaults to
+            :py:data:`FORWARD_MAX_STEPS`.
+        deadline : float, optional
+            Point of time, as returned by `time.time()`, after which
+            iteration is interrupted. By default it is computed from
+            :py:data:`FORWARD_TIMEOUT`.
+
+        Returns
+        -------
+        Forward
+            An iterator, that yields tuples of inclusive start and
+            non-inclusive end dates of intervals.
+
+        Raises
+        ------
+        LimitExceeded
+            During the iteration, if 'max_steps' or 'deadline'
+            is exceeded.
+
+        Notes
+        -----
+        The expression is evaluated lazily by streams of intervals, see
+        :py:mod:`tempo.streams`. Intervals of `RecurrentEvent` instances
+        are merged by a heap for OR, intersected for AND and
+        complemented for NOT, as they are generated. Operands of AND
+        seek to the latest start among their current intervals.
+
+        Each unit of work of the streams, that didn't produce an interval,
+        is a single step of evaluation. If 'trim' is `False`, complements
+        of NOT start at 'start'.
+        """
+        if max_steps is None:
+            max_steps = FORWARD_MAX_STEPS
+        if deadline is None and FORWARD_TIMEOUT is not None:
+            deadline = time.time() + FORWARD_TIMEOUT
+
+        return Forward(self._forward(self._stream(start), start, trim),
+                       max_steps, deadline)
+
+    def gaps(self, start, max_steps=None, deadline=None):
+        """Generates intervals, not covered by the expression.
+
+        The same as :py:meth:`forward` of the expression, negated with
+        NOT, but without building the negated expression: gaps
+        are produced lazily between intervals of the expression.
+
+        Parameters
+        ----------
+        start : datetime.datetime
+            Inclusive start date, the first gap is trimmed by it.
+        max_steps : int, optional
+            The same as for :py:meth:`forward`.
+        deadline : float, optional
+            The same as for :py:meth:`forward`.
+
+        Returns
+        -------
+        Forward
+            An iterator, that yields tuples of inclusive start and
+            non-inclusive end dates of gaps.
+
+        Raises
+        ------
+        LimitExceeded
+            During the iteration, if 'max_steps' or 'deadline'
+            is exceeded.
 
+        Examples
+        --------
+        The next closure of a shop::
+
+            >>> next(shop.gaps(datetime.now()), None)
+        """
+        if max_steps is None:
+            max_steps = FORWARD_MAX_STEPS
+        if deadline is None and FORWARD_TIMEOUT is not None:
+            deadline = time.time() + FORWARD_TIMEOUT
+
+        stream = NotStream([self._stream(start)], start)
+        return Forward(self._forward(stream, start, True),
+                       max_steps, deadline)
+
+    def aforward(self, start, trim=True, steps=None, executor=None,
+                 max_steps=None, deadline=None):
+        """Asynchronous version of :py:meth:`forward`.
+
+        Returns an asynchronous iterator, see :py:func:`tempo.aio.aforward`
+        for the details. Requires Python 3.5.2+.
+        """
+        from tempo.aio import aforward
+
+        return aforward(self, start, trim, steps=steps, executor=executor,
+                        max_steps=max_steps, deadline=deadline)
+
+    def cursor(self, start, trim=True):
+        """Resumable iteration over intervals, which can be paged and
+        encoded into a token, see :py:class:`tempo.cursor.Cursor`."""
+        from tempo.cursor import Cursor
+
+        return Cursor(self, start, trim)
+
+    def _stream(self, start):
+        """Builds a stream of intervals of the expression, see
+        :py:mod:`tempo.streams`."""
+        def callback(operator, *args):
+            """Builds streams of operators and their arguments."""
+            children = [arg.value if isinstance(arg, Result)
+                        else AtomStream(arg, start)
+                        for arg in args]
+            return Result(_STREAMS[operator](children, start))
+
+        return _walk(self.expression, callback).value
+
+    @staticmethod
+    def _forward(stream, start, trim, stop=None):
+        """Implementation of :py:meth:`forward`, generates intervals
+        of 'stream' from 'start'.
+
+        Additionally yields `None` after each step of the evaluation,
+        so the caller can suspend the iteration between steps.
+
+        Adjacent intervals of 'stream' are coalesced, an interval
+        is yielded, once the stream can't continue it. If 'stop'
+        is given, the iteration ends, once the stream can't produce
+        intervals, that start earlier than 'stop'.
+        """
+        pending = None
+        while True:
+            interval = stream.pull()
+            if interval is EXHAUSTED:
+                break
+            elif interval is not None and interval[1] > start:
+                if pending is None:
+                    pending = interval
+                elif interval[0] <= pending[1]:
+                    pending = (pending[0], interval[1])
+                else:
+                    yield RecurrentEventSet._trim(pending, start, trim)
+                    pending = interval
+            if pending is not None and stream.low > pending[1]:
+                yield RecurrentEventSet._trim(pending, start, trim)
+                pending = None
+            elif (stop is not None and stream.low >= stop and
+                  (pending is None or pending[0] >= stop)):
+                return
+            else:
+                yield None
+
+        if pending is not None:
+            yield RecurrentEventSet._trim(pending, start, trim)
+
+    @staticmethod
+    def _trim(interval, start, trim):
+        """Trims 'interval' by 'start', if 'trim' is `True`."""
+        a, b = interval
+        if trim and a < start:
+            a = start
+        return a, b
+
+    def _measure(self, start, stop):
+        """Summary of time covered by the expression between 'start' and
+        'stop', see :py:func:`tempo.period.measure`."""
+        from tempo.period import compile_expression, measure
+
+        return measure(compile_expression(self.expression), start, stop)
+
+    def duration(self, start, stop):
+        """Total time covered by the expression between 'start' and
+        'stop'.
+
+        The time is computed from coverage of whole periods of recurrence
+        of the expression's components, multiplied by number of such
+        periods, only partial periods at the edges are evaluated
+        explicitly. So the cost of computation practically doesn't
+        depend on length of the window.
+
+        Parameters
+        ----------
+        start : datetime.datetime
+            Inclusive start of the window.
+        stop : datetime.datetime
+            Non-inclusive end of the window.
+
+        Returns
+        -------
+        datetime.timedelta
+            Covered time.
+        """
+        return self._measure(start, stop).duration
+
+    def between(self, start, stop):
+        """Generates maximal intervals of time, covered by the expression
+        within window from 'start' to 'stop', intervals are clipped by the
+        window.
+
+        Parameters
+        ----------
+        start : datetime.datetime
+            Inclusive start of the window.
+        stop : datetime.datetime
+            Non-inclusive end of the window.
 
         Yields
         ------
         tuple
-            Inclusive start and non-inclusive dates of an interval.
+            Inclusive start and non-inclusive end of an interval.
+        """
+        from tempo.period import compile_expression, intervals
 
-        Notes
-        -----
-        The algorithm is simple:
-
-            1. It generates intervals from RecurrentEvent instances and
-               applies set logic operators on them.
-            2. Checks if resulting interval has gap.
-            3. Checks if there is a possibility, that this gap will gone,
-               by checking if some of the generators could possibly generate
-               interval that will intersect with gap.
-            4. If checks succeed, yields interval previous to gap.
-            5. If not - iterates generators until check succeed.
-
-        This implementation if fairly ineffective and should be optimized.
+        return intervals(compile_expression(self.expression), start, stop)
+
+    def count(self, start, stop):
+        """Number of maximal intervals of time, covered by the expression
+        within window from 'start' to 'stop', the same as
+        ``len(list(self.between(start, stop)))``.
+
+        Intervals are counted per periods of recurrence of the
+        expression's components, like in :py:meth:`duration`, intervals,
+        spanning across boundaries of periods, are counted once.
+
+        Parameters
+        ----------
+        start : datetime.datetime
+            Inclusive start of the window.
+        stop : datetime.datetime
+            Non-inclusive end of the window.
+
+        Returns
+        -------
+        int
+            Number of intervals.
         """
-        context = {
-            'all': []
-        }
+        return self._measure(start, stop).count
 
-        def prepare(operator, *args):
-            """Initializes forward() generators of recurrentevents."""
-            prepared = [operator]
-            for arg in args:
-                if isinstance(arg, RecurrentEvent):
-                    arg = {
-                        'generator': arg.forward(start, trim),
-                        'results': SparseInterval(),
-                        'exhausted': False
-                    }
-                    context['all'].append(arg)
-                elif isinstance(arg, Result):
-                    arg = arg.value
-                prepared.append(arg)
-
-            return Result(prepared)
-
-        generators = _walk(self.expression, prepare).value
-
-        def generate(operator, *args):
-            """Generates SparseInterval instance current and past
-            results of RecurrentEvent.forward() generators with respect
-            to 'operator' of given expression."""
-            operands = []
-            for arg in args:
-                if isinstance(arg, dict):
-                    try:
-                        result = next(arg['generator'])
-                        arg['results'] = (
-                            arg['results'].union(SparseInterval(*[result]))
-                        )
-                    except StopIteration:
-                        arg['exhausted'] = True
-                    operands.append(arg['results'])
-                elif isinstance(arg, SparseInterval):
-                    operands.append(arg)
-            if operator == AND:
-                return reduce(lambda m, v: m.intersection(v), operands)
-            elif operator == OR:
-                return reduce(lambda m, v: m.union(v), operands)
-            elif operator == NOT:
-                union = reduce(lambda m, v: m.union(v), operands)
-                intervals = it.chain((MIN,),
-                                     it.chain.from_iterable(union.intervals),
-                                     (MAX,))
-                return SparseInterval(*zip(intervals, intervals))
-            else:
-                raise AssertionError
+    def is_empty(self):
+        """Tests if the expression doesn't contain any point of time.
 
-        last_date = None
-        while True:
-            generated = _walk(generators, generate)
+        The test is performed by analysis of the expression over periods
+        of recurrence of it's components, without iteration over it's
+        intervals.
 
-            if (len(generated.intervals) == 0 and
-                all(e['exhausted'] for e in context['all'])):
-                return
-            if trim:
-                generated = generated.trim(start=start)
-
-            # Has gap
-            if len(generated.intervals) > 1:
-                if last_date is None:
-                    last_date = generated.intervals[0][1]
-
-                for item in context['all']:
-                    if ((len(item['results'].intervals) == 0 or
-                         item['results'].intervals[-1][1] < last_date) and
-                        not item['exhausted']):
-                        break
-                else:
-                    yield next((a, b) for a, b in generated.intervals
-                               if b == last_date)
-                    last_date = next(b for _, b in generated.intervals
-                                     if b > last_date)
+        The last representable second, which starts at `MAX`, is beyond
+        the measured window, it's tested for containment.
+        """
+        return (self._measure(MIN, MAX).duration == timedelta(0) and
+                MAX not in self)
+
+    def is_universal(self):
+        """Tests if the expression contains all time, a generalization
+        of :py:meth:`.RecurrentEvent.isgapless`.
+        See :py:meth:`is_empty`."""
+        return self._measure(MIN, MAX).duration == MAX - MIN and MAX in self
+
+    def overlaps(self, other):
+        """Tests if the expression has common time with 'other'
+        `RecurrentEventSet` or `RecurrentEvent`.
+        See :py:meth:`is_empty`."""
+        expression = getattr(other, 'expression', other)
+        return not (self.__class__((AND, self.expression, expression))
+                    .is_empty())
 
     @staticmethod
     def to_json_callback(operator, *args):
@@ -366,6 +652,14 @@ class RecurrentEventSet(object):
         representation."""
         return _walk(self.expression, self.to_json_callback)
 
+    def cached_json(self):
+        """The same as :py:meth:`to_json`, but the representation is
+        computed once per expression of the instance and shared between
+        calls, so it's lists can't be modified."""
+        if self._json is None:
+            self._json = _freeze_json(self.to_json())
+        return self._json
+
     @staticmethod
     def from_json_callback(operator, *args):
         """Converts arguments that are time intervals to Python."""
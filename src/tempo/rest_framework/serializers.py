@@ -2,6 +2,9 @@
 """Provides utilities for serialization/deserialization of
 Tempo data types.
 """
+import datetime as dt
+from itertools import islice
+
 from six import string_types
 
 from rest_framework import serializers
@@ -11,7 +14,13 @@ from tempo.recurrenteventset import RecurrentEventSet
 
 # pylint: disable=no-init,no-self-use,no-member
 class RecurrentEventSetField(serializers.Field):
-    """Representation of RecurrentEventSet."""
+    """Representation of RecurrentEventSet.
+
+    Uses :py:meth:`.RecurrentEventSet.cached_json`, so an instance,
+    represented many times, is converted to JSON once. List endpoints,
+    which represent fresh instances of a database, still convert each of
+    them.
+    """
     default_error_messages = {
         'incorrect_type': 'Incorrect type. Expected a string or list/tuple, '
                           'but got {input_type}',
@@ -19,7 +28,7 @@ class RecurrentEventSetField(serializers.Field):
     }
 
     def to_representation(self, obj):
-        return obj.to_json()
+        return obj.cached_json()
 
     def to_internal_value(self, data):
         # pylint: disable=missing-docstring
@@ -29,3 +38,109 @@ class RecurrentEventSetField(serializers.Field):
             self.fail('incorrect_format')
 
         return RecurrentEventSet.from_json(data)
+
+
+class RecurrentEventSetListField(serializers.ListField):
+    """Representation of a list of RecurrentEventSet, stored
+    in a single attribute.
+
+    Items are represented without a call
+    of :py:class:`RecurrentEventSetField` per item. It doesn't change
+    representation of lists of objects (``many=True``), where each object
+    has it's own schedule.
+    """
+    child = RecurrentEventSetField()
+
+    def to_representation(self, data):
+        return [None if item is None else item.cached_json()
+                for item in data]
+
+
+class OccurrencesField(serializers.Field):
+    """Read-only representation of next intervals of a RecurrentEventSet
+    as a list of ``[start, stop]`` pairs.
+
+    Intervals are computed from a single point of time for all objects,
+    represented by a serializer. When the serializer represents a list
+    of objects, intervals are computed for all distinct schedules of the
+    list at once, when the first of them is represented.
+
+    Parameters
+    ----------
+    count : int
+        Number of intervals.
+    start : datetime.datetime or callable, optional
+        Inclusive start date or a callable, which returns it. It is
+        resolved once per serializer instance, defaults to
+        `datetime.datetime.now`.
+    trim : bool
+        The same as for :py:meth:`.RecurrentEventSet.forward`.
+    max_steps : int, optional
+        The same as for :py:meth:`.RecurrentEventSet.forward`.
+
+    Examples
+    --------
+    >>> class ShopSerializer(serializers.ModelSerializer):
+    ...     next_openings = OccurrencesField(source='schedule', count=3)
+    """
+    def __init__(self, count=3, start=None, trim=True, max_steps=None,
+                 **kwargs):
+        kwargs['read_only'] = True
+        super(OccurrencesField, self).__init__(**kwargs)
+        self.count = count
+        self.start = dt.datetime.now if start is None else start
+        self.trim = trim
+        self.max_steps = max_steps
+        self.datetime_field = serializers.DateTimeField()
+        self._start = None
+        self._occurrences = {}
+
+    def _get_start(self):
+        """The point of time, resolved once."""
+        if self._start is None:
+            self._start = self.start() if callable(self.start) else self.start
+        return self._start
+
+    def _schedules(self):
+        """Schedules of all objects of the root list serializer."""
+        root = self.root
+        instances = getattr(root, 'instance', None)
+        # Managers are skipped, since they would be queried again.
+        if (not isinstance(root, serializers.ListSerializer) or
+                self.parent is not root.child or
+                instances is None or hasattr(instances, 'get_queryset')):
+            return []
+
+        result = []
+        for instance in instances:
+            try:
+                value = self.get_attribute(instance)
+            except (AttributeError, KeyError):
+                continue
+            if isinstance(value, RecurrentEventSet):
+                result.append(value)
+        return result
+
+    def _compute(self, value):
+        """Computes intervals of 'value' and of schedules of objects
+        of the same list."""
+        start = self._get_start()
+        occurrences = self._occurrences
+        for schedule in [value] + self._schedules():
+            if schedule not in occurrences:
+                occurrences[schedule] = list(islice(
+                    schedule.forward(start, self.trim,
+                                     max_steps=self.max_steps),
+                    self.count
+                ))
+        return occurrences[value]
+
+    def to_representation(self, value):
+        try:
+            intervals = self._occurrences[value]
+        except KeyError:
+            intervals = self._compute(value)
+
+        to_representation = self.datetime_field.to_representation
+        return [[to_representation(a), to_representation(b)]
+                for a, b in intervals]
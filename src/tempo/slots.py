@@ -0,0 +1,94 @@
+# coding=utf-8
+"""Provides search of time slots, common for many schedules."""
+from datetime import timedelta
+import time
+
+from tempo import recurrenteventset as recurrenteventset_module
+from tempo.recurrentevent import RecurrentEvent
+from tempo.recurrenteventset import Forward, RecurrentEventSet
+from tempo.streams import AtomStream, AndStream
+
+
+_ZERO = timedelta(0)
+
+
+def find_common(schedules, start, min_duration=None, limit=None, stop=None,
+                max_steps=None, deadline=None):
+    """Lazily finds maximal slots of time, covered by all 'schedules'
+    at once.
+
+    Schedules are intersected as streams of intervals, see
+    :py:mod:`tempo.streams`: schedules, whose current interval ends
+    before the latest start among current intervals, seek to that start,
+    so intervals of a schedule, that can't contain a slot, are skipped
+    by whole periods of recurrence, instead of being generated.
+
+    Parameters
+    ----------
+    schedules : iterable
+        `RecurrentEventSet` or `RecurrentEvent` instances.
+    start : datetime.datetime
+        Inclusive start date.
+    min_duration : datetime.timedelta, optional
+        Minimal duration of a slot, shorter slots are skipped.
+    limit : int, optional
+        Maximal number of slots to generate.
+    stop : datetime.datetime, optional
+        Slots, that start at or after 'stop', are not searched.
+    max_steps : int, optional
+        The same as for :py:meth:`.RecurrentEventSet.forward`.
+    deadline : float, optional
+        The same as for :py:meth:`.RecurrentEventSet.forward`.
+
+    Yields
+    ------
+    tuple
+        Inclusive start and non-inclusive end of a slot.
+
+    Raises
+    ------
+    tempo.recurrenteventset.LimitExceeded
+        During the iteration, if 'max_steps' or 'deadline' is exceeded,
+        for example, if schedules never overlap and 'stop' is not given.
+
+    Examples
+    --------
+    The earliest slot of 45 minutes within a week, when all resources
+    are available::
+
+        >>> next(find_common(resources, datetime.now(),
+        ...                  min_duration=timedelta(minutes=45),
+        ...                  stop=datetime.now() + timedelta(weeks=1)),
+        ...      None)
+    """
+    if min_duration is None:
+        min_duration = _ZERO
+    if limit is not None and limit <= 0:
+        return
+    if max_steps is None:
+        max_steps = recurrenteventset_module.FORWARD_MAX_STEPS
+    if deadline is None and \
+            recurrenteventset_module.FORWARD_TIMEOUT is not None:
+        deadline = time.time() + recurrenteventset_module.FORWARD_TIMEOUT
+
+    streams = [AtomStream(schedule, start)
+               if isinstance(schedule, RecurrentEvent)
+               else schedule._stream(start)  # pylint: disable=protected-access
+               for schedule in schedules]
+    if len(streams) == 0:
+        return
+
+    stream = AndStream(streams, start)
+    # pylint: disable=protected-access
+    slots = Forward(RecurrentEventSet._forward(stream, start, True, stop),
+                    max_steps, deadline)
+    found = 0
+    for slot in slots:
+        if stop is not None and slot[0] >= stop:
+            return
+        if slot[1] - slot[0] < min_duration:
+            continue
+        yield slot
+        found += 1
+        if limit is not None and found >= limit:
+            return
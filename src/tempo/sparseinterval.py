@@ -6,6 +6,8 @@ from collections import deque
 
 from six.moves import range  # pylint: disable=redefined-builtin
 
+from tempo import instrumentation
+
 
 class SparseInterval(object):
 
@@ -51,6 +53,8 @@ class SparseInterval(object):
 
     def union(self, other):
         """Produces interval, that contains space from both."""
+        if instrumentation.enabled:
+            instrumentation.record_operation('union', self, other)
         intervals = deque()
         intervals.extend(self._intervals)
         intervals.extend(other._intervals)  # pylint: disable=protected-access
@@ -63,6 +67,8 @@ class SparseInterval(object):
     def intersection(self, other):
         """Produces interval, that contains space,
         contained by this and in 'other' in the same time."""
+        if instrumentation.enabled:
+            instrumentation.record_operation('intersection', self, other)
         intervals = deque()
         intervals.extend(self._intervals)
         intervals.extend(other._intervals)  # pylint: disable=protected-access
@@ -82,6 +88,8 @@ class SparseInterval(object):
     def difference(self, other):
         """Produces inerval, that contain space of this one, but doesn't
         contain space of the 'other'."""
+        if instrumentation.enabled:
+            instrumentation.record_operation('difference', self, other)
         intervals = deque()
         for a, b in self._intervals:
             intersects = False
@@ -102,6 +110,8 @@ class SparseInterval(object):
     def trim(self, start=None, stop=None):
         """Trims the intervals from the start and/or from the end by values
         of respective arguments."""
+        if instrumentation.enabled:
+            instrumentation.record_operation('trim', self)
         intervals = self._intervals
         if len(self._intervals) == 0:
             return SparseInterval(*self._intervals)
@@ -0,0 +1,326 @@
+# coding=utf-8
+"""Provides streams of intervals, which evaluate expressions of
+`RecurrentEventSet` lazily.
+
+Each operator and each `RecurrentEvent` of an expression is represented
+by a stream, that produces sorted maximal intervals of time. A stream
+is advanced with ``pull()``, which performs a bounded amount of work
+and returns either the next interval, `None` - if no interval is ready
+yet, or :py:data:`EXHAUSTED` - if there will be no more intervals.
+Returning `None` allows to interrupt evaluation between steps of work,
+that never produce an interval.
+
+Intervals of a stream never overlap, but may be adjacent: a run
+of coalesced intervals is produced in parts of at most
+:py:data:`MAX_RUN` consumed intervals, so streams, that cover all time,
+e.g. a union of complementary recurrent events, don't block operators
+above them. Consumers coalesce adjacent parts back.
+
+Each stream also has ``low`` attribute - a point of time, earlier than
+which it's future intervals will not start. It grows, while a stream
+searches for the next interval, so operators can produce intervals
+without waiting for streams, that may never produce intervals again.
+
+A stream can be advanced to a point of time with ``seek(t)`` - after
+that it produces intervals, as if it was started from `t`: intervals,
+that end earlier or at `t`, are skipped and the next one is trimmed
+by `t`. A seek of `RecurrentEvent` intervals jumps directly to the
+period of recurrence of `t`, so intersections advance their operands
+to the latest start among them, instead of stepping through all
+intervals in between.
+"""
+import heapq
+
+from tempo.unit import MIN, MAX
+
+
+#: Returned by ``pull()`` of an exhausted stream.
+EXHAUSTED = object()
+#: Maximal number of consumed intervals, coalesced into a single
+#: produced interval, longer runs are produced in adjacent parts.
+MAX_RUN = 64
+
+
+class AtomStream(object):
+    """Intervals of a `RecurrentEvent` from 'start', adjacent intervals
+    are coalesced.
+
+    Parameters
+    ----------
+    atom : tempo.recurrentevent.RecurrentEvent
+        The recurrent event.
+    start : datetime.datetime
+        Intervals, that end earlier or at 'start', are skipped, the first
+        interval is not trimmed.
+    """
+    __slots__ = ['atom', 'start', 'low', '_intervals', '_pending',
+                 '_coalesced']
+
+    def __init__(self, atom, start):
+        self.atom = atom
+        self.start = start
+        self.low = start
+        self._intervals = atom.forward(start, trim=False)
+        self._pending = None
+        self._coalesced = 0
+
+    def pull(self):
+        """Returns the next interval, `None` or :py:data:`EXHAUSTED`."""
+        for a, b in self._intervals:
+            if b <= self.start or a >= b:
+                continue
+            pending = self._pending
+            if pending is None:
+                self._pending = (a, b)
+                self._coalesced = 1
+                self.low = a
+                return None
+            elif a <= pending[1]:
+                pending = (pending[0], max(pending[1], b))
+                self._coalesced += 1
+                if self._coalesced < MAX_RUN:
+                    self._pending = pending
+                    return None
+                self._pending = None
+                self.low = pending[1]
+                return pending
+            self._pending = (a, b)
+            self._coalesced = 1
+            self.low = a
+            return pending
+
+        pending = self._pending
+        self.low = MAX
+        if pending is None:
+            return EXHAUSTED
+        self._pending = None
+        return pending
+
+    def seek(self, t):
+        """Skips intervals earlier than 't'."""
+        if t <= self.low:
+            return
+        pending = self._pending
+        if pending is not None and pending[1] > t:
+            self._pending = (t, pending[1])
+        else:
+            self._pending = None
+            self.start = t
+            self._intervals = self.atom.forward(t, trim=True)
+        self.low = t
+
+
+class OrStream(object):
+    """Union of streams, merged with a heap ordered by starts
+    of intervals.
+
+    Overlapping and adjacent intervals are coalesced, as they come out
+    of the heap, so producing an interval costs `O(log k)` per each
+    consumed interval of `k` streams.
+    """
+    __slots__ = ['low', '_children', '_heap', '_pending', '_run',
+                 '_merged', '_floor']
+
+    def __init__(self, children, start):
+        self.low = start
+        self._children = children
+        self._heap = []
+        self._pending = list(range(len(children)))
+        self._run = None
+        self._merged = 0
+        # End of the last produced part of a run, intervals are trimmed
+        # by it, so parts don't overlap.
+        self._floor = MIN
+
+    def pull(self):
+        """Returns the next interval, `None` or :py:data:`EXHAUSTED`."""
+        children = self._children
+        pending = self._pending
+        if len(pending) > 0:
+            waiting = []
+            for index in pending:
+                interval = children[index].pull()
+                if interval is None:
+                    waiting.append(index)
+                elif interval is not EXHAUSTED:
+                    heapq.heappush(self._heap,
+                                   (interval[0], interval[1], index))
+            self._pending = pending = waiting
+
+        heap = self._heap
+        run = self._run
+        # Waiting streams will not produce intervals, that start
+        # earlier than 'bound'.
+        bound = min([children[index].low for index in pending] + [MAX])
+        if len(heap) > 0 and heap[0][0] <= bound:
+            a, b, index = heap[0]
+            if run is not None and a > run[1]:
+                self._run = None
+                self.low = a
+                return run
+            heapq.heappop(heap)
+            pending.append(index)
+            if b <= self._floor:
+                return None
+            a = max(a, self._floor)
+            if run is None:
+                self._run = (a, b)
+                self._merged = 1
+                self.low = a
+                return None
+            run = (run[0], max(run[1], b))
+            self._merged += 1
+            if self._merged < MAX_RUN:
+                self._run = run
+                return None
+            self._run = None
+            self.low = self._floor = run[1]
+            return run
+
+        if len(heap) == 0 and len(pending) == 0:
+            self._run = None
+            self.low = MAX
+            return EXHAUSTED if run is None else run
+
+        if run is None:
+            self.low = max(self.low, bound)
+        elif bound > run[1]:
+            self._run = None
+            self.low = bound
+            return run
+        return None
+
+    def seek(self, t):
+        """Skips intervals earlier than 't'."""
+        if t <= self.low:
+            return
+        run = self._run
+        if run is not None:
+            self._run = (t, run[1]) if run[1] > t else None
+        heap = []
+        for a, b, index in self._heap:
+            if b > t:
+                heap.append((max(a, t), b, index))
+            else:
+                self._pending.append(index)
+        heapq.heapify(heap)
+        self._heap = heap
+        for child in self._children:
+            child.seek(t)
+        self.low = t
+        self._floor = max(self._floor, t)
+
+
+class AndStream(object):
+    """Intersection of streams.
+
+    Streams, whose current intervals end first, are advanced, until
+    current intervals of all streams overlap. Advanced streams seek to
+    the latest start of current intervals, so the cost depends on number
+    of intersections, rather than on number of intervals of operands.
+    """
+    __slots__ = ['low', '_children', '_current', '_pending']
+
+    def __init__(self, children, start):
+        self.low = start
+        self._children = children
+        self._current = [None] * len(children)
+        self._pending = list(range(len(children)))
+
+    def pull(self):
+        """Returns the next interval, `None` or :py:data:`EXHAUSTED`."""
+        if len(self._children) == 0:
+            # Intersection of nothing covers all the time.
+            if self.low >= MAX:
+                return EXHAUSTED
+            interval = (self.low, MAX)
+            self.low = MAX
+            return interval
+
+        current = self._current
+        pending = self._pending
+        if len(pending) > 0:
+            waiting = []
+            for index in pending:
+                interval = self._children[index].pull()
+                if interval is None:
+                    waiting.append(index)
+                    self.low = max(self.low, self._children[index].low)
+                elif interval is EXHAUSTED:
+                    self.low = MAX
+                    return EXHAUSTED
+                else:
+                    current[index] = interval
+            self._pending = pending = waiting
+            if len(waiting) > 0:
+                return None
+
+        lower = max(a for a, _ in current)
+        upper = min(b for _, b in current)
+        threshold = upper if lower < upper else lower
+        for index, (_, b) in enumerate(current):
+            if b <= threshold:
+                self._children[index].seek(threshold)
+                pending.append(index)
+        self.low = max(self.low, threshold)
+        if lower < upper:
+            return lower, upper
+        return None
+
+    def seek(self, t):
+        """Skips intervals earlier than 't'."""
+        if t <= self.low:
+            return
+        current = self._current
+        pending = self._pending
+        for index, child in enumerate(self._children):
+            child.seek(t)
+            if index in pending:
+                continue
+            a, b = current[index]
+            if b > t:
+                current[index] = (max(a, t), b)
+            else:
+                pending.append(index)
+        self.low = t
+
+
+class NotStream(object):
+    """Complement of a stream from 'start' to the end of time.
+
+    Gaps between intervals of the stream are produced, as intervals
+    come out of it.
+    """
+    __slots__ = ['low', '_child', '_cursor']
+
+    def __init__(self, children, start):
+        self.low = start
+        self._child, = children
+        self._cursor = start
+
+    def pull(self):
+        """Returns the next interval, `None` or :py:data:`EXHAUSTED`."""
+        cursor = self._cursor
+        if cursor is None:
+            return EXHAUSTED
+
+        interval = self._child.pull()
+        if interval is None:
+            return None
+        elif interval is EXHAUSTED:
+            self._cursor = None
+            self.low = MAX
+            return (cursor, MAX) if cursor < MAX else EXHAUSTED
+
+        a, b = interval
+        self.low = self._cursor = max(cursor, b)
+        if cursor < a:
+            return cursor, a
+        return None
+
+    def seek(self, t):
+        """Skips intervals earlier than 't'."""
+        if t <= self.low:
+            return
+        self._child.seek(t)
+        self.low = self._cursor = t
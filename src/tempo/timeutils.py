@@ -5,7 +5,7 @@ import datetime as dt
 from itertools import chain, islice
 import math
 
-
+from tempo import instrumentation
 from tempo.unit import (Unit, SECONDS_IN_MINUTE, SECONDS_IN_HOUR,
                         SECONDS_IN_DAY, DAYS_IN_WEEK, DAYS_OF_COMMON_YEAR,
                         DAYS_OF_LEAP_YEAR, MIN, MAX, MONTHS_IN_YEAR,
@@ -34,6 +34,8 @@ def floor(datetime, unit):
     ... datetime.datetime(2014, 10, 15, 5, 0, 0)
 
     """
+    if instrumentation.enabled:
+        instrumentation.record('timeutils.floor.calls')
     if unit == Unit.SECOND:
         return datetime.replace(microsecond=0)
     elif unit == Unit.MINUTE:
@@ -73,6 +75,8 @@ def delta(datetime1, datetime2, unit):
     int
         Time delta.
     """
+    if instrumentation.enabled:
+        instrumentation.record('timeutils.delta.calls')
     datetime1, datetime2 = sorted([datetime1, datetime2])
 
     timedelta = datetime2 - datetime1
@@ -98,9 +102,12 @@ def delta(datetime1, datetime2, unit):
 def _add_years(datetime, years):
     """Adds 'delta' of years to a 'datetime'."""
     sign = int(math.copysign(1, years))
+    # February 29 of the year of 'datetime' is passed by additions only
+    # from dates before March.
+    year = datetime.year if datetime.month < 3 else datetime.year + 1
     days = (abs(years) * DAYS_IN_COMMON_YEAR +
-            leapdays(*sorted((datetime.year, datetime.year + years)))) * sign
-    _check_overflow(datetime, days=years)
+            leapdays(*sorted((year, year + years)))) * sign
+    _check_overflow(datetime, days=days)
 
     return datetime + dt.timedelta(days=days)
 
@@ -151,6 +158,8 @@ def add_delta(datetime, n, unit):
     >>> add_delta(datetime(2000, 10, 10), 5, Unit.DAY)
     ... datetime(2000, 10, 15, 0, 0)
     """
+    if instrumentation.enabled:
+        instrumentation.record('timeutils.add_delta.calls')
     if unit == Unit.SECOND:
         _check_overflow(datetime, seconds=n)
         return datetime + dt.timedelta(seconds=n)
@@ -171,7 +180,7 @@ def add_delta(datetime, n, unit):
         sign = int(math.copysign(1, n))
         years = abs(n) // MONTHS_IN_YEAR * sign
 
-        if years > 0:
+        if years != 0:
             datetime = _add_years(datetime, years)
             n = (abs(n) % MONTHS_IN_YEAR) * sign
 
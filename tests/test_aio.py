@@ -0,0 +1,117 @@
+# coding=utf-8
+import asyncio
+import datetime as dt
+import itertools as it
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tempo.recurrenteventset import RecurrentEventSet, LimitExceeded
+
+
+def run(coroutine):
+    """Runs 'coroutine' in a new event loop."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def take(iterator, n):
+    """Collects first 'n' items of asynchronous 'iterator' and closes it."""
+    result = []
+    try:
+        async for item in iterator:
+            result.append(item)
+            if len(result) >= n:
+                break
+    finally:
+        await iterator.aclose()
+    return result
+
+
+@pytest.mark.parametrize('expression, start, trim', [
+    (['OR', [1, 15, 'day', 'month'], [15, 20, 'day', 'month']],
+     dt.datetime(2000, 1, 1), True),
+    (['AND', [1, 25, 'day', 'month'], ['NOT', [10, 15, 'day', 'month']]],
+     dt.datetime(2000, 1, 1), True),
+    (['OR', [5, 10, 'day', 'month']], dt.datetime(2000, 1, 8), False),
+])
+@pytest.mark.parametrize('executor', [None, ThreadPoolExecutor(1)])
+def test_aforward(expression, start, trim, executor):
+    """aforward() yields the same intervals as forward()."""
+    recurrenteventset = RecurrentEventSet.from_json(expression)
+    expected = list(it.islice(recurrenteventset.forward(start, trim), 5))
+
+    actual = run(take(recurrenteventset.aforward(start, trim, steps=1,
+                                                 executor=executor), 5))
+
+    assert actual == expected
+
+
+def test_aforward_yields_control():
+    """Other tasks are running, while aforward() iterates a schedule."""
+    recurrenteventset = RecurrentEventSet.from_json(
+        ['AND', [1, 2, 'day', 'month'], [10, 11, 'hour', 'day']]
+    )
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def main():
+        task = asyncio.ensure_future(ticker())
+        await take(recurrenteventset.aforward(dt.datetime(2000, 1, 1),
+                                              steps=1), 10)
+        task.cancel()
+
+    run(main())
+
+    assert len(ticks) > 1
+
+
+@pytest.mark.parametrize('executor', [None, ThreadPoolExecutor(1)])
+def test_aforward_max_steps(executor):
+    """aforward() respects limit of steps."""
+    recurrenteventset = RecurrentEventSet.from_json(
+        ['AND', [1, 10, 'day', 'month'], [15, 20, 'day', 'month']]
+    )
+
+    with pytest.raises(LimitExceeded):
+        run(take(recurrenteventset.aforward(dt.datetime(2000, 1, 1),
+                                            steps=3, executor=executor,
+                                            max_steps=10), 1))
+
+
+@pytest.mark.parametrize('executor', [None, ThreadPoolExecutor(1)])
+def test_aforward_aclose(executor):
+    """aclose() closes the underlying iterator after an early break."""
+    recurrenteventset = RecurrentEventSet.from_json(
+        ['OR', [1, 15, 'day', 'month'], [15, 20, 'day', 'month']]
+    )
+    iterator = recurrenteventset.aforward(dt.datetime(2000, 1, 1), steps=1,
+                                          executor=executor)
+
+    assert len(run(take(iterator, 1))) == 1
+    with pytest.raises(StopIteration):
+        iterator.forward.step()
+    assert run(take(iterator, 1)) == []
+
+
+def test_aforward_exhausted():
+    """aforward() ends with the schedule."""
+    recurrenteventset = RecurrentEventSet.from_json(
+        ['OR', [2000, 2001, 'year', None]]
+    )
+    iterator = recurrenteventset.aforward(dt.datetime(2000, 1, 1))
+
+    async def collect():
+        return [interval async for interval in iterator]
+
+    assert run(collect()) == [(dt.datetime(2000, 1, 1),
+                               dt.datetime(2001, 1, 1))]
+    with pytest.raises(StopIteration):
+        iterator.forward.step()
@@ -0,0 +1,114 @@
+# coding=utf-8
+import datetime as dt
+
+import pytest
+
+from tempo import instrumentation
+from tempo.bulk import contains_batch, contains_matrix
+from tempo.recurrenteventset import RecurrentEventSet
+
+
+SCHEDULES = [
+    RecurrentEventSet.from_json(['OR', [10, 19, 'hour', 'day']]),
+    RecurrentEventSet.from_json(['AND', [1, 6, 'day', 'week'],
+                                        [9, 18, 'hour', 'day']]),
+    ['AND', [1, 15, 'day', 'month'], ['NOT', [12, 13, 'hour', 'day']]],
+    RecurrentEventSet.from_json(['NOT', [0, 30, 'minute', 'hour']]),
+    RecurrentEventSet.from_json(['OR', [2000, 2001, 'year', None]]),
+]
+
+TIMESTAMPS = [dt.datetime(2000, 1, 1) + dt.timedelta(hours=7 * n)
+              for n in range(100)]
+
+
+@pytest.mark.parametrize('workers, chunksize', [
+    (1, None),
+    (2, None),
+    (3, 1),
+])
+def test_contains_matrix(workers, chunksize):
+    """Results of bulk evaluation match results of containment tests."""
+    expected = [[timestamp in RecurrentEventSet.from_json(schedule)
+                 if isinstance(schedule, list) else timestamp in schedule
+                 for timestamp in TIMESTAMPS]
+                for schedule in SCHEDULES]
+
+    actual = contains_matrix(SCHEDULES, TIMESTAMPS, workers=workers,
+                             chunksize=chunksize)
+
+    assert actual.shape == (len(SCHEDULES), len(TIMESTAMPS))
+    assert actual.tolist() == expected
+    assert actual[1, 1] == expected[1][1]
+    assert actual.row(2) == expected[2]
+
+
+@pytest.mark.parametrize('schedules, timestamps', [
+    ([], TIMESTAMPS),
+    (SCHEDULES, []),
+])
+def test_contains_matrix_empty(schedules, timestamps):
+    """Empty inputs produce empty matrices."""
+    actual = contains_matrix(schedules, timestamps, workers=2)
+
+    assert actual.shape == (len(schedules), len(timestamps))
+    assert actual.tolist() == [[] for _ in schedules]
+
+
+
+def atoms(expression):
+    """Atoms of a JSON expression."""
+    for value in expression[1:]:
+        if isinstance(value[0], int):
+            yield tuple(value)
+        else:
+            for atom in atoms(value):
+                yield atom
+
+
+def test_contains_batch():
+    """Results match results of containment tests, each distinct atom
+    is tested once per timestamp."""
+    schedules = [RecurrentEventSet.from_json(schedule)
+                 if isinstance(schedule, list) else schedule
+                 for schedule in SCHEDULES] * 3
+    expected = [[timestamp in schedule for timestamp in TIMESTAMPS]
+                for schedule in schedules]
+    distinct = set(atom for schedule in schedules
+                   for atom in atoms(schedule.to_json()))
+
+    with instrumentation.collect() as counters:
+        actual = contains_batch(schedules, TIMESTAMPS)
+
+    assert actual == expected
+    assert (counters['recurrentevent.contains'] ==
+            len(distinct) * len(TIMESTAMPS))
+
+
+EMPTY = [['AND'], ['OR'], ['AND', ['OR'], [10, 19, 'hour', 'day']],
+         ['OR', ['AND'], [10, 19, 'hour', 'day']], ['NOT', ['OR']]]
+
+
+def test_contains_batch_no_operands():
+    """Intersection of no operands contains everything, union of no
+    operands contains nothing."""
+    schedules = [RecurrentEventSet.from_json(schedule) for schedule in EMPTY]
+    expected = [[timestamp in schedule for timestamp in TIMESTAMPS]
+                for schedule in schedules]
+
+    actual = contains_batch(schedules, TIMESTAMPS)
+
+    assert actual == expected
+    assert actual[0] == [True] * len(TIMESTAMPS)
+    assert actual[1] == [False] * len(TIMESTAMPS)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_contains_matrix_no_operands(workers):
+    """Operators without operands are evaluated in worker processes."""
+    expected = [[timestamp in RecurrentEventSet.from_json(schedule)
+                 for timestamp in TIMESTAMPS]
+                for schedule in EMPTY]
+
+    actual = contains_matrix(EMPTY, TIMESTAMPS, workers=workers)
+
+    assert actual.tolist() == expected
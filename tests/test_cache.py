@@ -0,0 +1,160 @@
+# coding=utf-8
+import datetime as dt
+import itertools as it
+import threading
+import time
+
+import pytest
+
+from tempo.cache import OccurrenceCache, CacheStats
+from tempo.recurrenteventset import AND, OR, NOT, RecurrentEventSet
+from tempo.unit import Unit
+
+
+BUSINESS_HOURS = RecurrentEventSet.from_json(
+    [AND, [1, 6, 'day', 'week'], [9, 18, 'hour', 'day'],
+          [NOT, [13, 14, 'hour', 'day']]]
+)
+NIGHTS = RecurrentEventSet.from_json(
+    [OR, [22, 24, 'hour', 'day'], [0, 2, 'hour', 'day']]
+)
+
+
+@pytest.mark.parametrize('recurrenteventset', [BUSINESS_HOURS, NIGHTS])
+@pytest.mark.parametrize('unit', [Unit.HOUR, Unit.DAY, Unit.WEEK])
+def test_forward(recurrenteventset, unit):
+    """Cached intervals are the same, as of forward()."""
+    cache = OccurrenceCache(unit=unit)
+    start = dt.datetime(2015, 11, 6, 12, 30)
+    for minutes, n in [(0, 3), (0, 3), (90, 2), (600, 10), (60, 1)]:
+        current = start + dt.timedelta(minutes=minutes)
+        expected = list(it.islice(recurrenteventset.forward(current), n))
+
+        assert cache.forward(recurrenteventset, current, n) == expected
+
+
+def test_forward_exhausted():
+    """Exhausted intervals are cached as complete."""
+    recurrenteventset = RecurrentEventSet.from_json(
+        [OR, [2000, 2002, 'year', None]]
+    )
+    cache = OccurrenceCache()
+    start = dt.datetime(1999, 5, 1, 12)
+    expected = [(dt.datetime(2000, 1, 1), dt.datetime(2002, 1, 1))]
+
+    assert cache.forward(recurrenteventset, start, 3) == expected
+    assert cache.forward(recurrenteventset, start, 5) == expected
+    assert cache.stats() == CacheStats(hits=1, misses=1, size=1,
+                                       bytes=cache.stats().bytes)
+
+
+@pytest.mark.parametrize('recurrenteventset', [BUSINESS_HOURS, NIGHTS])
+@pytest.mark.parametrize('start, stop', [
+    (dt.datetime(2015, 11, 6, 12, 30), dt.datetime(2015, 11, 10, 1)),
+    (dt.datetime(2015, 11, 6, 15), dt.datetime(2015, 11, 6, 17)),
+    (dt.datetime(2015, 11, 6, 12), dt.datetime(2015, 11, 6, 12)),
+])
+def test_between(recurrenteventset, start, stop):
+    """Cached intervals are the same, as of between()."""
+    cache = OccurrenceCache()
+    expected = list(recurrenteventset.between(start, stop))
+
+    assert cache.between(recurrenteventset, start, stop) == expected
+    assert cache.between(recurrenteventset, start, stop) == expected
+
+
+def test_stats():
+    """Hits and misses are counted, equal schedules share entries."""
+    cache = OccurrenceCache()
+    start = dt.datetime(2015, 11, 6, 12)
+
+    cache.forward(BUSINESS_HOURS, start, 2)
+    cache.forward(RecurrentEventSet.from_json(BUSINESS_HOURS.to_json()),
+                  start + dt.timedelta(minutes=30), 2)
+    cache.between(NIGHTS, start, start + dt.timedelta(days=1))
+    stats = cache.stats()
+
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == \
+        (1, 2, 0, 2)
+    assert stats.bytes > 0
+
+
+def test_maxsize():
+    """Least recently used entries are evicted."""
+    cache = OccurrenceCache(maxsize=2)
+    start = dt.datetime(2015, 11, 6, 12)
+    stop = start + dt.timedelta(days=1)
+
+    cache.between(BUSINESS_HOURS, start, stop)
+    cache.between(NIGHTS, start, stop)
+    cache.between(BUSINESS_HOURS, start, stop)
+    cache.between(NIGHTS, stop, stop + dt.timedelta(days=1))
+    cache.between(BUSINESS_HOURS, start, stop)
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == \
+        (2, 3, 1, 2)
+
+
+def test_max_bytes():
+    """Entries are evicted, when their memory exceeds the limit."""
+    start = dt.datetime(2015, 11, 6, 12)
+    stop = start + dt.timedelta(days=30)
+    cache = OccurrenceCache()
+    cache.between(BUSINESS_HOURS, start, stop)
+    size = cache.stats().bytes
+    cache = OccurrenceCache(max_bytes=size)
+
+    cache.between(BUSINESS_HOURS, start, stop)
+    cache.between(NIGHTS, start, stop)
+
+    stats = cache.stats()
+    assert stats.bytes <= size
+    assert stats.evictions == 1
+
+
+def test_ttl(monkeypatch):
+    """Entries expire after time to live."""
+    now = [1000.0]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+    cache = OccurrenceCache(ttl=60)
+    start = dt.datetime(2015, 11, 6, 12)
+
+    cache.forward(BUSINESS_HOURS, start, 2)
+    now[0] += 30
+    cache.forward(BUSINESS_HOURS, start, 2)
+    now[0] += 60
+    cache.forward(BUSINESS_HOURS, start, 2)
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions) == (1, 2, 1)
+
+
+def test_threads():
+    """A cache can be shared between threads."""
+    cache = OccurrenceCache(maxsize=5)
+    start = dt.datetime(2015, 11, 6, 12)
+    expected = {
+        hours: list(it.islice(BUSINESS_HOURS.forward(
+            start + dt.timedelta(hours=hours)
+        ), 3))
+        for hours in range(0, 240, 12)
+    }
+    errors = []
+
+    def run():
+        for hours in sorted(expected) * 5:
+            current = start + dt.timedelta(hours=hours)
+            if cache.forward(BUSINESS_HOURS, current, 3) != expected[hours]:
+                errors.append(hours)
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.stats()
+    assert errors == []
+    assert stats.hits + stats.misses == 4 * 5 * len(expected)
+    assert stats.size <= 5
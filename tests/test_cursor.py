@@ -0,0 +1,85 @@
+# coding=utf-8
+import datetime as dt
+import itertools as it
+
+import pytest
+
+from tempo.cursor import Cursor
+from tempo.recurrenteventset import AND, OR, NOT, RecurrentEventSet
+
+
+BUSINESS_HOURS = [AND, [1, 6, 'day', 'week'], [9, 18, 'hour', 'day'],
+                       [NOT, [13, 14, 'hour', 'day']]]
+
+
+@pytest.mark.parametrize('expression, start, trim', [
+    (BUSINESS_HOURS, dt.datetime(2015, 11, 6, 12), True),
+    (BUSINESS_HOURS, dt.datetime(2015, 11, 6, 12), False),
+    ([OR, [22, 24, 'hour', 'day'], [0, 2, 'hour', 'day']],
+     dt.datetime(2015, 11, 1, 1), True),
+])
+@pytest.mark.parametrize('size', [1, 3, 7])
+def test_fetch(expression, start, trim, size):
+    """Pages of a cursor are consecutive intervals of forward()."""
+    recurrenteventset = RecurrentEventSet.from_json(expression)
+    expected = list(it.islice(recurrenteventset.forward(start, trim), 21))
+    cursor = recurrenteventset.cursor(start, trim)
+
+    actual = []
+    for _ in range(21 // size):
+        cursor = Cursor.from_token(recurrenteventset, cursor.token)
+        actual.extend(cursor.fetch(size))
+
+    assert actual == expected
+
+
+@pytest.mark.parametrize('start', [
+    dt.datetime(1, 1, 1),
+    dt.datetime(500, 1, 1, 9, 30, 15, 25),
+])
+def test_token_early_years(start):
+    """Cursors before year 1000 are resumed from tokens."""
+    recurrenteventset = RecurrentEventSet.from_json(BUSINESS_HOURS)
+    cursor = recurrenteventset.cursor(start)
+
+    actual = Cursor.from_token(recurrenteventset, cursor.token)
+
+    assert actual.position == start
+    assert actual.fetch(3) == cursor.fetch(3)
+
+
+def test_fetch_exhausted():
+    """A cursor is exhausted after the last interval."""
+    recurrenteventset = RecurrentEventSet.from_json(
+        [OR, [2000, 2002, 'year', None]]
+    )
+    cursor = recurrenteventset.cursor(dt.datetime(1999, 1, 1))
+
+    assert cursor.fetch(2) == [(dt.datetime(2000, 1, 1),
+                                dt.datetime(2002, 1, 1))]
+    assert cursor.exhausted
+    cursor = Cursor.from_token(recurrenteventset, cursor.token)
+    assert cursor.exhausted
+    assert cursor.fetch(2) == []
+
+
+@pytest.mark.parametrize('token', ['', 'abc', '!!!', 'WzEsMl0'])
+def test_from_token_malformed(token):
+    """Malformed tokens are rejected."""
+    recurrenteventset = RecurrentEventSet.from_json(BUSINESS_HOURS)
+
+    with pytest.raises(ValueError):
+        Cursor.from_token(recurrenteventset, token)
+
+
+def test_from_token_another_schedule():
+    """Tokens of another schedule are rejected."""
+    token = RecurrentEventSet.from_json(BUSINESS_HOURS).cursor(
+        dt.datetime(2015, 11, 6, 12)
+    ).token
+    recurrenteventset = RecurrentEventSet.from_json(
+        [OR, [9, 18, 'hour', 'day']]
+    )
+
+    with pytest.raises(ValueError):
+        Cursor.from_token(recurrenteventset, token)
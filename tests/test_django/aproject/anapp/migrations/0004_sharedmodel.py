@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import tempo.django.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('anapp', '0003_movie'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SharedModel',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('schedule', tempo.django.fields.SharedRecurrentEventSetField(null=True, verbose_name=b'Schedule', blank=True)),
+            ],
+        ),
+    ]
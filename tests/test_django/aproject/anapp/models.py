@@ -1,5 +1,6 @@
 from django.db import models
-from tempo.django.fields import RecurrentEventSetField
+from tempo.django.fields import (RecurrentEventSetField,
+                                 SharedRecurrentEventSetField)
 
 
 class AModel(models.Model):
@@ -18,3 +19,7 @@ class Movie(models.Model):
     schedule = RecurrentEventSetField('Schedule')
 
     __str__ = __unicode__ = lambda self: self.name
+
+
+class SharedModel(models.Model):
+    schedule = SharedRecurrentEventSetField('Schedule', null=True, blank=True)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# coding=utf-8
+import datetime as dt
+
+import django
+import pytest
+
+if django.VERSION < (1, 8):
+    pytest.skip('Query expressions require Django 1.8+')
+
+from django.db.models import F
+
+from tests.test_django.aproject.anapp.models import AModel
+from tempo.django.expressions import IsOpen, NextStart, NextStop
+from tempo.recurrenteventset import RecurrentEventSet
+
+
+EMPTY = ["AND", [10, 20, "day", "month"], ["NOT", [10, 20, "day", "month"]]]
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('django_postgresql_tempo')
+@pytest.mark.parametrize('expression, datetime, start, stop, is_open', [
+    (["OR", [10, 20, "day", "month"]], dt.datetime(2000, 1, 1),
+     dt.datetime(2000, 1, 10), dt.datetime(2000, 1, 20), False),
+    (["OR", [10, 20, "day", "month"]], dt.datetime(2000, 1, 15),
+     dt.datetime(2000, 1, 15), dt.datetime(2000, 1, 20), True),
+    (["OR", [10, 20, "day", "month"]], dt.datetime(2000, 1, 25),
+     dt.datetime(2000, 2, 10), dt.datetime(2000, 2, 20), False),
+    (EMPTY, dt.datetime(2000, 1, 1), None, None, False),
+])
+def test_expressions(expression, datetime, start, stop, is_open):
+    """'NextStart', 'NextStop' and 'IsOpen' expressions."""
+    AModel.objects.create(schedule=RecurrentEventSet.from_json(expression))
+
+    actual = AModel.objects.annotate(
+        next_start=NextStart(F('schedule'), datetime),
+        next_stop=NextStop(F('schedule'), datetime),
+        is_open=IsOpen(F('schedule'), datetime),
+    ).get()
+
+    assert actual.next_start == start
+    assert actual.next_stop == stop
+    assert actual.is_open == is_open
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('django_postgresql_tempo')
+def test_order_by_next_start():
+    """Objects are ordered by 'NextStart' expression, empty schedules
+    come last."""
+    empty = AModel.objects.create(schedule=EMPTY)
+    later = AModel.objects.create(schedule=["OR", [20, 25, "day", "month"]])
+    sooner = AModel.objects.create(schedule=["OR", [10, 15, "day", "month"]])
+
+    objects = AModel.objects.order_by(
+        NextStart(F('schedule'), dt.datetime(2000, 1, 1)).asc()
+    )
+
+    assert list(objects) == [sooner, later, empty]
@@ -2,9 +2,14 @@
 # coding=utf-8
 import datetime as dt
 
+import django
 import pytest
+from django.core.management import call_command
+from django.db import connection
+from six import StringIO
 
-from tests.test_django.aproject.anapp.models import AModel, NullableModel
+from tests.test_django.aproject.anapp.models import (AModel, NullableModel,
+                                                     SharedModel)
 from tempo.recurrenteventset import RecurrentEventSet
 
 
@@ -107,3 +112,103 @@ def test_null():
     actual = NullableModel.objects.get()
 
     assert actual.schedule is None
+
+
+shared = pytest.mark.skipif(django.VERSION < (1, 8),
+                            reason='Shared field requires Django 1.8+')
+
+
+@shared
+@pytest.mark.django_db
+@pytest.mark.usefixtures('django_postgresql_tempo')
+def test_shared():
+    """SharedRecurrentEventSetField stores each distinct
+    recurrenteventset once."""
+    expression = ["OR", [10, 20, "day", "month"]]
+    for _ in range(3):
+        SharedModel.objects.create(schedule=expression)
+    SharedModel.objects.create(schedule=["OR", [1, 5, "day", "month"]])
+    SharedModel.objects.create()
+
+    actual = [obj.schedule for obj in SharedModel.objects.order_by('pk')]
+
+    assert actual[:3] == [RecurrentEventSet.from_json(expression)] * 3
+    assert actual[4] is None
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT count(*) FROM tempo_schedule')
+        assert cursor.fetchone()[0] == 2
+
+
+@shared
+@pytest.mark.django_db
+@pytest.mark.usefixtures('django_postgresql_tempo')
+@pytest.mark.parametrize('lookup, value, expected', [
+    ('contains', dt.datetime(2000, 1, 15), [0, 1]),
+    ('contains', dt.datetime(2000, 1, 3), [2]),
+    ('intersects', (dt.datetime(2000, 1, 1), dt.datetime(2000, 1, 15)),
+     [0, 1, 2]),
+    ('occurs_within', (dt.datetime(2000, 1, 15), dt.datetime(2000, 2, 25)),
+     [2]),
+])
+def test_shared_lookups(lookup, value, expected):
+    """Lookups of SharedRecurrentEventSetField."""
+    objects = [
+        SharedModel.objects.create(schedule=expression)
+        for expression in [["OR", [10, 20, "day", "month"]],
+                           ["OR", [10, 20, "day", "month"]],
+                           ["OR", [1, 5, "day", "month"]]]
+    ]
+
+    actual = SharedModel.objects.filter(**{'schedule__' + lookup: value})
+
+    assert sorted(obj.pk for obj in actual) == [objects[index].pk
+                                                for index in expected]
+
+
+@shared
+@pytest.mark.django_db
+@pytest.mark.usefixtures('django_postgresql_tempo')
+def test_vacuum_schedules():
+    """tempo_vacuum_schedules command deletes recurrenteventsets, which
+    are no longer stored by rows."""
+    kept = ["OR", [10, 20, "day", "month"]]
+    SharedModel.objects.create(schedule=kept)
+    SharedModel.objects.create(schedule=["OR", [1, 5, "day", "month"]])
+    updated = SharedModel.objects.create(
+        schedule=["OR", [1, 2, "day", "month"]]
+    )
+    updated.schedule = kept
+    updated.save()
+    SharedModel.objects.filter(pk=updated.pk - 1).delete()
+
+    call_command('tempo_vacuum_schedules', stdout=StringIO())
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT recurrenteventset FROM tempo_schedule')
+        assert cursor.fetchall() == [(kept,)]
+    assert ([obj.schedule for obj in SharedModel.objects.all()] ==
+            [RecurrentEventSet.from_json(kept)] * 2)
+
+
+@shared
+@pytest.mark.django_db
+@pytest.mark.usefixtures('django_postgresql_tempo')
+def test_shared_lookups_own_column():
+    """Lookups evaluate only recurrenteventsets of their column."""
+    SharedModel.objects.create(schedule=["OR", [10, 20, "day", "month"]])
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT tempo_schedule_intern(%s)",
+                       ('["OR", [1, 5, "day", "month"]]',))
+        cursor.execute('SELECT tempo_stats_reset(), tempo_stats_enable()')
+        try:
+            actual = list(SharedModel.objects.filter(
+                schedule__contains=dt.datetime(2000, 1, 15)
+            ))
+            cursor.execute("SELECT calls FROM tempo_stat_functions WHERE "
+                           "function = 'tempo_recurrenteventset_contains'")
+            calls = cursor.fetchone()[0]
+        finally:
+            cursor.execute('SELECT tempo_stats_enable(false)')
+
+    assert len(actual) == 1
+    assert calls == 1
@@ -0,0 +1,130 @@
+# coding=utf-8
+import datetime as dt
+import itertools as it
+import threading
+
+from tempo import cache, instrumentation, timeutils
+from tempo.instrumentation import collect, add_hook, remove_hook
+from tempo.recurrentevent import RecurrentEvent
+from tempo.recurrenteventset import RecurrentEventSet
+from tempo.sparseinterval import SparseInterval
+
+
+RECURRENTEVENTSET = RecurrentEventSet.from_json(
+    ['AND', [1, 6, 'day', 'week'], ['NOT', [12, 13, 'hour', 'day']]]
+)
+
+
+def test_collect_contains():
+    """Containment test is counted."""
+    with collect() as counters:
+        assert dt.datetime(2000, 1, 3, 10) in RECURRENTEVENTSET
+
+    assert counters['walk.visits'] == 2
+    assert counters['recurrentevent.contains'] == 2
+    assert counters['timeutils.floor.calls'] > 0
+    assert counters['timeutils.delta.calls'] > 0
+
+
+def test_collect_forward():
+    """Advances of generators of atoms are counted per atom."""
+    with collect() as counters:
+        list(it.islice(RECURRENTEVENTSET.forward(dt.datetime(2000, 1, 3)),
+                       3))
+
+    atoms = RECURRENTEVENTSET.expression[1], \
+        RECURRENTEVENTSET.expression[2][1]
+    assert set(counters.advances) == set(atoms)
+    assert (sum(counters.advances.values()) ==
+            counters['recurrentevent.forward.advances'])
+    assert counters['walk.visits'] == 2
+
+
+def test_collect_sparseinterval_sizes():
+    """Sizes of operands of operations of SparseInterval are counted."""
+    first = SparseInterval((1, 2), (3, 4), (5, 6))
+    second = SparseInterval((2, 3))
+
+    with collect() as counters:
+        first.union(second)
+        first.trim(2, 5)
+
+    assert counters['sparseinterval.union.calls'] == 1
+    assert counters['sparseinterval.union.size'] == 4
+    assert counters['sparseinterval.trim.calls'] == 1
+    assert counters['sparseinterval.trim.size'] == 3
+
+
+def test_collect_nested():
+    """Nested collectors receive counts from their contexts."""
+    item = dt.datetime(2000, 1, 1)
+    atom = RecurrentEvent(1, 6, 'day', 'week')
+
+    with collect() as outer:
+        item in atom  # pylint: disable=pointless-statement
+        with collect() as inner:
+            item in atom  # pylint: disable=pointless-statement
+
+    assert outer['recurrentevent.contains'] == 2
+    assert inner['recurrentevent.contains'] == 1
+
+
+def test_collect_other_threads():
+    """Collector doesn't count evaluation in other threads."""
+    atom = RecurrentEvent(1, 6, 'day', 'week')
+
+    with collect() as counters:
+        thread = threading.Thread(
+            target=lambda: dt.datetime(2000, 1, 1) in atom
+        )
+        thread.start()
+        thread.join()
+
+    assert counters['recurrentevent.contains'] == 0
+
+
+def test_hook():
+    """Hooks receive counts from all threads, until removed."""
+    atom = RecurrentEvent(1, 6, 'day', 'week')
+    counts = []
+
+    def hook(name, value):
+        if name == 'recurrentevent.contains':
+            counts.append(value)
+
+    add_hook(hook)
+    try:
+        thread = threading.Thread(
+            target=lambda: dt.datetime(2000, 1, 1) in atom
+        )
+        thread.start()
+        thread.join()
+    finally:
+        remove_hook(hook)
+    dt.datetime(2000, 1, 1) in atom  # pylint: disable=pointless-statement
+
+    assert counts == [1]
+
+
+def test_disabled():
+    """Instrumentation is enabled only while it's used and doesn't
+    replace functions and methods."""
+    contains = RecurrentEvent.__dict__['__contains__']
+    floor = timeutils.floor
+
+    with collect():
+        assert instrumentation.is_enabled()
+        assert RecurrentEvent.__dict__['__contains__'] is contains
+        assert timeutils.floor is floor
+
+    assert not instrumentation.is_enabled()
+
+
+def test_collect_direct_imports():
+    """Calls of functions, imported by name, are counted."""
+    with collect() as counters:
+        cache.floor(dt.datetime(2000, 1, 1, 10), 'day')
+        cache.add_delta(dt.datetime(2000, 1, 1), 1, 'day')
+
+    assert counters['timeutils.floor.calls'] == 1
+    assert counters['timeutils.add_delta.calls'] == 1
@@ -0,0 +1,175 @@
+# coding=utf-8
+import datetime as dt
+
+import pytest
+
+from tempo import period
+from tempo.period import (compile_expression, measure, substitute,
+                          intervals, Measure)
+from tempo.recurrentevent import RecurrentEvent
+from tempo.recurrenteventset import AND, OR, NOT, RecurrentEventSet
+
+
+def brute_duration(expression, start, stop, step):
+    """Covered time, computed by testing each 'step' for containment."""
+    recurrenteventset = RecurrentEventSet.from_json(expression)
+    result = dt.timedelta(0)
+    current = start
+    while current < stop:
+        if current in recurrenteventset:
+            result += step
+        current += step
+    return result
+
+
+@pytest.mark.parametrize('expression, start, stop, step', [
+    (['OR', [10, 19, 'hour', 'day']],
+     dt.datetime(1999, 12, 15, 5, 30), dt.datetime(2000, 3, 3, 7),
+     dt.timedelta(minutes=30)),
+    (['AND', [1, 6, 'day', 'week'], [9, 18, 'hour', 'day'],
+             ['NOT', [12, 13, 'hour', 'day']]],
+     dt.datetime(1999, 12, 15, 5, 30), dt.datetime(2000, 3, 3, 7),
+     dt.timedelta(minutes=30)),
+    (['OR', [1, 15, 'day', 'month'], [20, 22, 'day', 'month']],
+     dt.datetime(1999, 12, 15, 6), dt.datetime(2001, 3, 3, 6),
+     dt.timedelta(hours=6)),
+    (['AND', [3, 4, 'month', 'year'], [2, 3, 'week', 'month']],
+     dt.datetime(1999, 12, 15), dt.datetime(2003, 3, 3),
+     dt.timedelta(days=1)),
+    (['OR', [30, 40, 'hour', 'week'], [5, 6, 'day', 'week']],
+     dt.datetime(1999, 12, 15, 5), dt.datetime(2000, 3, 3, 7),
+     dt.timedelta(hours=1)),
+    (['AND', [2000, 2001, 'year', None], [10, 12, 'hour', 'day']],
+     dt.datetime(1999, 12, 15, 5), dt.datetime(2000, 1, 15, 7),
+     dt.timedelta(hours=1)),
+    (['AND', [1, 8, 'day', 'week'], ['NOT', [0, 30, 'minute', 'hour']]],
+     dt.datetime(1999, 12, 15, 5, 30), dt.datetime(2000, 1, 3, 7),
+     dt.timedelta(minutes=30)),
+    (['AND', [20, 53, 'week', 'year'], ['NOT', [3, 6, 'day', 'week']]],
+     dt.datetime(1999, 12, 15), dt.datetime(2002, 3, 3),
+     dt.timedelta(days=1)),
+])
+def test_measure_duration(expression, start, stop, step):
+    """Duration of covered time equals to the one computed by brute
+    force."""
+    node = compile_expression(RecurrentEventSet.from_json(expression)
+                              .expression)
+
+    actual = measure(node, start, stop).duration
+
+    assert actual == brute_duration(expression, start, stop, step)
+
+
+def brute_intervals(expression, start, stop, step):
+    """Maximal covered intervals, computed by testing each 'step' for
+    containment."""
+    recurrenteventset = RecurrentEventSet.from_json(expression)
+    result = []
+    current = start
+    while current < stop:
+        if current in recurrenteventset:
+            if len(result) > 0 and result[-1][1] == current:
+                result[-1] = (result[-1][0], current + step)
+            else:
+                result.append((current, current + step))
+        current += step
+    return result
+
+
+@pytest.mark.parametrize('expression, start, stop, step', [
+    (['OR', [22, 24, 'hour', 'day'], [0, 2, 'hour', 'day']],
+     dt.datetime(1999, 12, 15, 5), dt.datetime(2000, 1, 3, 1),
+     dt.timedelta(hours=1)),
+    (['AND', [1, 6, 'day', 'week'], [9, 18, 'hour', 'day'],
+             ['NOT', [12, 13, 'hour', 'day']]],
+     dt.datetime(1999, 12, 15, 12, 30), dt.datetime(2000, 3, 3, 7),
+     dt.timedelta(minutes=30)),
+    (['OR', [1, 15, 'day', 'month'], [15, 22, 'day', 'month']],
+     dt.datetime(1999, 12, 15), dt.datetime(2001, 3, 3),
+     dt.timedelta(days=1)),
+    (['OR', [6, 8, 'day', 'week'], [1, 2, 'day', 'week']],
+     dt.datetime(1999, 12, 15), dt.datetime(2000, 6, 3),
+     dt.timedelta(days=1)),
+    (['OR', [2000, 2001, 'year', None], [300, 367, 'day', 'year']],
+     dt.datetime(1998, 12, 15), dt.datetime(2002, 3, 3),
+     dt.timedelta(days=1)),
+    (['OR', ['AND', [1, 6, 'day', 'week'], [9, 12, 'hour', 'day']],
+            ['AND', [1, 6, 'day', 'week'], [15, 18, 'hour', 'day']]],
+     dt.datetime(1999, 12, 15), dt.datetime(2000, 1, 20),
+     dt.timedelta(hours=1)),
+])
+def test_intervals_count(expression, start, stop, step):
+    """Intervals and their count equal to the ones computed by brute
+    force."""
+    node = compile_expression(RecurrentEventSet.from_json(expression)
+                              .expression)
+    expected = brute_intervals(expression, start, stop, step)
+
+    assert list(intervals(node, start, stop)) == expected
+    assert measure(node, start, stop).count == len(expected)
+
+
+def hour(n):
+    """A point of time 'n' hours from an arbitrary moment."""
+    return dt.datetime(2000, 1, 1) + dt.timedelta(hours=n)
+
+
+def measure_of(intervals_, start, stop):
+    """Measure of intervals, given in hours."""
+    return Measure.of([(hour(a), hour(b)) for a, b in intervals_],
+                      hour(start), hour(stop))
+
+
+@pytest.mark.parametrize('first, second, expected', [
+    (([(1, 2)], 0, 2), ([(2, 3)], 2, 4), 1),
+    (([(1, 2)], 0, 3), ([(3, 4)], 3, 5), 2),
+    (([(0, 2)], 0, 2), ([], 2, 2), 1),
+    (([], 0, 0), ([(2, 3)], 2, 4), 1),
+])
+def test_measure_add(first, second, expected):
+    """Intervals, touching the common edge, are counted once."""
+    assert (measure_of(*first) + measure_of(*second)).count == expected
+
+
+def test_measure_mul():
+    """Repetitions of a window merge intervals at their edges."""
+    day = measure_of([(0, 2), (22, 24)], 0, 24)
+
+    assert (day * 3).count == 4
+    assert (day * 3).duration == dt.timedelta(hours=12)
+    assert (day * 1).count == 2
+    assert (day * 0).count == 0
+
+
+A = RecurrentEvent(1, 2, 'day', 'week')
+B = RecurrentEvent(2, 3, 'day', 'week')
+
+
+@pytest.mark.parametrize('node, values, expected', [
+    ((AND, A, B), {A: True}, B),
+    ((AND, A, B), {A: False}, False),
+    ((OR, A, B), {A: True}, True),
+    ((OR, A, B), {A: False}, B),
+    ((NOT, (OR, A, B)), {A: False, B: False}, True),
+    ((AND, A, (NOT, B)), {}, (AND, A, (NOT, B))),
+])
+def test_substitute(node, values, expected):
+    """Cases for substitution of atoms by constants."""
+    assert substitute(node, values) == expected
+
+
+def test_cache_lru(monkeypatch):
+    """The least recently used result is evicted from the full cache."""
+    monkeypatch.setattr(period, '_CACHE', type(period._CACHE)())
+    monkeypatch.setattr(period, '_CACHE_SIZE', 2)
+    calls = []
+
+    def function(key):
+        calls.append(key)
+        return key
+
+    for key in ['a', 'b', 'a', 'c', 'a', 'b']:
+        assert period._cached(key, function, key) == key
+
+    assert calls == ['a', 'b', 'c', 'b']
+    assert list(period._CACHE) == ['a', 'b']
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# coding=utf-8
+import datetime as dt
+import itertools as it
+import json
+
+import pytest
+
+from tempo.postgresql import stats
+from tempo.recurrenteventset import RecurrentEventSet
+
+
+SCHEDULE = json.dumps(["OR", [1, 15, "day", "month"]])
+OTHER = json.dumps(["AND", [10, 20, "hour", "day"]])
+
+
+@pytest.fixture
+def enabled(request):
+    """Enables statistics for a test."""
+    # pylint: disable=protected-access
+    stats._cache.clear()
+    stats.reset()
+    stats.enable()
+
+    def finalize():
+        stats.enable(False)
+        stats.reset()
+
+    request.addfinalizer(finalize)
+
+
+def test_parse():
+    """Parsed schedules are cached."""
+    with stats.measure('f', SCHEDULE) as call:
+        first = call.parse()
+    with stats.measure('f', SCHEDULE) as call:
+        second = call.parse()
+
+    assert first == RecurrentEventSet.from_json(SCHEDULE)
+    assert second is first
+
+
+def test_disabled():
+    """Statistics are not collected by default."""
+    stats.reset()
+    with stats.measure('f', SCHEDULE) as call:
+        call.parse()
+
+    assert stats.functions() == []
+    assert stats.schedules() == []
+
+
+@pytest.mark.usefixtures('enabled')
+def test_functions():
+    """Calls, steps and parses are counted per function."""
+    stats.measure('g', OTHER).parse()
+    for schedule in [SCHEDULE, SCHEDULE, OTHER]:
+        with stats.measure('f', schedule) as call:
+            forward = call.parse().forward(dt.datetime(2000, 1, 1))
+            next(forward)
+            call.steps += forward.steps
+    with stats.measure('g', OTHER) as call:
+        call.parse()
+
+    (f_name, f), (g_name, g) = stats.functions()
+
+    assert (f_name, f.calls, f.hits, f.misses) == ('f', 3, 2, 1)
+    assert f.steps > 0
+    assert f.total_time >= 0
+    assert (g_name, g.calls, g.steps, g.hits, g.misses) == ('g', 1, 0, 1, 0)
+
+
+@pytest.mark.usefixtures('enabled')
+def test_schedules(monkeypatch):
+    """Only the slowest schedules are kept."""
+    monkeypatch.setattr(stats, 'SCHEDULES_SIZE', 2)
+    times = iter([0, 0.003, 0, 0.001, 0, 0.002])
+    monkeypatch.setattr(stats.time, 'time', lambda: next(times))
+
+    for schedule in ['a', 'b', 'c']:
+        with stats.measure('f', schedule):
+            pass
+
+    assert [(schedule, usage.calls) for schedule, usage
+            in stats.schedules()] == [('a', 1), ('c', 1)]
+
+
+@pytest.mark.usefixtures('enabled')
+def test_schedules_outdated(monkeypatch):
+    """Total times of schedules, grown after they were tracked, are
+    taken into account."""
+    monkeypatch.setattr(stats, 'SCHEDULES_SIZE', 2)
+    times = iter([0, 0.001, 0, 0.002, 0, 0.003, 0, 0.0025])
+    monkeypatch.setattr(stats.time, 'time', lambda: next(times))
+
+    for schedule in ['a', 'b', 'a', 'c']:
+        with stats.measure('f', schedule):
+            pass
+
+    assert [(schedule, usage.calls) for schedule, usage
+            in stats.schedules()] == [('a', 2), ('c', 1)]
+
+
+@pytest.mark.usefixtures('enabled')
+@pytest.mark.parametrize('rows, expected', [
+    (None, 4.0),
+    (1, 1.0),
+])
+def test_iterate(monkeypatch, rows, expected):
+    """Only time of taking of items is measured, including when
+    iteration is abandoned."""
+    times = iter([0, 0.001, 0.010, 0.012, 0.020, 0.021])
+    monkeypatch.setattr(stats.time, 'time', lambda: next(times))
+
+    def function():
+        with stats.measure('f', SCHEDULE) as call:
+            for item in call.iterate(iter([1, 2])):
+                yield item
+
+    generator = function()
+    list(it.islice(generator, rows))
+    generator.close()
+
+    (_, usage), = stats.functions()
+    assert usage.calls == 1
+    assert usage.total_time == pytest.approx(expected)
+
+
+@pytest.mark.usefixtures('enabled')
+def test_reset():
+    """reset() clears statistics."""
+    with stats.measure('f', SCHEDULE):
+        pass
+
+    stats.reset()
+
+    assert stats.functions() == []
+    assert stats.schedules() == []
+
+
+@pytest.mark.transaction
+def test_pg_stats(connection, postgresql_tempo):
+    """Statistics views of PostgreSQL binding."""
+    # pylint: disable=unused-argument
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT tempo_stats_reset(), tempo_stats_enable()')
+        for _ in range(3):
+            cursor.execute('SELECT tempo_recurrenteventset_contains(%s, %s)',
+                           (SCHEDULE, dt.datetime(2000, 1, 10)))
+        cursor.execute('SELECT function, calls, parse_hit_rate '
+                       'FROM tempo_stat_functions')
+        function = cursor.fetchall()
+        cursor.execute('SELECT recurrenteventset, calls '
+                       'FROM tempo_stat_schedules')
+        schedules = cursor.fetchall()
+        cursor.execute('SELECT tempo_stats_enable(false)')
+
+    assert function[0][:2] == ('tempo_recurrenteventset_contains', 3)
+    assert function[0][2] >= 2.0 / 3
+    assert schedules == [(json.loads(SCHEDULE), 3)]
@@ -113,6 +113,19 @@ def test_eq_hash(first, second, expected):
         assert hash(first) == hash(second)
 
 
+@pytest.mark.parametrize('recurrentevent, start, stop, expected', [
+    (RecurrentEvent(9, 18, U.HOUR, U.DAY), dt(2000, 1, 1), dt(2000, 1, 11),
+     timedelta(hours=90)),
+    (RecurrentEvent(2000, 2001, U.YEAR, None), dt(1999, 6, 1),
+     dt(2001, 1, 1), timedelta(days=366)),
+    (RecurrentEvent(2, 3, U.DAY, U.WEEK), dt(2000, 1, 1), dt(2010, 1, 1),
+     timedelta(days=522)),
+])
+def test_duration(recurrentevent, start, stop, expected):
+    """Cases for duration()."""
+    assert recurrentevent.duration(start, stop) == expected
+
+
 def test_eq_with_other_type():
     """Equality for object with othery type should not throw exceptions
     and return False."""
@@ -289,3 +302,92 @@ def test_from_json(value, expected):
     actual = RecurrentEvent.from_json(value)
 
     assert actual == expected
+
+
+def test_immutable():
+    """Attributes of `RecurrentEvent` can't be changed."""
+    recurrentevent = RecurrentEvent(1, 15, U.DAY, U.MONTH)
+
+    with pytest.raises(AttributeError):
+        recurrentevent.start = 2
+    with pytest.raises(AttributeError):
+        del recurrentevent.stop
+    with pytest.raises(AttributeError):
+        recurrentevent.other = 1
+    assert not hasattr(recurrentevent, '__dict__')
+
+
+def test_shared():
+    """Equal recurrent events, constructed with `shared()` or
+    `from_json()`, are the same instance."""
+    first = RecurrentEvent.shared(1, 15, U.DAY, U.MONTH)
+
+    assert RecurrentEvent.shared(1, 15, U.DAY, U.MONTH) is first
+    assert RecurrentEvent.from_json([1, 15, 'day', 'month']) is first
+    assert RecurrentEvent.shared(1, 16, U.DAY, U.MONTH) is not first
+    assert RecurrentEvent(1, 15, U.DAY, U.MONTH) is not first
+
+
+def test_pickle():
+    """`RecurrentEvent` instances can be pickled."""
+    import pickle
+
+    recurrentevent = RecurrentEvent(1, 15, U.DAY, U.MONTH)
+
+    assert pickle.loads(pickle.dumps(recurrentevent, 2)) == recurrentevent
+
+
+@pytest.mark.parametrize('unit, recurrence', [
+    (unit, recurrence) for unit, recurrence in CASES
+    if recurrence is not None
+])
+@pytest.mark.parametrize('trim', [True, False])
+def test_occurrence(unit, recurrence, trim):
+    """`occurrence()` is the same as the k-th interval of `forward()`."""
+    start = dt(1996, 10, 24, 11, 55, 13)
+    span = int(delta(start, add_delta(start, 1, recurrence), unit))
+    recurrentevent = RecurrentEvent(BASE[unit] + span // 3,
+                                    BASE[unit] + span // 3 * 2 or 1,
+                                    unit, recurrence)
+    expected = list(islice(recurrentevent.forward(start, trim), 40))
+
+    assert [recurrentevent.occurrence(start, k, trim)
+            for k in range(40)] == expected
+
+
+@pytest.mark.parametrize('recurrentevent, k', [
+    (RecurrentEvent(1000, 2000, U.DAY, None), 1),
+    (RecurrentEvent(1, 13, U.MONTH, U.YEAR), 1),
+    (RecurrentEvent(1, 15, U.DAY, U.MONTH), -1),
+    (RecurrentEvent(1, 15, U.DAY, U.MONTH), 10 ** 6),
+])
+def test_occurrence_index_error(recurrentevent, k):
+    """`occurrence()` raises `IndexError` for missing intervals."""
+    with pytest.raises(IndexError):
+        recurrentevent.occurrence(dt(2000, 1, 1), k)
+
+
+def test_occurrences():
+    """`occurrences()` view supports indexing, slicing and iteration."""
+    recurrentevent = RecurrentEvent(1, 15, U.DAY, U.MONTH)
+    start = dt(2000, 1, 10)
+    occurrences = recurrentevent.occurrences(start)
+    expected = list(islice(recurrentevent.forward(start), 30))
+
+    assert occurrences[20] == expected[20]
+    assert occurrences[10:20] == expected[10:20]
+    assert occurrences[3:25:4] == expected[3:25:4]
+    assert list(islice(occurrences[20:], 10)) == expected[20:30]
+    assert list(islice(occurrences, 30)) == expected
+    with pytest.raises(ValueError):
+        occurrences[-2:]
+
+
+def test_occurrences_end():
+    """Slices of `occurrences()` view stop after the last interval."""
+    occurrences = RecurrentEvent(1000, 2000, U.DAY, None).occurrences(
+        dt(1, 1, 1)
+    )
+
+    assert occurrences[0:5] == [(dt(3, 9, 27), dt(6, 6, 23))]
+    assert list(occurrences[1:]) == []
@@ -9,9 +9,12 @@ import pytest
 
 from tempo.recurrentevent import RecurrentEvent
 
-from tempo.recurrenteventset import (AND, NOT, OR, _walk, RecurrentEventSet, Void)
-from tempo.unit import Unit
+from tempo import recurrenteventset as recurrenteventset_module
+from tempo.recurrenteventset import (AND, NOT, OR, _walk, RecurrentEventSet, Void,
+                                     LimitExceeded)
+from tempo.unit import Unit, MAX
 from tests import Implementation
+from tests.utils import POSTGRESQL_INSTALL, POSTGRESQL_UNINSTALL
 
 
 def callback(op, *args):
@@ -80,6 +83,26 @@ def test_walk_raises_void():
         (NOT, RecurrentEvent(2, 4, 'hour', 'day'))
      )),
      False),
+    (RecurrentEventSet((AND,
+        RecurrentEvent(0, 5, 'hour', 'day'),
+        (NOT, (OR, RecurrentEvent(2, 3, 'hour', 'day'),
+                   RecurrentEvent(4, 5, 'hour', 'day')))
+     )),
+     RecurrentEventSet((AND,
+        RecurrentEvent(0, 5, 'hour', 'day'),
+        (NOT, (OR, RecurrentEvent(2, 3, 'hour', 'day'),
+                   RecurrentEvent(4, 5, 'hour', 'day')))
+     )),
+     True),
+    (RecurrentEventSet((AND,
+        (OR, RecurrentEvent(0, 5, 'hour', 'day'),
+             RecurrentEvent(2, 3, 'hour', 'day')),
+        RecurrentEvent(4, 5, 'hour', 'day'))),
+     RecurrentEventSet((AND,
+        RecurrentEvent(0, 5, 'hour', 'day'),
+        (OR, RecurrentEvent(2, 3, 'hour', 'day'),
+             RecurrentEvent(4, 5, 'hour', 'day')))),
+     False),
 ])
 def test_eq_hash(first, second, expected):
     """Cases for equality test and hashing."""
@@ -193,6 +216,59 @@ def test_from_json(value, expected):
     assert actual == expected
 
 
+@pytest.mark.parametrize('value', [
+    json.dumps([AND, [5, 25, 'year', None], [NOT, [10, 15, 'year', None]]]),
+    [AND, [5, 25, 'year', None], [NOT, [10, 15, 'year', None]]],
+    RecurrentEventSet([OR, RecurrentEvent(5, 25, Unit.YEAR, None)]),
+])
+def test_cached_json(value, monkeypatch):
+    """cached_json() is equal to to_json(), is computed once and can't
+    be modified."""
+    if isinstance(value, RecurrentEventSet):
+        recurrenteventset = value
+    else:
+        recurrenteventset = RecurrentEventSet.from_json(value)
+
+    expected = recurrenteventset.to_json()
+    calls = []
+    to_json = recurrenteventset.to_json
+    monkeypatch.setattr(recurrenteventset, 'to_json',
+                        lambda: calls.append(None) or to_json())
+
+    actual = recurrenteventset.cached_json()
+
+    assert actual == expected
+    assert recurrenteventset.cached_json() is actual
+    with pytest.raises(TypeError):
+        actual.append([NOT])
+    with pytest.raises(TypeError):
+        actual[1][0] = 0
+    assert len(calls) == 1
+
+
+def test_cached_json_canonical():
+    """cached_json() of a JSON string is it's canonical representation."""
+    recurrenteventset = RecurrentEventSet.from_json(
+        '["OR", [1, 10, "day", "month"]]'
+    )
+
+    assert (json.dumps(recurrenteventset.cached_json()) ==
+            json.dumps(recurrenteventset.to_json()))
+
+
+def test_cached_json_expression():
+    """Assigning an expression resets cached_json()."""
+    recurrenteventset = RecurrentEventSet.from_json(
+        [OR, [1, 10, 'day', 'month']]
+    )
+    recurrenteventset.cached_json()
+
+    recurrenteventset.expression = [AND, RecurrentEvent(5, 25, Unit.YEAR,
+                                                        None)]
+
+    assert recurrenteventset.cached_json() == [AND, [5, 25, 'year', None]]
+
+
 def py_forward(expression, start, trim, n):
     """Python API for RecurrentEventSet.forward()"""
     return list(it.islice(RecurrentEventSet.from_json(expression)
@@ -267,6 +343,323 @@ def test_forward(expression, start, trim, expected, recurrenteventset_forward):
     assert actual == expected
 
 
+NEVER = [AND, [1, 10, 'day', 'month'], [15, 20, 'day', 'month']]
+
+
+def test_forward_max_steps():
+    """forward() is interrupted after 'max_steps' steps."""
+    forward = RecurrentEventSet.from_json(NEVER).forward(
+        dt.datetime(2000, 1, 1), max_steps=10
+    )
+
+    with pytest.raises(LimitExceeded) as excinfo:
+        next(forward)
+
+    assert excinfo.value.steps == 10
+    assert forward.steps == 10
+
+
+def test_forward_max_steps_boundary():
+    """An interval, found by the step number 'max_steps', is generated,
+    the step after it is not performed."""
+    recurrenteventset = RecurrentEventSet.from_json(
+        [AND, [1, 10, 'day', 'month'], [5, 6, 'month', 'year']]
+    )
+    start = dt.datetime(2000, 1, 1)
+    unlimited = recurrenteventset.forward(start)
+    expected = next(unlimited)
+    steps = unlimited.steps + 1
+
+    assert next(recurrenteventset.forward(start, max_steps=steps)) == expected
+    with pytest.raises(LimitExceeded) as excinfo:
+        next(recurrenteventset.forward(start, max_steps=steps - 1))
+    assert excinfo.value.steps == steps - 1
+
+
+def test_forward_deadline():
+    """forward() is interrupted after 'deadline'."""
+    forward = RecurrentEventSet.from_json(NEVER).forward(
+        dt.datetime(2000, 1, 1), deadline=0
+    )
+
+    with pytest.raises(LimitExceeded):
+        next(forward)
+
+
+def test_forward_default_max_steps(monkeypatch):
+    """forward() is limited by FORWARD_MAX_STEPS by default."""
+    monkeypatch.setattr(recurrenteventset_module, 'FORWARD_MAX_STEPS', 5)
+    forward = RecurrentEventSet.from_json(NEVER).forward(
+        dt.datetime(2000, 1, 1)
+    )
+
+    with pytest.raises(LimitExceeded):
+        next(forward)
+
+
+def test_forward_steps():
+    """Consumed steps are counted."""
+    forward = RecurrentEventSet.from_json(
+        [OR, [1, 15, 'day', 'month']]
+    ).forward(dt.datetime(2000, 1, 1), max_steps=100)
+
+    assert forward.steps == 0
+    list(it.islice(forward, 3))
+    assert 0 < forward.steps <= 100
+
+
+# The last representable second, beyond [MIN, MAX).
+LAST_SECOND = [AND, [9999, 10000, 'year', None], [12, 13, 'month', 'year'],
+               [31, 32, 'day', 'month'], [23, 24, 'hour', 'day'],
+               [59, 60, 'minute', 'hour'], [59, 60, 'second', 'minute']]
+
+
+@pytest.mark.parametrize('expression, empty, universal', [
+    (NEVER, True, False),
+    ([OR, [10, 19, 'hour', 'day']], False, False),
+    ([OR, [0, 24, 'hour', 'day']], False, True),
+    ([OR, [10, 19, 'hour', 'day'], [NOT, [10, 19, 'hour', 'day']]],
+     False, True),
+    ([AND, [29, 30, 'day', 'month'], [2, 3, 'month', 'year']], False, False),
+    ([AND, [30, 31, 'day', 'month'], [2, 3, 'month', 'year']], True, False),
+    ([AND, [1, 2, 'day', 'week'], [29, 30, 'day', 'month'],
+           [2, 3, 'month', 'year']],
+     False, False),
+    ([AND, [2000, 2001, 'year', None], [NOT, [1, 13, 'month', 'year']]],
+     True, False),
+    ([OR, [1, 10000, 'year', None]], False, True),
+    ([OR, [1, 8, 'day', 'week']], False, True),
+    (LAST_SECOND, False, False),
+    ([NOT, LAST_SECOND], False, False),
+])
+def test_is_empty_is_universal(expression, empty, universal):
+    """Cases for is_empty() and is_universal()."""
+    recurrenteventset = RecurrentEventSet.from_json(expression)
+
+    assert recurrenteventset.is_empty() == empty
+    assert recurrenteventset.is_universal() == universal
+
+
+@pytest.mark.parametrize('first, second, expected', [
+    ([OR, [10, 19, 'hour', 'day']], [OR, [18, 20, 'hour', 'day']], True),
+    ([OR, [10, 19, 'hour', 'day']], [OR, [19, 20, 'hour', 'day']], False),
+    ([OR, [10, 19, 'hour', 'day']], RecurrentEvent(6, 8, 'day', 'week'),
+     True),
+])
+def test_overlaps(first, second, expected):
+    """Cases for overlaps()."""
+    if isinstance(second, list):
+        second = RecurrentEventSet.from_json(second)
+
+    assert RecurrentEventSet.from_json(first).overlaps(second) == expected
+
+
+BUSINESS_HOURS = [AND, [1, 6, 'day', 'week'], [9, 18, 'hour', 'day']]
+
+
+@pytest.mark.parametrize('expression, start, stop, expected', [
+    (BUSINESS_HOURS, dt.datetime(2015, 11, 2), dt.datetime(2015, 11, 9),
+     dt.timedelta(hours=45)),
+    (BUSINESS_HOURS, dt.datetime(2015, 11, 2), dt.datetime(2020, 11, 2),
+     dt.timedelta(hours=45 * 261)),
+    (BUSINESS_HOURS, dt.datetime(2015, 11, 2, 12, 30),
+     dt.datetime(2015, 11, 3, 10), dt.timedelta(hours=6, minutes=30)),
+    (BUSINESS_HOURS, dt.datetime(2015, 11, 9), dt.datetime(2015, 11, 2),
+     dt.timedelta(0)),
+    ([OR, [10, 20, 'day', 'month']], dt.datetime(2015, 1, 15),
+     dt.datetime(2015, 3, 12), dt.timedelta(days=17)),
+    ([NOT, [0, 30, 'minute', 'hour']], dt.datetime(2015, 1, 15),
+     dt.datetime(2015, 1, 16), dt.timedelta(hours=12)),
+    (NEVER, dt.datetime(2000, 1, 1), dt.datetime(2100, 1, 1),
+     dt.timedelta(0)),
+])
+def test_duration(expression, start, stop, expected):
+    """Cases for duration()."""
+    recurrenteventset = RecurrentEventSet.from_json(expression)
+
+    assert recurrenteventset.duration(start, stop) == expected
+
+
+@pytest.mark.parametrize('expression, start, stop, expected', [
+    (BUSINESS_HOURS, dt.datetime(2015, 11, 6, 12), dt.datetime(2015, 11, 10),
+     [(dt.datetime(2015, 11, 6, 12), dt.datetime(2015, 11, 6, 18)),
+      (dt.datetime(2015, 11, 9, 9), dt.datetime(2015, 11, 9, 18))]),
+    ([OR, [22, 24, 'hour', 'day'], [0, 2, 'hour', 'day']],
+     dt.datetime(2015, 11, 1, 1), dt.datetime(2015, 11, 2, 23),
+     [(dt.datetime(2015, 11, 1, 1), dt.datetime(2015, 11, 1, 2)),
+      (dt.datetime(2015, 11, 1, 22), dt.datetime(2015, 11, 2, 2)),
+      (dt.datetime(2015, 11, 2, 22), dt.datetime(2015, 11, 2, 23))]),
+    (NEVER, dt.datetime(2000, 1, 1), dt.datetime(2001, 1, 1), []),
+])
+def test_between(expression, start, stop, expected):
+    """Cases for between()."""
+    recurrenteventset = RecurrentEventSet.from_json(expression)
+
+    assert list(recurrenteventset.between(start, stop)) == expected
+
+
+@pytest.mark.parametrize('expression, start, stop', [
+    (BUSINESS_HOURS, dt.datetime(2015, 11, 6, 12), dt.datetime(2016, 2, 10)),
+    ([OR, [22, 24, 'hour', 'day'], [0, 2, 'hour', 'day']],
+     dt.datetime(2015, 11, 1, 1), dt.datetime(2016, 11, 2, 23)),
+    ([OR, [300, 367, 'day', 'year'], [1, 10, 'day', 'year']],
+     dt.datetime(2003, 5, 7, 3), dt.datetime(2015, 2, 1, 5)),
+    ([OR, [12, 13, 'month', 'year'], [1, 2, 'month', 'year'],
+          [2010, 2012, 'year', None]],
+     dt.datetime(2003, 5, 7, 3), dt.datetime(2015, 2, 1, 5)),
+    (NEVER, dt.datetime(2000, 1, 1), dt.datetime(2100, 1, 1)),
+])
+def test_count(expression, start, stop):
+    """count() gives the same result as counting of intervals from
+    between()."""
+    recurrenteventset = RecurrentEventSet.from_json(expression)
+
+    assert (recurrenteventset.count(start, stop) ==
+            len(list(recurrenteventset.between(start, stop))))
+
+
+@pytest.mark.parametrize('expression, start, trim, expected', [
+    ([OR, [22, 24, 'hour', 'day'], [0, 2, 'hour', 'day']],
+     dt.datetime(2015, 11, 1, 1), True,
+     [(dt.datetime(2015, 11, 1, 1), dt.datetime(2015, 11, 1, 2)),
+      (dt.datetime(2015, 11, 1, 22), dt.datetime(2015, 11, 2, 2)),
+      (dt.datetime(2015, 11, 2, 22), dt.datetime(2015, 11, 3, 2))]),
+    ([OR, [10, 19, 'hour', 'day'], NEVER],
+     dt.datetime(2000, 1, 1, 12), True,
+     [(dt.datetime(2000, 1, 1, 12), dt.datetime(2000, 1, 1, 19)),
+      (dt.datetime(2000, 1, 2, 10), dt.datetime(2000, 1, 2, 19))]),
+    ([OR, [1, 10, 'day', 'month'], [5, 15, 'day', 'month'],
+          [20, 25, 'day', 'month'], [24, 26, 'day', 'month'],
+          [10, 20, 'hour', 'day']],
+     dt.datetime(2000, 1, 12, 12), True,
+     [(dt.datetime(2000, 1, 12, 12), dt.datetime(2000, 1, 15)),
+      (dt.datetime(2000, 1, 15, 10), dt.datetime(2000, 1, 15, 20)),
+      (dt.datetime(2000, 1, 16, 10), dt.datetime(2000, 1, 16, 20))]),
+    ([NOT, [10, 15, 'day', 'month']],
+     dt.datetime(2000, 1, 5), False,
+     [(dt.datetime(2000, 1, 5), dt.datetime(2000, 1, 10)),
+      (dt.datetime(2000, 1, 15), dt.datetime(2000, 2, 10))]),
+    ([AND, [1, 25, 'day', 'month'], [NOT, NEVER]],
+     dt.datetime(2000, 1, 12), True,
+     [(dt.datetime(2000, 1, 12), dt.datetime(2000, 1, 25)),
+      (dt.datetime(2000, 2, 1), dt.datetime(2000, 2, 25))]),
+    ([AND], dt.datetime(2000, 1, 12), True,
+     [(dt.datetime(2000, 1, 12), MAX)]),
+    ([OR, [AND], [10, 15, 'day', 'month']], dt.datetime(2000, 1, 12), True,
+     [(dt.datetime(2000, 1, 12), MAX)]),
+    ([NOT, [AND]], dt.datetime(2000, 1, 12), True, []),
+])
+def test_forward_streams(expression, start, trim, expected):
+    """forward() merges intervals of operands lazily."""
+    forward = RecurrentEventSet.from_json(expression).forward(start, trim)
+
+    assert list(it.islice(forward, len(expected))) == expected
+
+
+@pytest.mark.parametrize('expression, start, stop', [
+    (BUSINESS_HOURS, dt.datetime(2015, 11, 6, 12), dt.datetime(2016, 2, 10)),
+    ([OR, [22, 24, 'hour', 'day'], [0, 2, 'hour', 'day'],
+          [AND, [1, 6, 'day', 'week'], [NOT, [12, 13, 'hour', 'day']]]],
+     dt.datetime(2015, 11, 1, 1), dt.datetime(2016, 1, 2, 23)),
+    ([AND, [OR, [1, 10, 'day', 'month'], [300, 367, 'day', 'year']],
+          [NOT, [2, 3, 'week', 'month']]],
+     dt.datetime(2003, 5, 7, 3), dt.datetime(2006, 2, 1, 5)),
+    ([OR, [12, 13, 'month', 'year'], [1, 2, 'month', 'year'],
+          [2010, 2012, 'year', None]],
+     dt.datetime(2003, 5, 7, 3), dt.datetime(2015, 2, 1, 5)),
+])
+def test_forward_between(expression, start, stop):
+    """forward() yields the same intervals as between()."""
+    recurrenteventset = RecurrentEventSet.from_json(expression)
+    expected = list(recurrenteventset.between(start, stop))
+
+    actual = []
+    for a, b in recurrenteventset.forward(start):
+        if a >= stop:
+            break
+        actual.append((a, min(b, stop)))
+
+    assert actual == expected
+
+
+@pytest.mark.parametrize('expression, start, stop', [
+    ([AND, [OR, [0, 12, 'hour', 'day'], [12, 24, 'hour', 'day']],
+      [9, 18, 'hour', 'day']],
+     dt.datetime(2000, 1, 30, 2, 30), dt.datetime(2000, 3, 1)),
+    ([AND, [OR, [50, 60, 'minute', 'hour'], [0, 24, 'hour', 'day']],
+      [9, 18, 'hour', 'day']],
+     dt.datetime(2000, 1, 30, 2, 30), dt.datetime(2000, 3, 1)),
+    ([AND, [3, 6, 'month', 'year'],
+      [OR, [50, 60, 'minute', 'hour'], [1, 13, 'month', 'year']],
+      [9, 18, 'hour', 'day']],
+     dt.datetime(2000, 1, 30, 2, 30), dt.datetime(2000, 7, 1)),
+    ([AND, [OR, [0, 12, 'hour', 'day'], [12, 24, 'hour', 'day']],
+      [1, 300, 'day', 'year']],
+     dt.datetime(2000, 1, 30, 2, 30), dt.datetime(2002, 1, 1)),
+])
+def test_forward_covering_operands(expression, start, stop):
+    """forward() doesn't wait for the end of operands, which cover all
+    time, and coalesces their parts into maximal intervals."""
+    recurrenteventset = RecurrentEventSet.from_json(expression)
+    expected = list(recurrenteventset.between(start, stop))
+
+    actual = []
+    for a, b in recurrenteventset.forward(start, max_steps=10000):
+        if a >= stop:
+            break
+        actual.append((a, min(b, stop)))
+
+    assert actual == expected
+
+
+@pytest.mark.parametrize('expression, start, expected', [
+    (BUSINESS_HOURS, dt.datetime(2015, 11, 6, 12),
+     [(dt.datetime(2015, 11, 6, 18), dt.datetime(2015, 11, 9, 9)),
+      (dt.datetime(2015, 11, 9, 18), dt.datetime(2015, 11, 10, 9))]),
+    (BUSINESS_HOURS, dt.datetime(2015, 11, 7, 12),
+     [(dt.datetime(2015, 11, 7, 12), dt.datetime(2015, 11, 9, 9)),
+      (dt.datetime(2015, 11, 9, 18), dt.datetime(2015, 11, 10, 9))]),
+    ([OR, [22, 24, 'hour', 'day'], [0, 2, 'hour', 'day']],
+     dt.datetime(2015, 11, 1, 23),
+     [(dt.datetime(2015, 11, 2, 2), dt.datetime(2015, 11, 2, 22)),
+      (dt.datetime(2015, 11, 3, 2), dt.datetime(2015, 11, 3, 22))]),
+    (NEVER, dt.datetime(2000, 1, 1),
+     [(dt.datetime(2000, 1, 1), MAX)]),
+])
+def test_gaps(expression, start, expected):
+    """Cases for gaps()."""
+    recurrenteventset = RecurrentEventSet.from_json(expression)
+
+    assert list(it.islice(recurrenteventset.gaps(start),
+                          len(expected))) == expected
+
+
+@pytest.mark.parametrize('expression, start', [
+    (BUSINESS_HOURS, dt.datetime(2015, 11, 6, 12)),
+    ([AND, [OR, [1, 10, 'day', 'month'], [300, 367, 'day', 'year']],
+          [NOT, [2, 3, 'week', 'month']]],
+     dt.datetime(2003, 5, 7, 3)),
+])
+def test_gaps_forward(expression, start):
+    """gaps() yields the same intervals as forward() of the negated
+    expression."""
+    recurrenteventset = RecurrentEventSet.from_json(expression)
+    negated = RecurrentEventSet.from_json([NOT, expression])
+
+    assert (list(it.islice(recurrenteventset.gaps(start), 20)) ==
+            list(it.islice(negated.forward(start), 20)))
+
+
+def test_gaps_max_steps():
+    """gaps() is interrupted after 'max_steps' steps."""
+    gaps = RecurrentEventSet.from_json(
+        [OR, [0, 12, 'hour', 'day'], [12, 24, 'hour', 'day']]
+    ).gaps(dt.datetime(2000, 1, 1), max_steps=10)
+
+    with pytest.raises(LimitExceeded):
+        next(gaps)
+
+
 @pytest.mark.parametrize('expression, expected', [
     ([AND, [1, 5, "month", "year"], [NOT, [1, 15, "day", "month"]]], True),
     ([AND, [1, 2, "months", "year"]], False),
@@ -280,3 +673,163 @@ def test_forward(expression, start, trim, expected, recurrenteventset_forward):
 def test_validate_json(expression, expected):
     """Cases for RecurrentEventSet.validate_json()."""
     assert RecurrentEventSet.validate_json(expression) == expected
+
+
+@pytest.mark.transaction
+@pytest.mark.parametrize('expression, expected', [
+    ([AND, [1, 5, "month", "year"], [NOT, [1, 15, "day", "month"]]], True),
+    ([OR, [AND, [OR, [1, 5, "day", "week"]], [NOT, [0, 1, "day", None]]],
+      [1, 2, "hour", "day"]], True),
+    ([OR], True),
+    ([AND, [OR, [1, 5, "day", "week"], ['one', 2, "month", "year"]]], False),
+    ([AND, [1, 2, "months", "year"]], False),
+    ([AND, [OR, []]], False),
+    ([[1, 2, "month", "year"]], False),
+    ([], False),
+    ({"AND": []}, False),
+    ("AND", False),
+])
+def test_pg_is_recurrenteventset(expression, expected, connection,
+                                 postgresql_tempo):
+    """Cases for tempo_is_recurrenteventset() of PostgreSQL binding."""
+    # pylint: disable=unused-argument
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT tempo_is_recurrenteventset(%s)',
+                       (json.dumps(expression),))
+        assert cursor.fetchone()[0] == expected
+
+
+@pytest.mark.transaction
+@pytest.mark.parametrize('expression, start, stop', [
+    ([OR, [10, 20, 'day', 'month']],
+     dt.datetime(2000, 1, 15), dt.datetime(2000, 3, 15)),
+    ([AND, [1, 5, 'day', 'month'], [NOT, [3, 4, 'day', 'month']]],
+     dt.datetime(2000, 1, 1), dt.datetime(2000, 3, 1)),
+    ([AND, [1, 2, 'day', 'month'], [5, 6, 'day', 'month']],
+     dt.datetime(2000, 1, 1), dt.datetime(2000, 3, 1)),
+])
+def test_pg_window(expression, start, stop, connection, postgresql_tempo):
+    """tempo_recurrenteventset_ranges() and
+    tempo_recurrenteventset_window() of PostgreSQL binding yield the same
+    intervals as between()."""
+    # pylint: disable=unused-argument
+    expected = list(RecurrentEventSet.from_json(expression)
+                    .between(start, stop))
+    value = json.dumps(expression)
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT lower(r), upper(r) FROM '
+                       'tempo_recurrenteventset_ranges(%s, %s, %s) AS r',
+                       (value, start, stop))
+        assert cursor.fetchall() == expected
+
+        if connection.server_version < 140000:
+            return
+        cursor.execute('SELECT lower(r), upper(r) FROM unnest('
+                       'tempo_recurrenteventset_window(%s, %s, %s)) AS r',
+                       (value, start, stop))
+        assert cursor.fetchall() == expected
+
+
+@pytest.mark.transaction
+@pytest.mark.parametrize('aggregate, operator', [
+    ('tempo_union_agg', OR),
+    ('tempo_intersection_agg', AND),
+])
+def test_pg_aggregates(aggregate, operator, connection, postgresql_tempo):
+    """tempo_union_agg() and tempo_intersection_agg() of PostgreSQL
+    binding combine schedules with an operator, ignoring NULLs."""
+    # pylint: disable=unused-argument
+    expressions = [[OR, [1, 15, 'day', 'month']],
+                   [AND, [10, 20, 'hour', 'day'],
+                    [NOT, [5, 7, 'day', 'week']]]]
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT %s(s) FROM (VALUES (%%s::jsonb), (%%s::jsonb), '
+                       '(NULL::jsonb)) AS t(s)' % aggregate,
+                       [json.dumps(e) for e in expressions])
+        assert cursor.fetchone()[0] == [operator] + expressions
+
+        cursor.execute('SELECT %s(s) FROM (SELECT NULL::jsonb) AS t(s) '
+                       'WHERE false' % aggregate)
+        assert cursor.fetchone()[0] is None
+
+
+@pytest.mark.transaction
+def test_pg_coverage_histogram(connection, postgresql_tempo):
+    """tempo_coverage_histogram() of PostgreSQL binding yields covered time
+    of each bucket."""
+    # pylint: disable=unused-argument
+    expression = [OR, [9, 18, 'hour', 'day'], [1, 15, 'day', 'month']]
+    start = dt.datetime(2000, 1, 1)
+    stop = dt.datetime(2000, 2, 10)
+    recurrenteventset = RecurrentEventSet.from_json(expression)
+    bounds = [start + dt.timedelta(weeks=n) for n in range(6)] + [stop]
+    expected = [(a, b, recurrenteventset.duration(a, b))
+                for a, b in zip(bounds, bounds[1:])]
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT * FROM tempo_coverage_histogram('
+                       '%s, %s, %s, %s)',
+                       (json.dumps(expression), start, stop,
+                        dt.timedelta(weeks=1)))
+        assert cursor.fetchall() == expected
+
+
+@pytest.mark.transaction
+def test_pg_reinstall(connection, postgresql_tempo):
+    """Uninstallation of PostgreSQL binding drops
+    tempo_recurrenteventset_forward() of previous versions, which had no
+    'max_steps' argument."""
+    # pylint: disable=unused-argument
+    expression = json.dumps([OR, [1, 15, 'day', 'month']])
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'CREATE FUNCTION tempo_recurrenteventset_forward('
+            'tempo_recurrenteventset, timestamp, integer, bool DEFAULT true) '
+            'RETURNS TABLE(start timestamp, stop timestamp) '
+            'LANGUAGE sql AS $$ SELECT NULL::timestamp, NULL::timestamp $$'
+        )
+        cursor.execute(POSTGRESQL_UNINSTALL)
+        cursor.execute("SELECT count(*) FROM pg_proc "
+                       "WHERE proname = 'tempo_recurrenteventset_forward'")
+        assert cursor.fetchone()[0] == 0
+
+        cursor.execute(POSTGRESQL_INSTALL)
+        cursor.execute('SELECT tempo_recurrenteventset_next_start(%s, %s)',
+                       (expression, dt.datetime(2000, 1, 20)))
+        assert cursor.fetchone()[0] == dt.datetime(2000, 2, 1)
+
+
+@pytest.mark.transaction
+def test_pg_uninstall_keeps_schedules(connection, postgresql_tempo):
+    """Uninstallation of PostgreSQL binding keeps recurrenteventsets
+    of tempo_schedule table, referenced by columns of users."""
+    # pylint: disable=unused-argument
+    expression = [OR, [1, 15, 'day', 'month']]
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT tempo_schedule_intern(%s)',
+                       (json.dumps(expression),))
+        digest = cursor.fetchone()[0]
+        cursor.execute(POSTGRESQL_UNINSTALL)
+        cursor.execute(POSTGRESQL_INSTALL)
+        cursor.execute('SELECT tempo_schedule_get(%s)', (digest,))
+        assert cursor.fetchone()[0] == expression
+
+
+@pytest.mark.transaction
+@pytest.mark.parametrize('function', ['tempo_recurrenteventset_next_start',
+                                      'tempo_recurrenteventset_next_stop'])
+def test_pg_next_empty(function, connection, postgresql_tempo):
+    """Next intervals of empty recurrenteventsets are NULL, instead of
+    endless search."""
+    # pylint: disable=unused-argument
+    expression = [AND, [10, 20, 'day', 'month'],
+                  [NOT, [10, 20, 'day', 'month']]]
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT %s(%%s, %%s)' % function,
+                       (json.dumps(expression), dt.datetime(2000, 1, 1)))
+        assert cursor.fetchone()[0] is None
@@ -1,7 +1,12 @@
 # coding=utf-8
+import datetime as dt
+from itertools import islice
+
 from rest_framework import serializers
 
-from tempo.rest_framework.serializers import RecurrentEventSetField
+from tempo.rest_framework.serializers import (RecurrentEventSetField,
+                                              RecurrentEventSetListField,
+                                              OccurrencesField)
 from tempo.recurrenteventset import RecurrentEventSet
 
 
@@ -13,6 +18,15 @@ class AnObject:
         self.schedule = schedule
 
 
+class AListSerializer(serializers.Serializer):
+    schedules = RecurrentEventSetListField()
+
+
+class ListObject:
+    def __init__(self, schedules):
+        self.schedules = schedules
+
+
 def test_serialize():
     recurrenteventset = RecurrentEventSet.from_json(
         ['AND', [1, 10, 'day', 'month']]
@@ -37,3 +51,115 @@ def test_deserialize():
     actual = serializer.validated_data['schedule']
 
     assert actual == expected
+
+
+def test_serialize_from_json_string():
+    value = '["AND", [1, 10, "day", "month"]]'
+    obj = AnObject(RecurrentEventSet.from_json(value))
+
+    serializer = ASerializer(obj)
+
+    assert serializer.data == {'schedule': ['AND', [1, 10, 'day', 'month']]}
+
+
+def test_serialize_list():
+    schedules = [
+        RecurrentEventSet.from_json(['AND', [1, 10, 'day', 'month']]),
+        RecurrentEventSet.from_json(['OR', [10, 19, 'hour', 'day']]),
+    ]
+    obj = ListObject(schedules)
+
+    serializer = AListSerializer(obj)
+
+    expected = {'schedules': [schedule.to_json() for schedule in schedules]}
+    actual = serializer.data
+
+    assert actual == expected
+
+
+def test_deserialize_list():
+    expected = [
+        RecurrentEventSet.from_json(['AND', [1, 10, 'day', 'month']]),
+        RecurrentEventSet.from_json(['OR', [10, 19, 'hour', 'day']]),
+    ]
+    serializer = AListSerializer(
+        data={'schedules': [schedule.to_json() for schedule in expected]}
+    )
+
+    assert serializer.is_valid()
+    actual = serializer.validated_data['schedules']
+
+    assert actual == expected
+
+
+START = dt.datetime(2015, 11, 6, 12)
+
+
+class OccurrencesSerializer(serializers.Serializer):
+    schedule = RecurrentEventSetField()
+    next_openings = OccurrencesField(source='schedule', count=2, start=START)
+
+
+def occurrences(schedule, n):
+    to_representation = serializers.DateTimeField().to_representation
+    return [[to_representation(a), to_representation(b)]
+            for a, b in islice(schedule.forward(START), n)]
+
+
+def test_occurrences():
+    recurrenteventset = RecurrentEventSet.from_json(
+        ['AND', [1, 6, 'day', 'week'], [9, 18, 'hour', 'day']]
+    )
+
+    serializer = OccurrencesSerializer(AnObject(recurrenteventset))
+
+    assert serializer.data['next_openings'] == occurrences(recurrenteventset,
+                                                           2)
+
+
+def test_occurrences_many(monkeypatch):
+    schedules = [
+        RecurrentEventSet.from_json(['AND', [1, 6, 'day', 'week'],
+                                            [9, 18, 'hour', 'day']]),
+        RecurrentEventSet.from_json(['OR', [10, 19, 'hour', 'day']]),
+    ]
+    objects = [AnObject(RecurrentEventSet.from_json(schedule.to_json()))
+               for schedule in schedules * 3]
+    expected = [occurrences(schedule, 2) for schedule in schedules * 3]
+    calls = []
+    forward = RecurrentEventSet.forward
+
+    def counted(self, *args, **kwargs):
+        calls.append(self)
+        return forward(self, *args, **kwargs)
+
+    monkeypatch.setattr(RecurrentEventSet, 'forward', counted)
+    serializer = OccurrencesSerializer(objects, many=True)
+
+    actual = [item['next_openings'] for item in serializer.data]
+
+    assert actual == expected
+    assert len(calls) == len(schedules)
+
+
+def test_occurrences_start_callable():
+    calls = []
+
+    def now():
+        calls.append(None)
+        return START
+
+    class Serializer(serializers.Serializer):
+        next_openings = OccurrencesField(source='schedule', count=1,
+                                         start=now)
+
+    schedules = [RecurrentEventSet.from_json(['OR', [10, 19, 'hour', 'day']]),
+                 RecurrentEventSet.from_json(['OR', [9, 12, 'hour', 'day']])]
+
+    data = Serializer([AnObject(schedule) for schedule in schedules],
+                      many=True).data
+
+    assert [item['next_openings'] for item in data] == [
+        occurrences(schedule, 1) for schedule in schedules
+    ]
+    assert len(calls) == 1
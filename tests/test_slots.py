@@ -0,0 +1,106 @@
+# coding=utf-8
+import datetime as dt
+import itertools as it
+
+import pytest
+
+from tempo.recurrentevent import RecurrentEvent
+from tempo.recurrenteventset import (AND, OR, NOT, LimitExceeded,
+                                     RecurrentEventSet)
+from tempo.slots import find_common
+
+
+ALICE = RecurrentEventSet.from_json(
+    [AND, [1, 6, 'day', 'week'], [9, 18, 'hour', 'day'],
+          [NOT, [13, 14, 'hour', 'day']]]
+)
+BOB = RecurrentEventSet.from_json(
+    [OR, [10, 12, 'hour', 'day'], [15, 19, 'hour', 'day']]
+)
+ROOM = RecurrentEventSet.from_json(
+    [OR, [30, 60, 'minute', 'hour']]
+)
+
+START = dt.datetime(2015, 11, 2)
+
+
+@pytest.mark.parametrize('schedules, min_duration, limit, expected', [
+    ([ALICE, BOB], None, 3,
+     [(dt.datetime(2015, 11, 2, 10), dt.datetime(2015, 11, 2, 12)),
+      (dt.datetime(2015, 11, 2, 15), dt.datetime(2015, 11, 2, 18)),
+      (dt.datetime(2015, 11, 3, 10), dt.datetime(2015, 11, 3, 12))]),
+    ([ALICE, BOB, ROOM], None, 2,
+     [(dt.datetime(2015, 11, 2, 10, 30), dt.datetime(2015, 11, 2, 11)),
+      (dt.datetime(2015, 11, 2, 11, 30), dt.datetime(2015, 11, 2, 12))]),
+    ([ALICE, BOB], dt.timedelta(hours=3), 2,
+     [(dt.datetime(2015, 11, 2, 15), dt.datetime(2015, 11, 2, 18)),
+      (dt.datetime(2015, 11, 3, 15), dt.datetime(2015, 11, 3, 18))]),
+    ([ALICE, RecurrentEvent(2010, 2011, 'year', None)], None, 1, []),
+    ([ALICE, RecurrentEvent(2016, 2017, 'year', None)], None, 1,
+     [(dt.datetime(2016, 1, 1, 9), dt.datetime(2016, 1, 1, 13))]),
+    ([ALICE], None, 0, []),
+    ([], None, 1, []),
+])
+def test_find_common(schedules, min_duration, limit, expected):
+    """Cases for find_common()."""
+    actual = find_common(schedules, START, min_duration, limit)
+
+    assert list(it.islice(actual, 10)) == expected
+
+
+def test_find_common_matches_intersection():
+    """Slots are the intervals of intersection of schedules."""
+    stop = START + dt.timedelta(days=30)
+    intersection = RecurrentEventSet((AND, ALICE.expression, BOB.expression,
+                                      ROOM.expression))
+    expected = [interval for interval in intersection.between(START, stop)
+                if interval[1] - interval[0] >= dt.timedelta(minutes=30)]
+
+    actual = list(it.takewhile(
+        lambda slot: slot[0] < stop,
+        find_common([ALICE, BOB, ROOM], START,
+                    min_duration=dt.timedelta(minutes=30))
+    ))
+
+    assert actual == expected
+
+
+MORNING = RecurrentEventSet.from_json([OR, [9, 12, 'hour', 'day']])
+AFTERNOON = RecurrentEventSet.from_json([OR, [14, 16, 'hour', 'day']])
+
+
+def test_find_common_stop():
+    """Search ends at 'stop', if schedules never overlap."""
+    stop = START + dt.timedelta(days=365)
+
+    actual = find_common([MORNING, AFTERNOON], START, stop=stop)
+
+    assert list(actual) == []
+
+
+def test_find_common_stop_slot():
+    """Slots, that start earlier than 'stop', are generated whole."""
+    actual = find_common([ALICE, BOB], START,
+                         stop=dt.datetime(2015, 11, 2, 11))
+
+    assert list(actual) == [(dt.datetime(2015, 11, 2, 10),
+                             dt.datetime(2015, 11, 2, 12))]
+
+
+def test_find_common_max_steps():
+    """LimitExceeded is raised, if schedules never overlap and 'stop'
+    is not given."""
+    with pytest.raises(LimitExceeded):
+        next(find_common([MORNING, AFTERNOON], START, max_steps=1000))
+
+
+def test_find_common_seek():
+    """Lagging schedules seek to the latest start, instead of generating
+    intervals in between."""
+    minutes = RecurrentEventSet.from_json([OR, [0, 1, 'minute', 'hour']])
+    year = RecurrentEvent(2020, 2021, 'year', None)
+
+    actual = find_common([minutes, year], START, limit=1, max_steps=100)
+
+    assert list(actual) == [(dt.datetime(2020, 1, 1),
+                             dt.datetime(2020, 1, 1, 0, 1))]
@@ -0,0 +1,76 @@
+# coding=utf-8
+import datetime as dt
+
+import pytest
+
+from tempo.recurrenteventset import AND, OR, NOT, RecurrentEventSet
+from tempo.streams import EXHAUSTED
+
+
+def collect(stream, n):
+    """Collects first 'n' intervals of 'stream'."""
+    result = []
+    while len(result) < n:
+        interval = stream.pull()
+        if interval is EXHAUSTED:
+            break
+        elif interval is not None:
+            result.append(interval)
+    return result
+
+
+@pytest.mark.parametrize('expression', [
+    [OR, [10, 19, 'hour', 'day']],
+    [OR, [22, 24, 'hour', 'day'], [0, 2, 'hour', 'day']],
+    [AND, [1, 6, 'day', 'week'], [9, 18, 'hour', 'day'],
+          [NOT, [13, 14, 'hour', 'day']]],
+    [AND, [60, 61, 'day', 'year'], [10, 11, 'hour', 'day']],
+    [NOT, [OR, [1, 10, 'day', 'month'], [15, 20, 'day', 'month']]],
+])
+@pytest.mark.parametrize('start, pulls, t', [
+    (dt.datetime(2000, 1, 1), 0, dt.datetime(2000, 1, 3, 12, 30)),
+    (dt.datetime(2000, 1, 1), 3, dt.datetime(2000, 3, 17, 10, 30)),
+    (dt.datetime(2000, 1, 1), 1, dt.datetime(2001, 3, 1, 9)),
+])
+def test_seek(expression, start, pulls, t):
+    """After seek() a stream produces the same intervals, as a stream
+    started from the point of the seek."""
+    recurrenteventset = RecurrentEventSet.from_json(expression)
+    stream = recurrenteventset._stream(start)
+    for _ in range(pulls):
+        stream.pull()
+    expected = [(max(a, t), b)
+                for a, b in collect(recurrenteventset._stream(t), 3)
+                if b > t]
+
+    stream.seek(t)
+    actual = [interval for interval in collect(stream, 4) if interval[1] > t]
+
+    assert actual[:len(expected)] == expected
+
+
+def test_seek_backward():
+    """Seek to an earlier point of time doesn't change a stream."""
+    recurrenteventset = RecurrentEventSet.from_json(
+        [OR, [10, 19, 'hour', 'day']]
+    )
+    stream = recurrenteventset._stream(dt.datetime(2000, 1, 2))
+
+    stream.seek(dt.datetime(2000, 1, 1))
+
+    assert collect(stream, 1) == [(dt.datetime(2000, 1, 2, 10),
+                                   dt.datetime(2000, 1, 2, 19))]
+
+
+def test_and_seeks_operands():
+    """Intersection of a rare and a frequent recurrent events doesn't
+    step through all intervals of the frequent one."""
+    recurrenteventset = RecurrentEventSet.from_json(
+        [AND, [2, 3, 'month', 'year'], [29, 30, 'day', 'month'],
+              [10, 11, 'hour', 'day']]
+    )
+    forward = recurrenteventset.forward(dt.datetime(2001, 1, 1),
+                                        max_steps=100)
+
+    assert next(forward) == (dt.datetime(2004, 2, 29, 10),
+                             dt.datetime(2004, 2, 29, 11))
@@ -35,6 +35,14 @@ from tempo.unit import Unit, MAX, MIN
     # Years
     (datetime(2015, 1, 1), 5, Unit.YEAR, datetime(2020, 1, 1)),
     (datetime(2020, 1, 1), -5, Unit.YEAR, datetime(2015, 1, 1)),
+    # Years and months from dates after February of leap years
+    (datetime(1996, 10, 1), 1, Unit.YEAR, datetime(1997, 10, 1)),
+    (datetime(1997, 10, 1), -1, Unit.YEAR, datetime(1996, 10, 1)),
+    (datetime(1995, 10, 1), 1, Unit.YEAR, datetime(1996, 10, 1)),
+    (datetime(1996, 2, 1), 1, Unit.YEAR, datetime(1997, 2, 1)),
+    (datetime(1996, 10, 1), 30, Unit.MONTH, datetime(1999, 4, 1)),
+    (datetime(1999, 4, 1), -30, Unit.MONTH, datetime(1996, 10, 1)),
+    (datetime(2016, 1, 1), -13, Unit.MONTH, datetime(2014, 12, 1)),
 ])
 def test_add_delta(datetime, delta, unit, expected):
     """Cases for `add_delta`."""
@@ -124,6 +124,10 @@ with open(os.path.join(POSTGRESQL_DIR, 'install.sql')) as file:
     POSTGRESQL_INSTALL = file.read()
 
 
+with open(os.path.join(POSTGRESQL_DIR, 'uninstall.sql')) as file:
+    POSTGRESQL_UNINSTALL = file.read()
+
+
 def install_postgresql_tempo(connection):
     """Installs PostgreSQL binding."""
     with connection.cursor() as cursor: